@@ -19,11 +19,15 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from app.core.config import settings  # To use the configured DB URL
 from app.db.base_class import Base
+from app.models import audit_event  # noqa
 from app.models import drone  # noqa
 from app.models import flight_plan  # noqa
 from app.models import organization  # noqa
+from app.models import rate_limit_bucket  # noqa
+from app.models import refresh_token  # noqa
 from app.models import restricted_zone  # noqa
 from app.models import telemetry_log  # noqa
+from app.models import telemetry_rollup  # noqa
 from app.models import user  # noqa
 from app.models import user_drone_assignment  # noqa
 from app.models import waypoint  # noqa
@@ -0,0 +1,43 @@
+"""feat_telemetry_nfz_alert
+
+Revision ID: 0b6e4d9a2c71
+Revises: f3b8d2e6a195
+Create Date: 2026-10-19 23:00:00.000000
+
+NFZ alerts used to be written into status_message, but only when the drone
+sent no status of its own. They now have their own column. Alerts already
+stored in status_message are moved across so rollup backfills keep counting
+them.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e4d9a2c71"
+down_revision: Union[str, None] = "f3b8d2e6a195"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "telemetry_logs", sa.Column("nfz_alert", sa.String(length=255), nullable=True)
+    )
+    op.execute(
+        "UPDATE telemetry_logs SET nfz_alert = status_message, status_message = NULL "
+        "WHERE status_message LIKE 'NFZ\\_ALERT%'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE telemetry_logs SET status_message = nfz_alert "
+        "WHERE nfz_alert IS NOT NULL AND status_message IS NULL"
+    )
+    op.drop_column("telemetry_logs", "nfz_alert")
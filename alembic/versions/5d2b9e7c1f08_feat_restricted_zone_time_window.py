@@ -0,0 +1,61 @@
+"""feat_restricted_zone_time_window
+
+Revision ID: 5d2b9e7c1f08
+Revises: c81f0d2e4a67
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2b9e7c1f08"
+down_revision: Union[str, None] = "c81f0d2e4a67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "restricted_zones",
+        sa.Column("active_from", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "restricted_zones",
+        sa.Column("active_until", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_restricted_zones_active_from"),
+        "restricted_zones",
+        ["active_from"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_restricted_zones_active_until"),
+        "restricted_zones",
+        ["active_until"],
+        unique=False,
+    )
+    op.create_check_constraint(
+        "ck_restricted_zones_window",
+        "restricted_zones",
+        "active_from IS NULL OR active_until IS NULL OR active_from < active_until",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ck_restricted_zones_window", "restricted_zones", type_="check")
+    op.drop_index(
+        op.f("ix_restricted_zones_active_until"), table_name="restricted_zones"
+    )
+    op.drop_index(
+        op.f("ix_restricted_zones_active_from"), table_name="restricted_zones"
+    )
+    op.drop_column("restricted_zones", "active_until")
+    op.drop_column("restricted_zones", "active_from")
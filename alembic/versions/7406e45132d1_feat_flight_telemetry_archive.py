@@ -0,0 +1,36 @@
+"""feat_flight_telemetry_archive
+
+Revision ID: 7406e45132d1
+Revises: b3ef2a1d9f1e
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7406e45132d1"
+down_revision: Union[str, None] = "b3ef2a1d9f1e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "flight_plans", sa.Column("archive_path", sa.String(length=500), nullable=True)
+    )
+    op.add_column(
+        "flight_plans",
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("flight_plans", "archived_at")
+    op.drop_column("flight_plans", "archive_path")
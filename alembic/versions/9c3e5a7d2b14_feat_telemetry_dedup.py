@@ -0,0 +1,49 @@
+"""feat_telemetry_dedup
+
+Revision ID: 9c3e5a7d2b14
+Revises: e4a7c3b95d21
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e5a7d2b14"
+down_revision: Union[str, None] = "e4a7c3b95d21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Point drones at the surviving copy before removing retransmitted rows.
+    op.execute(
+        """
+        UPDATE drones SET last_telemetry_id = keep.keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY drone_id, timestamp) AS keep_id
+            FROM telemetry_logs
+        ) AS keep
+        WHERE drones.last_telemetry_id = keep.id AND keep.id <> keep.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM telemetry_logs AS dup
+        USING telemetry_logs AS kept
+        WHERE dup.drone_id = kept.drone_id
+          AND dup.timestamp = kept.timestamp
+          AND dup.id > kept.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_telemetry_drone_timestamp", "telemetry_logs", ["drone_id", "timestamp"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_telemetry_drone_timestamp", "telemetry_logs", type_="unique")
@@ -0,0 +1,52 @@
+"""feat_flight_plan_booking_exclusion
+
+Revision ID: a4c9e2f7b813
+Revises: d7e1b4a9c360
+Create Date: 2026-10-19 19:10:00.000000
+
+Fails if live bookings of one drone already overlap; cancel or reschedule
+those plans first. Plans whose arrival is not after their departure (only
+possible in rows written before submissions were validated) book no window
+and are left out, since tstzrange() rejects inverted bounds.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c9e2f7b813"
+down_revision: Union[str, None] = "d7e1b4a9c360"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist lets the plain drone_id column share a GiST index with the range.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE flight_plans
+        ADD CONSTRAINT ex_flight_plans_drone_booking
+        EXCLUDE USING gist (
+            drone_id WITH =,
+            tstzrange(planned_departure_time, planned_arrival_time, '[)') WITH &&
+        )
+        WHERE (
+            deleted_at IS NULL
+            AND planned_departure_time < planned_arrival_time
+            AND status IN (
+                'PENDING_ORG_APPROVAL',
+                'PENDING_AUTHORITY_APPROVAL',
+                'APPROVED',
+                'ACTIVE'
+            )
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE flight_plans DROP CONSTRAINT ex_flight_plans_drone_booking")
@@ -0,0 +1,66 @@
+"""feat_audit_events
+
+Revision ID: b7d3f9a1c524
+Revises: a4c9e2f7b813
+Create Date: 2026-10-19 20:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f9a1c524"
+down_revision: Union[str, None] = "a4c9e2f7b813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "audit_events",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("entity_type", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(length=64), nullable=False),
+        sa.Column("actor_user_id", sa.Integer(), nullable=True),
+        sa.Column("old_value", sa.String(length=64), nullable=True),
+        sa.Column("new_value", sa.String(length=64), nullable=True),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_audit_events_id"), "audit_events", ["id"], unique=False)
+    op.create_index(
+        "ix_audit_events_entity",
+        "audit_events",
+        ["entity_type", "entity_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_events_actor", "audit_events", ["actor_user_id", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_audit_events_actor", table_name="audit_events")
+    op.drop_index("ix_audit_events_entity", table_name="audit_events")
+    op.drop_index(op.f("ix_audit_events_id"), table_name="audit_events")
+    op.drop_table("audit_events")
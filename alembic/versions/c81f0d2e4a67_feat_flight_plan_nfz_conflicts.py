@@ -0,0 +1,36 @@
+"""feat_flight_plan_nfz_conflicts
+
+Revision ID: c81f0d2e4a67
+Revises: 7406e45132d1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f0d2e4a67"
+down_revision: Union[str, None] = "7406e45132d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "flight_plans", sa.Column("nfz_conflict_zone_ids", sa.JSON(), nullable=True)
+    )
+    op.add_column(
+        "flight_plans",
+        sa.Column("nfz_checked_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("flight_plans", "nfz_checked_at")
+    op.drop_column("flight_plans", "nfz_conflict_zone_ids")
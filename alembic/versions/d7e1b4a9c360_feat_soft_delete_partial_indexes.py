@@ -0,0 +1,104 @@
+"""feat_soft_delete_partial_indexes
+
+Revision ID: d7e1b4a9c360
+Revises: 6a2d8f4c1e73
+Create Date: 2026-10-19 19:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e1b4a9c360"
+down_revision: Union[str, None] = "6a2d8f4c1e73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Email and serial number uniqueness now only applies to live rows.
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_index(op.f("ix_users_deleted_at"), table_name="users")
+    op.create_index(
+        "ix_users_email_live", "users", ["email"], unique=True, postgresql_where=LIVE
+    )
+
+    op.drop_index(op.f("ix_drones_serial_number"), table_name="drones")
+    op.drop_index(op.f("ix_drones_deleted_at"), table_name="drones")
+    op.create_index(
+        "ix_drones_serial_number_live",
+        "drones",
+        ["serial_number"],
+        unique=True,
+        postgresql_where=LIVE,
+    )
+
+    op.drop_index(op.f("ix_flight_plans_deleted_at"), table_name="flight_plans")
+    op.create_index(
+        "ix_flight_plans_status_live",
+        "flight_plans",
+        ["status"],
+        unique=False,
+        postgresql_where=LIVE,
+    )
+
+    op.drop_index(op.f("ix_restricted_zones_deleted_at"), table_name="restricted_zones")
+    op.create_index(
+        "ix_restricted_zones_is_active_live",
+        "restricted_zones",
+        ["is_active"],
+        unique=False,
+        postgresql_where=LIVE,
+    )
+
+    op.drop_index(op.f("ix_organizations_deleted_at"), table_name="organizations")
+    op.create_index(
+        "ix_organizations_is_active_live",
+        "organizations",
+        ["is_active"],
+        unique=False,
+        postgresql_where=LIVE,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_organizations_is_active_live", table_name="organizations")
+    op.create_index(
+        op.f("ix_organizations_deleted_at"),
+        "organizations",
+        ["deleted_at"],
+        unique=False,
+    )
+
+    op.drop_index("ix_restricted_zones_is_active_live", table_name="restricted_zones")
+    op.create_index(
+        op.f("ix_restricted_zones_deleted_at"),
+        "restricted_zones",
+        ["deleted_at"],
+        unique=False,
+    )
+
+    op.drop_index("ix_flight_plans_status_live", table_name="flight_plans")
+    op.create_index(
+        op.f("ix_flight_plans_deleted_at"), "flight_plans", ["deleted_at"], unique=False
+    )
+
+    op.drop_index("ix_drones_serial_number_live", table_name="drones")
+    op.create_index(
+        op.f("ix_drones_deleted_at"), "drones", ["deleted_at"], unique=False
+    )
+    op.create_index(
+        op.f("ix_drones_serial_number"), "drones", ["serial_number"], unique=True
+    )
+
+    op.drop_index("ix_users_email_live", table_name="users")
+    op.create_index(op.f("ix_users_deleted_at"), "users", ["deleted_at"], unique=False)
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
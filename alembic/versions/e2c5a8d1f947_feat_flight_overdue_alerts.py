@@ -0,0 +1,32 @@
+"""feat_flight_overdue_alerts
+
+Revision ID: e2c5a8d1f947
+Revises: b7d3f9a1c524
+Create Date: 2026-10-19 21:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2c5a8d1f947"
+down_revision: Union[str, None] = "b7d3f9a1c524"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "flight_plans",
+        sa.Column("overdue_alerted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("flight_plans", "overdue_alerted_at")
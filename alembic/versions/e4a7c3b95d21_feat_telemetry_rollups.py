@@ -0,0 +1,165 @@
+"""feat_telemetry_rollups
+
+Revision ID: e4a7c3b95d21
+Revises: 5d2b9e7c1f08
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c3b95d21"
+down_revision: Union[str, None] = "5d2b9e7c1f08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rollup_columns():
+    return [
+        sa.Column("point_count", sa.Integer(), nullable=False),
+        sa.Column("distance_m", sa.Float(), nullable=False),
+        sa.Column("min_altitude_m", sa.Float(), nullable=True),
+        sa.Column("max_altitude_m", sa.Float(), nullable=True),
+        sa.Column("speed_sum_mps", sa.Float(), nullable=False),
+        sa.Column("speed_count", sa.Integer(), nullable=False),
+        sa.Column("max_speed_mps", sa.Float(), nullable=True),
+        sa.Column("violation_count", sa.Integer(), nullable=False),
+        sa.Column("first_timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_latitude", sa.Float(), nullable=True),
+        sa.Column("last_longitude", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "flight_telemetry_rollups",
+        sa.Column("flight_plan_id", sa.Integer(), nullable=False),
+        sa.Column("drone_id", sa.Integer(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        *_rollup_columns(),
+        sa.ForeignKeyConstraint(
+            ["flight_plan_id"],
+            ["flight_plans.id"],
+            name="fk_flight_rollup_flightplan_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["drone_id"],
+            ["drones.id"],
+            name="fk_flight_rollup_drone_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+            name="fk_flight_rollup_organization_id",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("flight_plan_id"),
+    )
+    op.create_index(
+        op.f("ix_flight_telemetry_rollups_id"),
+        "flight_telemetry_rollups",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_flight_telemetry_rollups_drone_id"),
+        "flight_telemetry_rollups",
+        ["drone_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_flight_telemetry_rollups_organization_id"),
+        "flight_telemetry_rollups",
+        ["organization_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "drone_daily_telemetry_rollups",
+        sa.Column("drone_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        *_rollup_columns(),
+        sa.ForeignKeyConstraint(
+            ["drone_id"],
+            ["drones.id"],
+            name="fk_daily_rollup_drone_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+            name="fk_daily_rollup_organization_id",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("drone_id", "day", name="uq_drone_daily_rollup_drone_day"),
+    )
+    op.create_index(
+        op.f("ix_drone_daily_telemetry_rollups_id"),
+        "drone_daily_telemetry_rollups",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_drone_daily_telemetry_rollups_day"),
+        "drone_daily_telemetry_rollups",
+        ["day"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_drone_daily_telemetry_rollups_organization_id"),
+        "drone_daily_telemetry_rollups",
+        ["organization_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_drone_daily_telemetry_rollups_organization_id"),
+        table_name="drone_daily_telemetry_rollups",
+    )
+    op.drop_index(
+        op.f("ix_drone_daily_telemetry_rollups_day"),
+        table_name="drone_daily_telemetry_rollups",
+    )
+    op.drop_index(
+        op.f("ix_drone_daily_telemetry_rollups_id"),
+        table_name="drone_daily_telemetry_rollups",
+    )
+    op.drop_table("drone_daily_telemetry_rollups")
+    op.drop_index(
+        op.f("ix_flight_telemetry_rollups_organization_id"),
+        table_name="flight_telemetry_rollups",
+    )
+    op.drop_index(
+        op.f("ix_flight_telemetry_rollups_drone_id"),
+        table_name="flight_telemetry_rollups",
+    )
+    op.drop_index(
+        op.f("ix_flight_telemetry_rollups_id"), table_name="flight_telemetry_rollups"
+    )
+    op.drop_table("flight_telemetry_rollups")
@@ -0,0 +1,53 @@
+"""feat_rollup_airborne_seconds
+
+Revision ID: f3b8d2e6a195
+Revises: e2c5a8d1f947
+Create Date: 2026-10-19 22:30:00.000000
+
+Flight time used to be last_timestamp - first_timestamp, which for a drone-day
+also counted the time between flights. Rollups now accumulate airborne_seconds
+leg by leg. Flight rollups start from their old span (one flight, so close);
+daily rollups start at zero until scripts/backfill_telemetry_rollups.py is run.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d2e6a195"
+down_revision: Union[str, None] = "e2c5a8d1f947"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("flight_telemetry_rollups", "drone_daily_telemetry_rollups")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "airborne_seconds", sa.Float(), nullable=False, server_default="0"
+            ),
+        )
+        op.alter_column(table, "airborne_seconds", server_default=None)
+        op.add_column(
+            table, sa.Column("last_flight_plan_id", sa.Integer(), nullable=True)
+        )
+    op.execute(
+        "UPDATE flight_telemetry_rollups SET "
+        "airborne_seconds = COALESCE("
+        "EXTRACT(EPOCH FROM last_timestamp - first_timestamp), 0), "
+        "last_flight_plan_id = flight_plan_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, "last_flight_plan_id")
+        op.drop_column(table, "airborne_seconds")
@@ -7,8 +7,11 @@ from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.database import get_db
-from app.models.user import User
+from app.db.database import get_db, get_ingest_db
+from app.models.drone import Drone
+from app.models.flight_plan import FlightPlan
+from app.models.user import User, UserRole
+from app.models.user_drone_assignment import UserDroneAssignment
 from app.schemas.auth import TokenData
 
 security = HTTPBearer(auto_error=True)
@@ -87,3 +90,107 @@ async def get_current_organization_admin(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
     return current_user
+
+
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """Resolve an active user from a raw JWT (used where headers are unavailable,
+    e.g. WebSocket query parameters)."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    email = payload.get("sub")
+    if not email:
+        return None
+    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+async def get_current_ingest_user(
+    db: Session = Depends(get_ingest_db),
+    auth: HTTPAuthorizationCredentials = Depends(security),
+) -> User:
+    """Like get_current_user, but on the ingest pool so telemetry traffic never
+    waits on interactive API connections."""
+    user = get_user_from_token(db, auth.credentials)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def get_operable_drone(db: Session, user: User, drone_id: int) -> Drone:
+    """Return the drone if ``user`` may fly it or act on its behalf."""
+    drone = db.execute(
+        select(Drone).where(Drone.id == drone_id)
+    ).scalar_one_or_none()
+    if drone is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Drone not found")
+
+    if user.role == UserRole.AUTHORITY_ADMIN:
+        allowed = True
+    elif user.role == UserRole.SOLO_PILOT:
+        allowed = drone.solo_owner_user_id == user.id
+    elif user.role == UserRole.ORGANIZATION_ADMIN:
+        allowed = (
+            user.organization_id is not None
+            and drone.organization_id == user.organization_id
+        )
+    else:
+        allowed = (
+            db.execute(
+                select(UserDroneAssignment.drone_id).where(
+                    and_(
+                        UserDroneAssignment.user_id == user.id,
+                        UserDroneAssignment.drone_id == drone.id,
+                    )
+                )
+            ).first()
+            is not None
+        )
+
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return drone
+
+
+def get_viewable_flight_plan(
+    db: Session, user: User, flight_plan_id: int, *, for_update: bool = False
+) -> FlightPlan:
+    """Return the flight plan if ``user`` is its submitter, an admin of its
+    organization or an authority admin.
+
+    With ``for_update`` the row stays locked until the caller commits, so a
+    status checked on it can't be changed underneath by another request or
+    the lifecycle scheduler.
+    """
+    stmt = select(FlightPlan).where(FlightPlan.id == flight_plan_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    flight_plan = db.execute(stmt).scalar_one_or_none()
+    if flight_plan is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Flight plan not found"
+        )
+
+    allowed = (
+        user.role == UserRole.AUTHORITY_ADMIN
+        or flight_plan.user_id == user.id
+        or (
+            user.role == UserRole.ORGANIZATION_ADMIN
+            and user.organization_id is not None
+            and flight_plan.organization_id == user.organization_id
+        )
+    )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return flight_plan
@@ -1,8 +1,19 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, organizations
+from app.api.v1.endpoints import (analytics, audit, auth, drones, flights,
+                                    nfz, organizations, routes, telemetry,
+                                    tiles, weather)
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(organizations.router,
                           prefix="/organizations", tags=["organizations"])
+api_router.include_router(drones.router, prefix="/drones", tags=["drones"])
+api_router.include_router(flights.router, prefix="/flights", tags=["flights"])
+api_router.include_router(telemetry.router, tags=["telemetry"])
+api_router.include_router(nfz.router, prefix="/admin/nfz", tags=["restricted zones"])
+api_router.include_router(routes.router, prefix="/routes", tags=["routes"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
+api_router.include_router(weather.router, prefix="/weather", tags=["weather"])
+api_router.include_router(tiles.router, prefix="/tiles", tags=["map tiles"])
@@ -0,0 +1,214 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import (get_current_user, get_operable_drone,
+                          get_viewable_flight_plan)
+from app.db.database import get_read_db
+from app.models.organization import Organization
+from app.models.telemetry_rollup import (DroneDailyTelemetryRollup,
+                                         FlightTelemetryRollup)
+from app.models.user import User, UserRole
+from app.schemas.analytics import (DroneAnalyticsRead, FlightAnalyticsRead,
+                                   FlightReportRead, OrganizationAnalyticsRead)
+from app.services.flight_analytics import (FlightColumns, analyse_flight,
+                                           zones_for_flight)
+from app.services.telemetry_archive import telemetry_archiver
+
+router = APIRouter()
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def _date_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {MAX_RANGE_DAYS} days",
+        )
+    return start, end
+
+
+def _totals(rows: Iterable[DroneDailyTelemetryRollup]) -> dict:
+    """Combine rollup rows; distance, flight time and violations add up."""
+    totals = {
+        "point_count": 0,
+        "distance_m": 0.0,
+        "min_altitude_m": None,
+        "max_altitude_m": None,
+        "max_speed_mps": None,
+        "flight_time_seconds": 0.0,
+        "violation_count": 0,
+    }
+    speed_sum, speed_count = 0.0, 0
+    for row in rows:
+        totals["point_count"] += row.point_count
+        totals["distance_m"] += row.distance_m
+        totals["flight_time_seconds"] += row.flight_time_seconds
+        totals["violation_count"] += row.violation_count
+        for key, pick in (
+            ("min_altitude_m", min),
+            ("max_altitude_m", max),
+            ("max_speed_mps", max),
+        ):
+            value = getattr(row, key)
+            if value is not None:
+                current = totals[key]
+                totals[key] = value if current is None else pick(current, value)
+        speed_sum += row.speed_sum_mps
+        speed_count += row.speed_count
+    totals["average_speed_mps"] = speed_sum / speed_count if speed_count else None
+    return totals
+
+
+def _daily_rows(db: Session, condition, start: date, end: date):
+    return (
+        db.execute(
+            select(DroneDailyTelemetryRollup)
+            .where(
+                and_(
+                    condition,
+                    DroneDailyTelemetryRollup.day >= start,
+                    DroneDailyTelemetryRollup.day <= end,
+                )
+            )
+            .order_by(DroneDailyTelemetryRollup.day)
+        )
+        .scalars()
+        .all()
+    )
+
+
+@router.get("/flights/{flight_plan_id}", response_model=FlightAnalyticsRead)
+async def read_flight_analytics(
+    flight_plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Distance, altitude, speed and violation totals of one flight."""
+    flight_plan = get_viewable_flight_plan(db, current_user, flight_plan_id)
+    rollup = db.execute(
+        select(FlightTelemetryRollup).where(
+            FlightTelemetryRollup.flight_plan_id == flight_plan.id
+        )
+    ).scalar_one_or_none()
+    if rollup is None:
+        # No telemetry reported for this flight yet.
+        return {"flight_plan_id": flight_plan.id, "drone_id": flight_plan.drone_id}
+    return rollup
+
+
+@router.get("/flights/{flight_plan_id}/report", response_model=FlightReportRead)
+async def read_flight_report(
+    flight_plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Route conformance, altitude and speed profiles, time spent in or near
+    restricted zones, and signal gaps of one flight.
+
+    Telemetry is loaded as column arrays from the flight's archive when it has
+    one, otherwise straight from the telemetry_logs cursor.
+    """
+    flight_plan = get_viewable_flight_plan(db, current_user, flight_plan_id)
+    archive = telemetry_archiver.open(flight_plan)
+    if archive is not None:
+        with archive:
+            columns = FlightColumns.from_archive(archive)
+        source = "archive"
+    else:
+        columns = FlightColumns.from_cursor(db, flight_plan.id)
+        source = "database"
+
+    zones = []
+    if len(columns):
+        zones = zones_for_flight(
+            db,
+            datetime.fromtimestamp(columns.t[0], tz=timezone.utc),
+            datetime.fromtimestamp(columns.t[-1], tz=timezone.utc),
+        )
+    report = analyse_flight(
+        columns,
+        route=[(wp.latitude, wp.longitude) for wp in flight_plan.waypoints],
+        zones=zones,
+    )
+    return {"flight_plan_id": flight_plan.id, "source": source, **report}
+
+
+@router.get("/drones/{drone_id}", response_model=DroneAnalyticsRead)
+async def read_drone_analytics(
+    drone_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Per-day totals of a drone over ``[start, end]`` (UTC days, inclusive).
+
+    Defaults to the last 30 days.
+    """
+    drone = get_operable_drone(db, current_user, drone_id)
+    start, end = _date_range(start, end)
+    rows = _daily_rows(db, DroneDailyTelemetryRollup.drone_id == drone.id, start, end)
+    return {
+        "drone_id": drone.id,
+        "start": start,
+        "end": end,
+        "totals": _totals(rows),
+        "days": [{"day": row.day, **_totals([row])} for row in rows],
+    }
+
+
+@router.get(
+    "/organizations/{organization_id}", response_model=OrganizationAnalyticsRead
+)
+async def read_organization_analytics(
+    organization_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Per-day totals across an organization's drones over ``[start, end]``.
+
+    Available to authority admins and to admins of the organization.
+    """
+    allowed = current_user.role == UserRole.AUTHORITY_ADMIN or (
+        current_user.role == UserRole.ORGANIZATION_ADMIN
+        and current_user.organization_id == organization_id
+    )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    if db.get(Organization, organization_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found"
+        )
+    start, end = _date_range(start, end)
+    rows = _daily_rows(
+        db, DroneDailyTelemetryRollup.organization_id == organization_id, start, end
+    )
+    by_day = defaultdict(list)
+    for row in rows:
+        by_day[row.day].append(row)
+    return {
+        "organization_id": organization_id,
+        "start": start,
+        "end": end,
+        "drone_count": len({row.drone_id for row in rows}),
+        "totals": _totals(rows),
+        "days": [{"day": day, **_totals(day_rows)} for day, day_rows in by_day.items()],
+    }
@@ -0,0 +1,45 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_authority_admin
+from app.db.database import get_read_db
+from app.models.audit_event import AuditEvent
+from app.models.user import User
+from app.schemas.audit import AuditEventPage
+
+router = APIRouter()
+
+
+@router.get("/events", response_model=AuditEventPage)
+async def read_audit_events(
+    entity_type: Optional[str] = Query(None, description="flight_plan, drone or user"),
+    entity_id: Optional[int] = None,
+    actor_user_id: Optional[int] = None,
+    before: Optional[int] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """State change history, newest first (authority admins only).
+
+    Filtering by entity or by actor walks the matching index in id order, so
+    each page costs the same however long the history gets. Events show up
+    here once the audit writer has flushed them, normally within a second.
+    """
+    stmt = select(AuditEvent)
+    if entity_type is not None:
+        stmt = stmt.where(AuditEvent.entity_type == entity_type)
+    if entity_id is not None:
+        stmt = stmt.where(AuditEvent.entity_id == entity_id)
+    if actor_user_id is not None:
+        stmt = stmt.where(AuditEvent.actor_user_id == actor_user_id)
+    if before is not None:
+        stmt = stmt.where(AuditEvent.id < before)
+    events = (
+        db.execute(stmt.order_by(AuditEvent.id.desc()).limit(limit + 1)).scalars().all()
+    )
+    next_cursor = events[limit - 1].id if len(events) > limit else None
+    return {"items": events[:limit], "next_cursor": next_cursor}
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_authority_admin, get_current_user
 from app.core.config import settings
 from app.core.security import (create_access_token, get_password_hash,
                                verify_password)
@@ -13,10 +13,14 @@ from app.db.database import get_db
 from app.models.organization import Organization
 from app.models.user import User, UserRole
 from app.schemas.auth import (OrganizationAdminRegister,
-                              OrganizationWithAdminResponse, Token,
+                              OrganizationWithAdminResponse, RefreshRequest,
+                              Token, UserActivationUpdate,
                               UserCreateOrganizationPilot, UserCreateSolo,
                               UserResponse)
 from app.schemas.login import LoginRequest
+from app.services.audit_log import USER, audit_log
+from app.services.org_directory import org_directory
+from app.services.refresh_tokens import refresh_tokens
 
 router = APIRouter()
 
@@ -140,7 +144,12 @@ async def register_organization_admin(
 ) -> Any:
     """Register a new organization with its admin."""
     # Check if organization exists
-    stmt = select(Organization).where(Organization.bin == org_in.bin)
+    # Deleted organizations still hold their BIN.
+    stmt = (
+        select(Organization)
+        .where(Organization.bin == org_in.bin)
+        .execution_options(include_deleted=True)
+    )
     existing_org = db.execute(stmt).scalar_one_or_none()
 
     if existing_org:
@@ -207,6 +216,8 @@ async def register_organization_admin(
             detail=f"Error creating admin user: {str(e)}",
         )
 
+    org_directory.invalidate(db_org.id)
+
     # Convert SQLAlchemy models to Pydantic models
     return {
         "organization": {
@@ -234,9 +245,14 @@ async def register_organization_admin(
 async def login(login_data: LoginRequest, db: Session = Depends(get_db)) -> Any:
     """
     Get access token for user authentication.
+
+    Also returns a refresh token; use POST /auth/refresh to renew the access
+    token instead of logging in again.
     """
     user = db.execute(
-        select(User).where(User.email == login_data.email)
+        select(User)
+        .where(User.email == login_data.email)
+        .execution_options(active_only=True)
     ).scalar_one_or_none()
 
     if not user:
@@ -258,11 +274,93 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)) -> Any:
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
+    refresh_token = refresh_tokens.issue(db, user)
+    db.commit()
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
 
-    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_data: RefreshRequest, db: Session = Depends(get_db)
+) -> Any:
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    Each refresh token works once. Presenting one that was already used
+    revokes every token issued from the same login.
+    """
+    rotated = refresh_tokens.rotate(db, refresh_data.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user, refresh_token = rotated
+    access_token = create_access_token(
+        data={"sub": user.email},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: RefreshRequest, db: Session = Depends(get_db)) -> None:
+    """Revoke a refresh token and every token rotated from the same login."""
+    refresh_tokens.revoke(db, refresh_data.refresh_token)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_everywhere(
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+) -> None:
+    """Revoke all of the current user's refresh tokens on every device."""
+    refresh_tokens.revoke_user(db, current_user)
 
 
 @router.get("/me", response_model=UserResponse)
 async def read_current_user(current_user: User = Depends(get_current_user)) -> Any:
     """Get current user information."""
     return current_user
+
+
+@router.patch("/users/{user_id}/activation", response_model=UserResponse)
+async def update_user_activation(
+    user_id: int,
+    activation: UserActivationUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Activate or deactivate an account (authority admins only).
+
+    Deactivating also revokes the user's refresh tokens.
+    """
+    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if user.is_active == activation.is_active:
+        return user
+    user.is_active = activation.is_active
+    db.commit()
+    db.refresh(user)
+    if not user.is_active:
+        refresh_tokens.revoke_user(db, user)
+
+    audit_log.record(
+        USER,
+        user.id,
+        "activated" if user.is_active else "deactivated",
+        actor_user_id=current_user.id,
+        old_value=not user.is_active,
+        new_value=user.is_active,
+    )
+    return user
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import (get_current_authority_admin, get_current_user,
+                          get_operable_drone)
+from app.db.database import get_db, get_read_db
+from app.models.drone import Drone
+from app.models.user import User
+from app.schemas.drone import (DroneAvailabilityRead, DroneFleetItem,
+                               DroneFleetPage, DroneStatusUpdate,
+                               DroneTrailRead, FreeDronesRead)
+from app.services.audit_log import DRONE, audit_log
+from app.services.booking_calendar import booking_calendar
+from app.services.event_bus import DRONE_STATUS, event_bus
+from app.services.fleet import fleet_page, my_fleet_stmt
+from app.services.telemetry_tail import telemetry_tail
+
+router = APIRouter()
+
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+
+
+def _availability_window(start: Optional[datetime], end: Optional[datetime]):
+    start = start or datetime.now(timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    end = end or start + timedelta(days=7)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if end <= start or end - start > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must follow start by at most 31 days",
+        )
+    return start, end
+
+
+@router.get("/my", response_model=DroneFleetPage)
+async def read_my_drones(
+    after: Optional[int] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Drones the current user owns, is assigned to, or administers."""
+    drones, next_cursor = fleet_page(db, my_fleet_stmt(current_user), after, limit)
+    return {"items": drones, "next_cursor": next_cursor}
+
+
+@router.get("/my/available", response_model=FreeDronesRead)
+async def read_my_available_drones(
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Which of the current user's drones have no booking between start and end."""
+    start, end = _availability_window(start, end)
+    stmt = my_fleet_stmt(current_user).with_only_columns(Drone.id).order_by(Drone.id)
+    drone_ids = db.execute(stmt).scalars().all()
+    booking_calendar.sync(db)
+    return {
+        "start": start,
+        "end": end,
+        "drone_ids": booking_calendar.free_drones(drone_ids, start, end),
+    }
+
+
+@router.get("/admin/all", response_model=DroneFleetPage)
+async def read_all_drones(
+    after: Optional[int] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Every registered drone (authority admins only)."""
+    drones, next_cursor = fleet_page(db, select(Drone), after, limit)
+    return {"items": drones, "next_cursor": next_cursor}
+
+
+@router.patch("/{drone_id}/status", response_model=DroneFleetItem)
+async def update_drone_status(
+    drone_id: int,
+    status_in: DroneStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Set a drone's status, e.g. take it out of service for maintenance."""
+    drone = get_operable_drone(db, current_user, drone_id)
+    # Lock the row so the lifecycle scheduler can't free the drone in between.
+    db.refresh(drone, with_for_update=True)
+    old_status = drone.current_status
+    if old_status == status_in.status:
+        return drone
+    drone.current_status = status_in.status
+    db.commit()
+    db.refresh(drone)
+
+    audit_log.record(
+        DRONE,
+        drone.id,
+        "status_changed",
+        actor_user_id=current_user.id,
+        old_value=old_status,
+        new_value=drone.current_status,
+    )
+    event_bus.publish(
+        DRONE_STATUS, {"drone_id": drone.id, "status": drone.current_status.value}
+    )
+    return drone
+
+
+@router.get("/{drone_id}/tail", response_model=DroneTrailRead)
+async def read_drone_tail(
+    drone_id: int,
+    points: int = Query(100, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """The drone's newest ``points`` telemetry points, oldest first."""
+    drone = get_operable_drone(db, current_user, drone_id)
+    found, source = telemetry_tail.last_points(db, drone.id, points)
+    return {"drone_id": drone.id, "source": source, "points": found}
+
+
+@router.get("/{drone_id}/trail", response_model=DroneTrailRead)
+async def read_drone_trail(
+    drone_id: int,
+    seconds: float = Query(60, gt=0, le=3600),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """The drone's telemetry from the last ``seconds`` seconds, oldest first."""
+    drone = get_operable_drone(db, current_user, drone_id)
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    found, source = telemetry_tail.since(db, drone.id, cutoff)
+    return {"drone_id": drone.id, "source": source, "points": found}
+
+
+@router.get("/{drone_id}/availability", response_model=DroneAvailabilityRead)
+async def read_drone_availability(
+    drone_id: int,
+    start: Optional[datetime] = Query(None, description="Defaults to now"),
+    end: Optional[datetime] = Query(None, description="Defaults to a week after start"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """The drone's bookings and free slots between start and end."""
+    drone = get_operable_drone(db, current_user, drone_id)
+    start, end = _availability_window(start, end)
+    booking_calendar.sync(db)
+    return {
+        "drone_id": drone.id,
+        "start": start,
+        "end": end,
+        "bookings": [
+            {"flight_plan_id": plan_id, "start": departure, "end": arrival}
+            for plan_id, departure, arrival in booking_calendar.busy(
+                drone.id, start, end
+            )
+        ],
+        "free": [
+            {"start": slot_start, "end": slot_end}
+            for slot_start, slot_end in booking_calendar.free_slots(
+                drone.id, start, end
+            )
+        ],
+    }
@@ -0,0 +1,360 @@
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.deps import (get_current_authority_admin, get_current_user,
+                          get_viewable_flight_plan)
+from app.db.database import get_db, get_read_db
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.telemetry_log import TelemetryLog
+from app.models.user import User, UserRole
+from app.models.waypoint import Waypoint
+from app.schemas.flight_plan import (FlightPlanCreate, FlightPlanHistory,
+                                     FlightPlanRead, FlightPlanRejection)
+from app.schemas.restricted_zone import ApplicableZone
+from app.services.audit_log import FLIGHT_PLAN, audit_log
+from app.services.booking_calendar import booking_calendar
+from app.services.event_bus import FLIGHT_STATUS, event_bus
+from app.services.flight_validation import flight_plan_validator, server_timing
+from app.services.nfz_revalidation import (REVALIDATED_STATUSES,
+                                           nfz_revalidator)
+from app.services.nfz_schedule import nfz_scheduler
+from app.services.telemetry_archive import telemetry_archiver
+from app.services.telemetry_service import as_utc
+
+router = APIRouter()
+
+PILOT_CANCELLABLE = (
+    FlightPlanStatus.PENDING_ORG_APPROVAL,
+    FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    FlightPlanStatus.APPROVED,
+)
+
+
+def _is_org_admin_of(user: User, flight_plan: FlightPlan) -> bool:
+    return (
+        user.role == UserRole.ORGANIZATION_ADMIN
+        and user.organization_id is not None
+        and flight_plan.organization_id == user.organization_id
+    )
+
+
+def _change_status(
+    db: Session,
+    flight_plan: FlightPlan,
+    new_status: FlightPlanStatus,
+    actor: User,
+    action: str,
+    details: Optional[dict] = None,
+) -> FlightPlan:
+    """Commit a status change and let the audit log, caches and feeds know."""
+    old_status = flight_plan.status
+    flight_plan.status = new_status
+    db.commit()
+    db.refresh(flight_plan)
+
+    audit_log.record(
+        FLIGHT_PLAN,
+        flight_plan.id,
+        action,
+        actor_user_id=actor.id,
+        old_value=old_status,
+        new_value=new_status,
+        details=details,
+    )
+    if new_status in REVALIDATED_STATUSES:
+        nfz_revalidator.footprints.upsert_plan(flight_plan)
+    else:
+        nfz_revalidator.footprints.remove(flight_plan.id)
+    booking_calendar.upsert_plan(flight_plan)
+    event_bus.publish(
+        FLIGHT_STATUS,
+        {"flight_plan_id": flight_plan.id, "status": new_status.value},
+    )
+    return flight_plan
+
+
+@router.post("/", response_model=FlightPlanRead, status_code=status.HTTP_201_CREATED)
+async def submit_flight_plan(
+    plan_in: FlightPlanCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Submit a flight plan for approval.
+
+    Drone ownership, overlapping bookings of the drone, schedule sanity and
+    restricted zones along every leg are checked concurrently. All problems
+    are returned together in a 422; the ``Server-Timing`` header carries the
+    time spent in each check either way. A booking that races another
+    submission for the same drone gets a 409.
+    """
+    drone, violations, timings = await flight_plan_validator.validate(
+        db, current_user, plan_in
+    )
+    if violations:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"violations": violations},
+            headers={"Server-Timing": server_timing(timings)},
+        )
+
+    if current_user.role == UserRole.ORGANIZATION_PILOT:
+        plan_status = FlightPlanStatus.PENDING_ORG_APPROVAL
+    else:
+        plan_status = FlightPlanStatus.PENDING_AUTHORITY_APPROVAL
+    flight_plan = FlightPlan(
+        user_id=current_user.id,
+        drone_id=drone.id,
+        organization_id=drone.organization_id or current_user.organization_id,
+        planned_departure_time=plan_in.planned_departure_time,
+        planned_arrival_time=plan_in.planned_arrival_time,
+        status=plan_status,
+        notes=plan_in.notes,
+        # Validation has just proven the route clear.
+        nfz_conflict_zone_ids=[],
+        nfz_checked_at=datetime.now(timezone.utc),
+        waypoints=[
+            Waypoint(
+                latitude=w.latitude,
+                longitude=w.longitude,
+                altitude_m=w.altitude_m,
+                sequence_order=i,
+            )
+            for i, w in enumerate(plan_in.waypoints)
+        ],
+    )
+    db.add(flight_plan)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if "ex_flight_plans_drone_booking" not in str(e.orig):
+            raise
+        # Another submission booked the drone after the overlap check ran.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Drone is already booked for part of this window",
+        )
+    db.refresh(flight_plan)
+
+    audit_log.record(
+        FLIGHT_PLAN,
+        flight_plan.id,
+        "submitted",
+        actor_user_id=current_user.id,
+        new_value=flight_plan.status,
+    )
+    nfz_revalidator.footprints.upsert_plan(flight_plan)
+    booking_calendar.upsert_plan(flight_plan)
+    event_bus.publish(
+        FLIGHT_STATUS,
+        {"flight_plan_id": flight_plan.id, "status": flight_plan.status.value},
+    )
+    response.headers["Server-Timing"] = server_timing(timings)
+    return flight_plan
+
+
+@router.post("/{flight_plan_id}/approve", response_model=FlightPlanRead)
+async def approve_flight_plan(
+    flight_plan_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Approve a pending flight plan.
+
+    An organization admin's approval forwards an organization pilot's plan to
+    the authority; an authority admin's approval is final.
+    """
+    flight_plan = get_viewable_flight_plan(
+        db, current_user, flight_plan_id, for_update=True
+    )
+    if (
+        flight_plan.status == FlightPlanStatus.PENDING_ORG_APPROVAL
+        and _is_org_admin_of(current_user, flight_plan)
+    ):
+        flight_plan.approved_by_organization_admin_id = current_user.id
+        new_status = FlightPlanStatus.PENDING_AUTHORITY_APPROVAL
+    elif (
+        flight_plan.status
+        in (
+            FlightPlanStatus.PENDING_ORG_APPROVAL,
+            FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+        )
+        and current_user.role == UserRole.AUTHORITY_ADMIN
+    ):
+        flight_plan.approved_by_authority_admin_id = current_user.id
+        flight_plan.approved_at = datetime.now(timezone.utc)
+        new_status = FlightPlanStatus.APPROVED
+    elif flight_plan.status in (
+        FlightPlanStatus.PENDING_ORG_APPROVAL,
+        FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Flight plan is {flight_plan.status.value}, not pending approval",
+        )
+    return _change_status(db, flight_plan, new_status, current_user, "approved")
+
+
+@router.post("/{flight_plan_id}/reject", response_model=FlightPlanRead)
+async def reject_flight_plan(
+    flight_plan_id: int,
+    rejection: FlightPlanRejection,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Reject a pending flight plan with a reason shown to the pilot."""
+    flight_plan = get_viewable_flight_plan(
+        db, current_user, flight_plan_id, for_update=True
+    )
+    pending = (
+        FlightPlanStatus.PENDING_ORG_APPROVAL,
+        FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    )
+    if flight_plan.status not in pending:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Flight plan is {flight_plan.status.value}, not pending approval",
+        )
+    if current_user.role == UserRole.AUTHORITY_ADMIN:
+        new_status = FlightPlanStatus.REJECTED_BY_AUTHORITY
+    elif flight_plan.status == FlightPlanStatus.PENDING_ORG_APPROVAL and (
+        _is_org_admin_of(current_user, flight_plan)
+    ):
+        new_status = FlightPlanStatus.REJECTED_BY_ORG
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    flight_plan.rejection_reason = rejection.reason
+    return _change_status(
+        db,
+        flight_plan,
+        new_status,
+        current_user,
+        "rejected",
+        details={"reason": rejection.reason},
+    )
+
+
+@router.post("/{flight_plan_id}/cancel", response_model=FlightPlanRead)
+async def cancel_flight_plan(
+    flight_plan_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Cancel a flight that has not started yet, freeing its drone."""
+    flight_plan = get_viewable_flight_plan(
+        db, current_user, flight_plan_id, for_update=True
+    )
+    if flight_plan.status not in PILOT_CANCELLABLE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Flight plan is {flight_plan.status.value} and cannot be cancelled",
+        )
+    if flight_plan.user_id == current_user.id:
+        new_status = FlightPlanStatus.CANCELLED_BY_PILOT
+    else:
+        new_status = FlightPlanStatus.CANCELLED_BY_ADMIN
+    return _change_status(db, flight_plan, new_status, current_user, "cancelled")
+
+
+@router.get("/{flight_plan_id}/history", response_model=FlightPlanHistory)
+async def read_flight_history(
+    flight_plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Planned waypoints and recorded telemetry of a flight.
+
+    Archived flights are replayed from their memory-mapped archive file;
+    telemetry_logs is only queried for flights that are not archived yet.
+    """
+    flight_plan = get_viewable_flight_plan(db, current_user, flight_plan_id)
+
+    archive = telemetry_archiver.open(flight_plan)
+    if archive is not None:
+        with archive:
+            telemetry = list(archive.iter_points())
+        source = "archive"
+    else:
+        telemetry = (
+            db.execute(
+                select(TelemetryLog)
+                .where(TelemetryLog.flight_plan_id == flight_plan.id)
+                .order_by(TelemetryLog.timestamp)
+            )
+            .scalars()
+            .all()
+        )
+        source = "database"
+
+    return {
+        "flight_plan_details": flight_plan,
+        "planned_waypoints": flight_plan.waypoints,
+        "actual_telemetry": telemetry,
+        "source": source,
+    }
+
+
+@router.get("/{flight_plan_id}/restrictions", response_model=List[ApplicableZone])
+async def read_flight_restrictions(
+    flight_plan_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Restricted zones in force at any time between departure and arrival.
+
+    Includes temporary restrictions that start or end mid-flight, with a flag
+    for whether the planned route actually passes through each one.
+    """
+    flight_plan = get_viewable_flight_plan(db, current_user, flight_plan_id)
+    zones = nfz_scheduler.zones_for_window(
+        as_utc(flight_plan.planned_departure_time),
+        as_utc(flight_plan.planned_arrival_time),
+    )
+    waypoints = flight_plan.waypoints
+    return [
+        {
+            "zone_id": zone.zone_id,
+            "name": zone.name,
+            "geometry_type": zone.geometry_type,
+            "active_from": zone.active_from,
+            "active_until": zone.active_until,
+            "crosses_route": zone.intersects_path(
+                [w.latitude for w in waypoints],
+                [w.longitude for w in waypoints],
+                [w.altitude_m for w in waypoints],
+            ),
+        }
+        for zone in zones
+    ]
+
+
+@router.post("/{flight_plan_id}/archive", response_model=FlightPlanRead)
+async def archive_flight_telemetry(
+    flight_plan_id: int,
+    prune: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Pack a completed flight's telemetry into its columnar archive.
+
+    With ``prune=true`` the archived telemetry_logs rows are deleted afterwards.
+    """
+    flight_plan = get_viewable_flight_plan(db, current_user, flight_plan_id)
+    try:
+        telemetry_archiver.archive_flight(db, flight_plan=flight_plan, prune=prune)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    db.refresh(flight_plan)
+    return flight_plan
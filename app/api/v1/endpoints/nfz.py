@@ -0,0 +1,150 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_authority_admin
+from app.db.database import get_db, get_read_db
+from app.models.restricted_zone import RestrictedZone
+from app.models.user import User
+from app.schemas.restricted_zone import (RestrictedZoneChange,
+                                         RestrictedZoneCreate,
+                                         RestrictedZoneRead,
+                                         RestrictedZoneUpdate,
+                                         RevalidationJobRead,
+                                         validate_definition,
+                                         validate_limits)
+from app.services.nfz_revalidation import nfz_revalidator
+from app.services.nfz_schedule import nfz_scheduler
+
+router = APIRouter()
+
+
+def _get_zone(db: Session, zone_id: int) -> RestrictedZone:
+    zone = db.execute(
+        select(RestrictedZone).where(RestrictedZone.id == zone_id)
+    ).scalar_one_or_none()
+    if zone is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Restricted zone not found"
+        )
+    return zone
+
+
+def _apply_to_index(zone: RestrictedZone) -> dict:
+    """Hand the zone to the activation scheduler, have the other workers reload
+    it, and queue re-validation of plans."""
+    previous = nfz_scheduler.upsert(zone)
+    current = nfz_scheduler.zones.get(zone.id)
+    nfz_scheduler.changed(zone.id)
+    return nfz_revalidator.schedule(zone.id, previous, current).as_dict()
+
+
+@router.post(
+    "/", response_model=RestrictedZoneChange, status_code=status.HTTP_201_CREATED
+)
+async def create_restricted_zone(
+    zone_in: RestrictedZoneCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Create a restricted zone.
+
+    Affected flight plans are re-checked in the background; poll the returned
+    revalidation job for progress.
+    """
+    zone = RestrictedZone(
+        **zone_in.model_dump(), created_by_authority_id=current_user.id
+    )
+    db.add(zone)
+    db.commit()
+    db.refresh(zone)
+    return {"zone": zone, "revalidation": _apply_to_index(zone)}
+
+
+@router.get("/", response_model=List[RestrictedZoneRead])
+async def read_restricted_zones(
+    db: Session = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    include_inactive: bool = False,
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    stmt = select(RestrictedZone)
+    if not include_inactive:
+        stmt = stmt.where(RestrictedZone.is_active == True)
+    stmt = stmt.order_by(RestrictedZone.id).offset(skip).limit(limit)
+    return db.execute(stmt).scalars().all()
+
+
+@router.get("/revalidations/{job_id}", response_model=RevalidationJobRead)
+async def read_revalidation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    job = nfz_revalidator.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Revalidation job not found"
+        )
+    return job
+
+
+@router.get("/{zone_id}", response_model=RestrictedZoneRead)
+async def read_restricted_zone(
+    zone_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    return _get_zone(db, zone_id)
+
+
+@router.patch("/{zone_id}", response_model=RestrictedZoneChange)
+async def update_restricted_zone(
+    zone_id: int,
+    zone_in: RestrictedZoneUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    zone = _get_zone(db, zone_id)
+    changes = zone_in.model_dump(exclude_unset=True)
+    for field in ("name", "geometry_type", "definition_json", "is_active"):
+        if field in changes and changes[field] is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{field} cannot be null",
+            )
+    geometry_type = changes.get("geometry_type", zone.geometry_type)
+    definition = changes.get("definition_json", zone.definition_json)
+    min_alt = changes.get("min_altitude_m", zone.min_altitude_m)
+    max_alt = changes.get("max_altitude_m", zone.max_altitude_m)
+    active_from = changes.get("active_from", zone.active_from)
+    active_until = changes.get("active_until", zone.active_until)
+    try:
+        validate_definition(geometry_type, definition)
+        validate_limits(min_alt, max_alt, active_from, active_until)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    for field, value in changes.items():
+        setattr(zone, field, value)
+    db.commit()
+    db.refresh(zone)
+    return {"zone": zone, "revalidation": _apply_to_index(zone)}
+
+
+@router.delete("/{zone_id}", response_model=RestrictedZoneChange)
+async def delete_restricted_zone(
+    zone_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Soft-delete a zone; plans it was blocking are cleared in the background."""
+    zone = _get_zone(db, zone_id)
+    zone.soft_delete()
+    db.commit()
+    db.refresh(zone)
+    return {"zone": zone, "revalidation": _apply_to_index(zone)}
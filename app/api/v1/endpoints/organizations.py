@@ -1,33 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response, status)
 from sqlalchemy import select
-from typing import List, Any
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.api.deps import get_current_authority_admin, get_current_user
+from app.db.database import get_db, get_read_db
+from app.models.drone import Drone
 from app.models.organization import Organization
-from app.schemas.auth import OrganizationResponse # Assuming OrganizationResponse is in auth.py
-from app.api.deps import get_current_user # For authentication/authorization if needed
-from app.models.user import User # For type hinting current_user
+from app.models.user import User, UserRole
+from app.schemas.auth import OrganizationResponse, OrganizationUpdate
+from app.schemas.drone import DroneFleetPage
+from app.services.audit_log import ORGANIZATION, audit_log
+from app.services.fleet import fleet_page
+from app.services.org_directory import directory_requests, org_directory
 
 router = APIRouter()
 
 @router.get("/", response_model=List[OrganizationResponse])
 async def read_organizations(
+    request: Request,
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    # current_user: User = Depends(get_current_user) # Uncomment if endpoint needs authentication
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
 ) -> Any:
     """
-    Retrieve all organizations.
-    
-    This endpoint allows for retrieving a list of all organizations,
-    with support for pagination (skip, limit).
-    
-    # Optional: Add authorization checks here if needed, e.g.
-    # if not current_user.role == "AUTHORITY_ADMIN":
-    #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    Retrieve active organizations, ordered by id.
+
+    Pages are served pre-serialized from the organization directory with an
+    ETag; send it back in If-None-Match to get a 304 while nothing changed.
+    Pages are built from the primary: one cached from a lagging replica right
+    after an invalidation would be served stale until the next change.
     """
-    stmt = select(Organization).offset(skip).limit(limit).where(Organization.is_active == True)
-    organizations = db.execute(stmt).scalars().all()
-    return organizations
\ No newline at end of file
+    (body, etag), cached = org_directory.page(db, skip, limit)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in _if_none_match(request):
+        directory_requests.inc(result="not_modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    directory_requests.inc(result="memory" if cached else "database")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _if_none_match(request: Request) -> List[str]:
+    value = request.headers.get("if-none-match", "")
+    return [tag.strip().removeprefix("W/") for tag in value.split(",") if tag.strip()]
+
+
+@router.patch("/{organization_id}", response_model=OrganizationResponse)
+async def update_organization(
+    organization_id: int,
+    org_in: OrganizationUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Any:
+    """Edit or (de)activate an organization (authority admins only)."""
+    organization = db.get(Organization, organization_id)
+    if organization is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+
+    changes = {
+        field: value
+        for field, value in org_in.model_dump(exclude_unset=True).items()
+        if value is not None and getattr(organization, field) != value
+    }
+    if not changes:
+        return organization
+    old_active = organization.is_active
+    for field, value in changes.items():
+        setattr(organization, field, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Organization with this name already exists",
+        )
+    db.refresh(organization)
+
+    org_directory.invalidate(organization.id)
+    if "is_active" in changes:
+        action = "activated" if organization.is_active else "deactivated"
+    else:
+        action = "updated"
+    audit_log.record(
+        ORGANIZATION,
+        organization.id,
+        action,
+        actor_user_id=current_user.id,
+        old_value=old_active if "is_active" in changes else None,
+        new_value=organization.is_active if "is_active" in changes else None,
+        details={"fields": sorted(changes)},
+    )
+    return organization
+
+
+@router.get("/{organization_id}/drones", response_model=DroneFleetPage)
+async def read_organization_drones(
+    organization_id: int,
+    after: Optional[int] = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Drones owned by an organization, with owner, pilots and latest position.
+
+    Open to the organization's admin and to authority admins.
+    """
+    allowed = current_user.role == UserRole.AUTHORITY_ADMIN or (
+        current_user.role == UserRole.ORGANIZATION_ADMIN
+        and current_user.organization_id == organization_id
+    )
+    if not allowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    if db.get(Organization, organization_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+
+    stmt = select(Drone).where(Drone.organization_id == organization_id)
+    drones, next_cursor = fleet_page(db, stmt, after, limit)
+    return {"items": drones, "next_cursor": next_cursor}
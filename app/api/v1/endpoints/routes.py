@@ -0,0 +1,48 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.route import RoutePlanRequest, RoutePlanResponse
+from app.services.route_planner import NoRouteError, path_length_m, route_planner
+
+router = APIRouter()
+
+
+@router.post("/plan", response_model=RoutePlanResponse)
+async def plan_route(
+    route_in: RoutePlanRequest,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Suggest the shortest route between two points that avoids active NFZs.
+
+    Only zones whose altitude band contains the requested altitude are avoided.
+    Each zone is kept at a clearance of ROUTE_PLANNER_BUFFER_M.
+    """
+    try:
+        path, avoided = await run_in_threadpool(
+            route_planner.plan,
+            (route_in.start_latitude, route_in.start_longitude),
+            (route_in.end_latitude, route_in.end_longitude),
+            route_in.altitude_m,
+        )
+    except NoRouteError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+    return {
+        "waypoints": [
+            {
+                "latitude": lat,
+                "longitude": lon,
+                "altitude_m": route_in.altitude_m,
+                "sequence_order": i,
+            }
+            for i, (lat, lon) in enumerate(path)
+        ],
+        "distance_m": path_length_m(path),
+        "direct": len(path) == 2,
+        "avoided_zone_ids": avoided,
+    }
@@ -0,0 +1,241 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import (APIRouter, Depends, Header, HTTPException, Query,
+                     WebSocket, WebSocketDisconnect, status)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import (get_current_ingest_user, get_operable_drone,
+                          get_user_from_token)
+from app.core.config import settings
+from app.db.database import ReadSessionLocal, SessionLocal, get_ingest_db
+from app.models.telemetry_log import TelemetryLog
+from app.models.user import User
+from app.schemas.telemetry import TelemetryBatchIn, TelemetryIngestResponse
+from app.services.event_bus import (DRONE_STATUS, FLIGHT_STATUS, TELEMETRY,
+                                    EventHistory, event_bus)
+from app.services.live_scope import LiveEventScope
+from app.services.telemetry_service import as_utc, telemetry_ingest_service
+
+router = APIRouter()
+
+LIVE_TOPICS = {TELEMETRY, DRONE_STATUS, FLIGHT_STATUS}
+# Points are published after their transaction commits, and device clocks
+# drift; replaying a little before the last seen event covers both, at the
+# cost of a few repeated points.
+SSE_REPLAY_MARGIN = timedelta(seconds=5)
+# Origin part of the ids of points replayed from the database; never a
+# worker's, so resuming from one always goes back to the database.
+REPLAY_ID_ORIGIN = "db"
+
+
+@router.post(
+    "/telemetry/",
+    response_model=TelemetryIngestResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def ingest_telemetry(
+    batch: TelemetryBatchIn,
+    db: Session = Depends(get_ingest_db),
+    current_user: User = Depends(get_current_ingest_user),
+) -> Any:
+    """Report telemetry points for a drone the caller operates.
+
+    Safe to retry: points already received are counted as duplicates and
+    not stored again.
+    """
+    drone = get_operable_drone(db, current_user, batch.drone_id)
+    problem = telemetry_ingest_service.flight_plan_problem(
+        db, drone, batch.flight_plan_id
+    )
+    if problem is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=problem
+        )
+    logs = telemetry_ingest_service.ingest(db, drone=drone, batch=batch)
+    return {"accepted": len(logs), "duplicates": len(batch.points) - len(logs)}
+
+
+@router.websocket("/ws/telemetry")
+async def telemetry_websocket(websocket: WebSocket, token: str = Query(...)):
+    """Live telemetry, drone-status and flight-status events from all workers.
+
+    Only events about drones and flight plans the user may see are sent.
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+    finally:
+        db.close()
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_bus.subscribe(LIVE_TOPICS)
+    scope = LiveEventScope(user)
+
+    async def forward_events():
+        while True:
+            event = await subscription.get()
+            if not await scope.allows(event):
+                continue
+            await websocket.send_json({"topic": event["topic"], "data": event["data"]})
+
+    sender = asyncio.create_task(forward_events())
+    try:
+        # Clients don't send anything; reading just detects the disconnect.
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        subscription.close()
+
+
+def _sse(topic: str, data: Any, event_id: Optional[str] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {topic}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _replay_id(log: TelemetryLog) -> str:
+    ms = int(as_utc(log.timestamp).timestamp() * 1000)
+    return f"{REPLAY_ID_ORIGIN}-{log.id}-{ms}"
+
+
+def _telemetry_since(
+    since: datetime, drone_ids: Optional[Set[int]]
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+    """(event id, point) pairs from ``since`` on, oldest first, and whether
+    older ones were left out to stay within SSE_REPLAY_MAX_DB_POINTS.
+
+    ``drone_ids`` limits the replay to those drones; None means all of them.
+    The newest points are kept, since those are what the client is missing
+    most. Ids look like ``db-<row id>-<point ms>``, so a client that
+    reconnects again resumes from the last point it was sent.
+    """
+    if drone_ids is not None and not drone_ids:
+        return [], False
+    stmt = select(TelemetryLog).where(
+        TelemetryLog.timestamp >= since - SSE_REPLAY_MARGIN
+    )
+    if drone_ids is not None:
+        stmt = stmt.where(TelemetryLog.drone_id.in_(drone_ids))
+    db = ReadSessionLocal()
+    try:
+        logs = (
+            db.execute(
+                stmt.order_by(TelemetryLog.timestamp.desc(), TelemetryLog.id.desc())
+                .limit(settings.SSE_REPLAY_MAX_DB_POINTS + 1)
+            )
+            .scalars()
+            .all()
+        )
+        truncated = len(logs) > settings.SSE_REPLAY_MAX_DB_POINTS
+        logs = logs[: settings.SSE_REPLAY_MAX_DB_POINTS]
+        logs.reverse()
+        return [
+            (_replay_id(log), telemetry_ingest_service.live_message(log))
+            for log in logs
+        ], truncated
+    finally:
+        db.close()
+
+
+@router.get("/sse/telemetry")
+async def telemetry_event_stream(
+    token: str = Query(...),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Live telemetry, drone-status and flight-status events as Server-Sent Events.
+
+    For clients that cannot hold a WebSocket. On reconnect the browser sends
+    ``Last-Event-ID`` and the stream resumes from the worker's recent-event
+    buffer. If the gap is older than the buffer (or the client lands on
+    another worker), telemetry is replayed from the database instead; status
+    events from that gap are not, so a ``resync`` event tells the client to
+    refetch drone and flight state. Its ``truncated`` flag says the gap held
+    more than SSE_REPLAY_MAX_DB_POINTS points and only the newest were sent.
+    A client too slow to keep up loses the oldest queued events; it is sent a
+    ``resync`` with the number of ``dropped_events`` before the stream goes on.
+
+    As on the WebSocket, only events the user may see are sent.
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+    finally:
+        db.close()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+
+    # Subscribing and reading the buffer both happen on the event loop, where
+    # events are delivered, so every event lands in exactly one of the two.
+    subscription = event_bus.subscribe(LIVE_TOPICS)
+    replay = event_bus.history.since(last_event_id) if last_event_id else []
+    resync = replay is None
+    parsed = EventHistory.parse_id(last_event_id) if resync else None
+    scope = LiveEventScope(user)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            if resync:
+                points, truncated = [], False
+                if parsed is not None:
+                    since = datetime.fromtimestamp(parsed[2], tz=timezone.utc)
+                    drone_ids = None if scope.everything else await scope.drone_ids()
+                    points, truncated = await asyncio.to_thread(
+                        _telemetry_since, since, drone_ids
+                    )
+                for event_id, point in points:
+                    yield _sse(TELEMETRY, point, event_id)
+                yield _sse(
+                    "resync", {"replayed_points": len(points), "truncated": truncated}
+                )
+            else:
+                for event in replay:
+                    if await scope.allows(event):
+                        yield _sse(event["topic"], event["data"], event["id"])
+            dropped = 0  # Counted from subscribing, not from the first read.
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), settings.SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscription.dropped > dropped:
+                    # The queue overflowed while the client was slow to read;
+                    # what it holds now no longer follows on from what was sent.
+                    yield _sse(
+                        "resync",
+                        {
+                            "replayed_points": 0,
+                            "truncated": False,
+                            "dropped_events": subscription.dropped - dropped,
+                        },
+                    )
+                    dropped = subscription.dropped
+                if await scope.allows(event):
+                    yield _sse(event["topic"], event["data"], event["id"])
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
+
+from app.api.deps import get_current_authority_admin, get_current_user
+from app.models.user import User
+from app.services.map_tiles import Tile, map_tiles, tile_requests
+
+router = APIRouter()
+
+MAX_ZOOM = 22
+
+
+def _check_tile(z: int, x: int, y: int) -> None:
+    if not (0 <= x < 1 << z and 0 <= y < 1 << z):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No such tile")
+
+
+def _tile_response(
+    request: Request, layer: str, tile: Tile, cached: bool, max_age: int
+) -> Response:
+    body, etag = tile
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        tile_requests.inc(layer=layer, result="not_modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    tile_requests.inc(layer=layer, result="cached" if cached else "built")
+    return Response(content=body, media_type="application/geo+json", headers=headers)
+
+
+@router.get("/zones/{z}/{x}/{y}")
+async def read_zone_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Restricted zones in force now, clipped to the tile and simplified for
+    its zoom, as a GeoJSON FeatureCollection."""
+    _check_tile(z, x, y)
+    tile, cached = map_tiles.zone_tile(z, x, y)
+    return _tile_response(request, "zones", tile, cached, max_age=0)
+
+
+@router.get("/traffic/{z}/{x}/{y}")
+async def read_traffic_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    current_user: User = Depends(get_current_authority_admin),
+) -> Response:
+    """Latest position of every live drone in the tile, as GeoJSON points
+    (authority admins only).
+
+    Up to MAP_CLUSTER_MAX_ZOOM, drones in the same 64 px cell are merged into
+    one point carrying their count and ids.
+    """
+    _check_tile(z, x, y)
+    tile, cached = map_tiles.traffic_tile(z, x, y)
+    return _tile_response(request, "traffic", tile, cached, max_age=1)
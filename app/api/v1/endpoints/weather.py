@@ -0,0 +1,41 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.weather import WeatherInfo, WeatherRouteRequest
+from app.services.weather import WeatherUnavailable, weather_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=WeatherInfo)
+async def read_weather(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Current weather at a location, from the cache when a nearby point was
+    looked up recently."""
+    try:
+        return await weather_service.at(lat, lon)
+    except WeatherUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@router.post("/route", response_model=List[WeatherInfo])
+async def read_route_weather(
+    route: WeatherRouteRequest,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """Current weather at every waypoint of a route, in the same order.
+
+    Waypoints in the same grid cell share one lookup.
+    """
+    try:
+        return await weather_service.along(
+            [(w.latitude, w.longitude) for w in route.waypoints]
+        )
+    except WeatherUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
@@ -0,0 +1,328 @@
+import asyncio
+import ipaddress
+import json
+import math
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.pool import create_workload_engine
+from app.models.rate_limit_bucket import RateLimitBucket
+
+admission_rejections = metrics.counter(
+    "utm_admission_rejections_total",
+    "Requests turned away before reaching a route",
+    ["route_class", "reason"],
+)
+admission_backend_errors = metrics.counter(
+    "utm_admission_backend_errors_total",
+    "Shared rate-limit lookups that failed and were let through",
+)
+metrics.gauge(
+    "utm_admission_in_flight",
+    "Requests currently being served, by route class",
+    ["route_class"],
+    callback=lambda: {(name,): n for name, n in admission_state.in_flight.items()},
+)
+
+
+class RouteClass(NamedTuple):
+    rate: float  # tokens per second
+    burst: int
+    max_concurrent: Optional[int]  # per worker; None = only the global cap
+
+
+INGEST = "ingest"
+INTERACTIVE = "interactive"
+AUTH = "auth"
+EXPENSIVE = "expensive"
+
+ROUTE_CLASSES: Dict[str, RouteClass] = {
+    INGEST: RouteClass(
+        settings.RATE_LIMIT_INGEST_RATE, settings.RATE_LIMIT_INGEST_BURST, None
+    ),
+    INTERACTIVE: RouteClass(
+        settings.RATE_LIMIT_INTERACTIVE_RATE,
+        settings.RATE_LIMIT_INTERACTIVE_BURST,
+        None,
+    ),
+    # Password hashing makes every login and registration CPU-bound.
+    AUTH: RouteClass(
+        settings.RATE_LIMIT_AUTH_RATE,
+        settings.RATE_LIMIT_AUTH_BURST,
+        settings.ADMISSION_MAX_CONCURRENT_AUTH,
+    ),
+    EXPENSIVE: RouteClass(
+        settings.RATE_LIMIT_EXPENSIVE_RATE,
+        settings.RATE_LIMIT_EXPENSIVE_BURST,
+        settings.ADMISSION_MAX_CONCURRENT_EXPENSIVE,
+    ),
+}
+
+# First match wins; paths that match nothing, or map to None, are not
+# admission-controlled.
+_ROUTES: List[Tuple[str, "re.Pattern[str]", Optional[str]]] = [
+    # Streams stay open for hours and would pin an in-flight slot each.
+    ("GET", re.compile(r"^/api/v1/sse/"), None),
+    ("POST", re.compile(r"^/api/v1/telemetry/?$"), INGEST),
+    ("POST", re.compile(r"^/api/v1/auth/(login|register/.+)$"), AUTH),
+    ("POST", re.compile(r"^/api/v1/routes/plan/?$"), EXPENSIVE),
+    ("POST", re.compile(r"^/api/v1/weather/route/?$"), EXPENSIVE),
+    ("POST", re.compile(r"^/api/v1/flights/\d+/archive/?$"), EXPENSIVE),
+    ("GET", re.compile(r"^/api/v1/flights/\d+/history/?$"), EXPENSIVE),
+    ("GET", re.compile(r"^/api/v1/analytics/flights/\d+/report/?$"), EXPENSIVE),
+    ("*", re.compile(r"^/api/v1/(?!openapi\.json$)"), INTERACTIVE),
+]
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    if method == "OPTIONS":
+        return None  # CORS preflight
+    for route_method, pattern, route_class in _ROUTES:
+        if route_method in ("*", method) and pattern.match(path):
+            return route_class
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _token_subject(token: str) -> Optional[str]:
+    # Only used to pick a bucket, so an expired but genuine token still counts
+    # against its user; forged tokens fail the signature and fall back to IP.
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"verify_exp": False},
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+class TrustedProxies:
+    """Addresses allowed to tell us who the client is via X-Forwarded-For."""
+
+    def __init__(self, spec: str):
+        entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+        self.any = "*" in entries
+        self.networks = [
+            ipaddress.ip_network(entry, strict=False)
+            for entry in entries
+            if entry != "*"
+        ]
+
+    def __contains__(self, address: str) -> bool:
+        if self.any:
+            return True
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+
+trusted_proxies = TrustedProxies(settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def client_address(scope) -> str:
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if address not in trusted_proxies:
+        return address
+    hops = []
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            hops.extend(hop.strip() for hop in value.decode("latin-1").split(","))
+    # Walk back from the nearest hop; the first one not run by us is the
+    # caller, and anything left of it is whatever the caller chose to send.
+    for hop in reversed([hop for hop in hops if hop]):
+        address = hop
+        if hop not in trusted_proxies:
+            break
+    return address
+
+
+def caller_key(scope) -> str:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = _token_subject(token.strip())
+                if subject:
+                    return f"user:{subject}"
+            break
+    return f"ip:{client_address(scope)}"
+
+
+class MemoryRateLimiter:
+    """Per-process token buckets."""
+
+    def __init__(self, max_keys: int = 100_000):
+        # key -> [tokens, last refill (monotonic), time the bucket is full again]
+        self._buckets: Dict[str, List[float]] = {}
+        self._max_keys = max_keys
+        self._next_sweep = max_keys
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; returns 0 if admitted, else seconds until one is free."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(burst)
+        else:
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+        admitted = tokens >= 1.0
+        if admitted:
+            tokens -= 1.0
+        self._buckets[key] = [tokens, now, now + (burst - tokens) / rate]
+        if len(self._buckets) > self._next_sweep:
+            self._sweep(now)
+        return 0.0 if admitted else (1.0 - tokens) / rate
+
+    def _sweep(self, now: float) -> None:
+        # A full bucket is indistinguishable from a missing one.
+        self._buckets = {k: b for k, b in self._buckets.items() if b[2] > now}
+        self._next_sweep = max(self._max_keys, 2 * len(self._buckets))
+
+
+class DatabaseRateLimiter:
+    """Token buckets in rate_limit_buckets, shared by every worker (PostgreSQL).
+
+    One upsert per request refills and takes a token atomically. If the
+    database is unreachable the request is let through rather than failing.
+    """
+
+    def __init__(self):
+        self._engine = create_workload_engine(
+            settings.ASSEMBLED_DATABASE_URL, "background", label="admission"
+        )
+
+    def _take(self, key: str, rate: float, burst: int) -> bool:
+        bucket = RateLimitBucket
+        refilled = func.least(
+            float(burst),
+            bucket.tokens
+            + func.extract("epoch", func.now() - bucket.refilled_at) * rate,
+        )
+        stmt = (
+            insert(bucket)
+            .values(key=key, tokens=burst - 1.0, refilled_at=func.now())
+            .on_conflict_do_update(
+                index_elements=["key"],
+                set_={
+                    "tokens": refilled - 1.0,
+                    "refilled_at": func.now(),
+                    "updated_at": func.now(),
+                },
+                where=refilled >= 1.0,
+            )
+            .returning(bucket.tokens)
+        )
+        with self._engine.begin() as conn:
+            return conn.execute(stmt).first() is not None
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        try:
+            admitted = await asyncio.to_thread(self._take, key, rate, burst)
+        except Exception as e:
+            admission_backend_errors.inc()
+            print(f"Rate limit lookup failed, admitting request: {e}")
+            return 0.0
+        return 0.0 if admitted else 1.0 / rate
+
+
+class AdmissionState:
+    def __init__(self):
+        self.in_flight: Dict[str, int] = {name: 0 for name in ROUTE_CLASSES}
+        self.total = 0
+
+    def try_enter(self, route_class: str) -> bool:
+        # Ingest may dip into the reserve, so interactive traffic is shed first.
+        limit = settings.ADMISSION_MAX_IN_FLIGHT
+        if route_class == INGEST:
+            limit += settings.ADMISSION_INGEST_RESERVE
+        cap = ROUTE_CLASSES[route_class].max_concurrent
+        if self.total >= limit or (
+            cap is not None and self.in_flight[route_class] >= cap
+        ):
+            return False
+        self.in_flight[route_class] += 1
+        self.total += 1
+        return True
+
+    def leave(self, route_class: str) -> None:
+        self.in_flight[route_class] -= 1
+        self.total -= 1
+
+
+admission_state = AdmissionState()
+
+
+def _build_limiter():
+    if settings.RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimiter()
+    return MemoryRateLimiter()
+
+
+class AdmissionMiddleware:
+    """Rate limiting and concurrency caps in front of every API route.
+
+    Callers get one token bucket per route class. Expensive classes also have
+    a per-worker concurrency cap. Rejections are immediate: 429 when the
+    caller is over its rate, 503 when the worker is saturated, both with
+    ``Retry-After``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.limiter = _build_limiter() if settings.RATE_LIMIT_ENABLED else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limiter is None:
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not admission_state.try_enter(route_class):
+            admission_rejections.inc(route_class=route_class, reason="concurrency")
+            await _reject(send, 503, "Server busy, retry shortly", 1.0)
+            return
+        try:
+            spec = ROUTE_CLASSES[route_class]
+            retry_after = await self.limiter.acquire(
+                f"{route_class}:{caller_key(scope)}", spec.rate, spec.burst
+            )
+            if retry_after > 0:
+                admission_rejections.inc(route_class=route_class, reason="rate")
+                await _reject(send, 429, "Too many requests", retry_after)
+                return
+            await self.app(scope, receive, send)
+        finally:
+            admission_state.leave(route_class)
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
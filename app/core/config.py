@@ -15,9 +15,144 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     DATABASE_URL: Optional[str] = None
 
+    # Read replica (optional). When unset, reads are served by the primary.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 2.0
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 10.0
+
+    # Connection pools, one per workload class (api, ingest, background)
+    DB_POOL_API_SIZE: int = 10
+    DB_POOL_API_MAX_OVERFLOW: int = 10
+    DB_POOL_API_TIMEOUT_SECONDS: float = 5.0
+    DB_POOL_INGEST_SIZE: int = 5
+    DB_POOL_INGEST_MAX_OVERFLOW: int = 5
+    DB_POOL_INGEST_TIMEOUT_SECONDS: float = 2.0
+    DB_POOL_BACKGROUND_SIZE: int = 3
+    DB_POOL_BACKGROUND_MAX_OVERFLOW: int = 2
+    DB_POOL_BACKGROUND_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_LIVENESS_CHECK_INTERVAL_SECONDS: float = 30.0
+    DB_PGBOUNCER_MODE: bool = False  # Disable server-side prepared statements
+
+    # Cross-worker event bus (LISTEN/NOTIFY). Needs a direct, session-pooled
+    # connection, so set EVENT_BUS_DATABASE_URL when DATABASE_URL is pgbouncer.
+    EVENT_BUS_DATABASE_URL: Optional[str] = None
+    EVENT_BUS_CHANNEL: str = "utm_events"
+    EVENT_BUS_FLUSH_INTERVAL_SECONDS: float = 0.02
+    EVENT_BUS_SUBSCRIBER_QUEUE_SIZE: int = 1000
+    # Recent events kept per worker so SSE clients can resume with
+    # Last-Event-ID. Older gaps replay telemetry from the database, up to
+    # SSE_REPLAY_MAX_DB_POINTS points.
+    EVENT_BUS_HISTORY_SIZE: int = 10000
+    SSE_REPLAY_MAX_DB_POINTS: int = 5000
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+
+    TELEMETRY_ARCHIVE_DIR: str = "data/telemetry_archive"
+    # Per-drone duplicate suppression: how far behind the newest point a
+    # retransmission is still caught in memory, and at most how many keys
+    TELEMETRY_DEDUP_WINDOW_SECONDS: float = 120.0
+    TELEMETRY_DEDUP_MAX_KEYS: int = 2048
+    # Recent points kept in memory per drone for trails, and the total memory
+    # all drones' buffers may use before the least recently seen are evicted
+    TELEMETRY_TAIL_POINTS_PER_DRONE: int = 600
+    TELEMETRY_TAIL_MEMORY_MB: int = 64
+    # Optional UDP uplink for ground stations. Each drone signs its packets
+    # with HMAC-SHA256(TELEMETRY_UDP_SECRET, serial_number); packets are
+    # stored in batches every flush interval.
+    TELEMETRY_UDP_ENABLED: bool = False
+    TELEMETRY_UDP_HOST: str = "0.0.0.0"
+    TELEMETRY_UDP_PORT: int = 5600
+    TELEMETRY_UDP_SECRET: Optional[str] = None
+    TELEMETRY_UDP_FLUSH_INTERVAL_SECONDS: float = 0.05
+    TELEMETRY_UDP_MAX_PENDING: int = 20000
+
+    # Clearance kept around restricted zones by suggested routes
+    ROUTE_PLANNER_BUFFER_M: float = 50.0
+
+    # Flight plan submission: how far ahead a flight may be booked, how long
+    # it may last, and how late a departure may be submitted
+    FLIGHT_PLAN_MAX_LEAD_DAYS: int = 90
+    FLIGHT_PLAN_MAX_DURATION_HOURS: float = 12.0
+    FLIGHT_PLAN_DEPARTURE_GRACE_SECONDS: float = 300.0
+    # Flight lifecycle: an ACTIVE flight still airborne this long after its
+    # planned arrival raises an overdue alert, and is completed automatically
+    # after FLIGHT_AUTO_COMPLETE_AFTER_SECONDS.
+    FLIGHT_OVERDUE_AFTER_SECONDS: float = 300.0
+    FLIGHT_AUTO_COMPLETE_AFTER_SECONDS: float = 3600.0
+    # How stale the in-memory booking calendar may get before a query resyncs
+    BOOKING_CALENDAR_SYNC_SECONDS: float = 1.0
+
+    # Audit log: events are written in batches of up to AUDIT_BATCH_SIZE, at
+    # most AUDIT_FLUSH_INTERVAL_SECONDS after they happen. Past
+    # AUDIT_MAX_PENDING unwritten events, new ones are dropped (and counted).
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_PENDING: int = 50000
+
+    # Map tiles: serialized zone tiles kept per worker, how often the live
+    # traffic layer is re-snapshotted, how recently a drone must have reported
+    # to show up, and the deepest zoom at which nearby drones are clustered
+    MAP_TILE_CACHE_TILES: int = 4096
+    MAP_TRAFFIC_TICK_SECONDS: float = 1.0
+    MAP_LIVE_DRONE_SECONDS: float = 30.0
+    MAP_CLUSTER_MAX_ZOOM: int = 14
+
+    # Upper bound on how long the organization directory serves a page
+    # without rebuilding it, should a change notification get lost
+    ORG_DIRECTORY_MAX_AGE_SECONDS: float = 300.0
+
+    # Weather lookups. WEATHER_PROVIDER is "open-meteo" or "file" (conditions
+    # from WEATHER_FILE_PATH, or calm weather without one). Answers are cached
+    # per WEATHER_GRID_DEGREES grid cell for WEATHER_CACHE_TTL_SECONDS.
+    WEATHER_PROVIDER: str = "open-meteo"
+    WEATHER_API_URL: str = "https://api.open-meteo.com/v1/forecast"
+    WEATHER_FILE_PATH: Optional[str] = None
+    WEATHER_TIMEOUT_SECONDS: float = 5.0
+    WEATHER_GRID_DEGREES: float = 0.1
+    WEATHER_CACHE_TTL_SECONDS: float = 600.0
+    WEATHER_CACHE_MAX_CELLS: int = 10000
+    WEATHER_MAX_CONCURRENT_FETCHES: int = 8
+
+    # Flight reports: allowed deviation from the planned route, distance that
+    # counts as "near" a restricted zone, and silence that counts as a gap
+    ANALYTICS_ROUTE_TOLERANCE_M: float = 100.0
+    ANALYTICS_ZONE_PROXIMITY_M: float = 500.0
+    ANALYTICS_SIGNAL_GAP_SECONDS: float = 5.0
+    # Rollups count the time between two points of the same flight as flight
+    # time only up to this long; a longer silence is treated as time on the
+    # ground (landed, battery swap) rather than airborne
+    ANALYTICS_AIRBORNE_GAP_SECONDS: float = 60.0
+
+    # Admission control. Token buckets refill at RATE per second up to BURST,
+    # per caller (user from the bearer token, else client IP) and route class.
+    # "database" shares buckets between workers through rate_limit_buckets.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_INGEST_RATE: float = 50.0
+    RATE_LIMIT_INGEST_BURST: int = 200
+    RATE_LIMIT_INTERACTIVE_RATE: float = 10.0
+    RATE_LIMIT_INTERACTIVE_BURST: int = 40
+    RATE_LIMIT_AUTH_RATE: float = 0.2
+    RATE_LIMIT_AUTH_BURST: int = 5
+    RATE_LIMIT_EXPENSIVE_RATE: float = 0.5
+    RATE_LIMIT_EXPENSIVE_BURST: int = 5
+    # Concurrency caps per worker. Ingest may use ADMISSION_INGEST_RESERVE
+    # slots beyond ADMISSION_MAX_IN_FLIGHT, so interactive traffic is shed first.
+    ADMISSION_MAX_IN_FLIGHT: int = 200
+    ADMISSION_INGEST_RESERVE: int = 100
+    ADMISSION_MAX_CONCURRENT_AUTH: int = 8
+    ADMISSION_MAX_CONCURRENT_EXPENSIVE: int = 4
+    # Peers whose X-Forwarded-For is believed when keying anonymous callers:
+    # comma-separated addresses or networks, "*" for any. Behind a reverse
+    # proxy (e.g. Render) the socket peer is the proxy, so without this every
+    # anonymous caller would share one bucket.
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
     BACKEND_CORS_ORIGINS: Union[str, List[str]] = '["*"]'  # Default to allow all
 
@@ -1,22 +1,100 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.db.base_class import Base  # Import your Base
+from app.db.pool import create_workload_engine
+from app.db.replica import (ReadYourWritesTracker, ReplicaLagMonitor,
+                            request_principal)
 
-# For synchronous operations (FastAPI default)
-engine = create_engine(
-    settings.ASSEMBLED_DATABASE_URL,
-    pool_pre_ping=True,
-    # connect_args={"options": "-c timezone=utc"} # Optional: ensure timezone consistency
+# For synchronous operations (FastAPI default). Each workload class has its own
+# pool; `engine` is the interactive API pool.
+engine = create_workload_engine(settings.ASSEMBLED_DATABASE_URL, "api")
+ingest_engine = create_workload_engine(settings.ASSEMBLED_DATABASE_URL, "ingest")
+background_engine = create_workload_engine(
+    settings.ASSEMBLED_DATABASE_URL, "background"
+)
+
+# Optional streaming replica for heavy read endpoints. Without one, the replica
+# engine is the primary and get_read_db behaves exactly like get_db.
+replica_engine = (
+    create_workload_engine(settings.DATABASE_REPLICA_URL, "api", label="replica")
+    if settings.DATABASE_REPLICA_URL
+    else engine
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+IngestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ingest_engine)
+BackgroundSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=background_engine
+)
+
+write_tracker = ReadYourWritesTracker(settings.READ_YOUR_WRITES_WINDOW_SECONDS)
+replica_lag_monitor = ReplicaLagMonitor(
+    replica_engine,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_orm_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_committed_write(session):
+    if session.info.pop("wrote", False):
+        write_tracker.mark_write(session.info.get("principal"))
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_rolled_back_write(session):
+    session.info.pop("wrote", None)
 
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    db = SessionLocal(info={"principal": request_principal(request)})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency for telemetry ingest; uses the dedicated ingest pool.
+def get_ingest_db():
+    db = IngestSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency for read-only endpoints. Uses the replica unless the caller wrote
+# within the read-your-writes window or the replica is lagging/unreachable.
+def get_read_db(request: Request):
+    principal = request_principal(request)
+    if (
+        replica_engine is engine
+        or write_tracker.recently_wrote(principal)
+        or not replica_lag_monitor.replica_is_fresh()
+    ):
+        db = SessionLocal(info={"principal": principal})
+    else:
+        db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -0,0 +1,136 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+pool_checkout_wait = metrics.summary(
+    "utm_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+)
+pool_timeouts = metrics.counter(
+    "utm_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout",
+    ["pool"],
+)
+pool_liveness_failures = metrics.counter(
+    "utm_db_pool_liveness_failures_total",
+    "Idle connections discarded by the liveness check",
+    ["pool"],
+)
+
+_pools: Dict[str, QueuePool] = {}
+
+
+def _pool_state() -> Dict[tuple, float]:
+    state = {}
+    for name, pool in list(_pools.items()):
+        state[(name, "active")] = pool.checkedout()
+        state[(name, "idle")] = pool.checkedin()
+        state[(name, "overflow")] = max(pool.overflow(), 0)
+    return state
+
+
+metrics.gauge(
+    "utm_db_pool_connections",
+    "Pooled connections by state",
+    ["pool", "state"],
+    callback=_pool_state,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait time and timeouts per workload."""
+
+    def __init__(self, *args: Any, workload: str = "api", **kwargs: Any):
+        self.workload = workload
+        super().__init__(*args, **kwargs)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.workload = self.workload  # type: ignore[attr-defined]
+        _pools[self.workload] = pool  # type: ignore[assignment]
+        return pool  # type: ignore[return-value]
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(pool=self.workload)
+            raise
+        finally:
+            pool_checkout_wait.observe(
+                time.perf_counter() - started, pool=self.workload
+            )
+
+
+def _pgbouncer_connect_args(url: str) -> Dict[str, Any]:
+    """Disable server-side prepared statements for transaction-pooled pgbouncer."""
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    if driver == "asyncpg":
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    # psycopg2 never prepares statements server-side.
+    return {}
+
+
+def _install_liveness_check(engine: Engine, workload: str) -> None:
+    """Ping only connections that sat idle longer than the configured interval.
+
+    Replaces pool_pre_ping, which costs a round trip on every checkout.
+    """
+    interval = settings.DB_LIVENESS_CHECK_INTERVAL_SECONDS
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _check_liveness(dbapi_connection, connection_record, connection_proxy):
+        idle_since = connection_record.info.get("idle_since")
+        if idle_since is None or time.monotonic() - idle_since < interval:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            pool_liveness_failures.inc(pool=workload)
+            # The pool discards this connection and retries with a fresh one.
+            raise DisconnectionError()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+# Workload classes (api, ingest, background) get separate pools so a burst in
+# one, e.g. telemetry ingest, cannot exhaust the connections the others need.
+def create_workload_engine(url: str, workload: str, label: str = "") -> Engine:
+    """Engine sized for a workload class; ``label`` names the pool in metrics."""
+    label = label or workload
+    prefix = "DB_POOL_" + workload.upper()
+    connect_args = _pgbouncer_connect_args(url) if settings.DB_PGBOUNCER_MODE else {}
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=getattr(settings, f"{prefix}_SIZE"),
+        max_overflow=getattr(settings, f"{prefix}_MAX_OVERFLOW"),
+        pool_timeout=getattr(settings, f"{prefix}_TIMEOUT_SECONDS"),
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        connect_args=connect_args,
+        # connect_args={"options": "-c timezone=utc"} # Optional: ensure timezone consistency
+    )
+    engine.pool.workload = label  # type: ignore[attr-defined]
+    _pools[label] = engine.pool  # type: ignore[assignment]
+    _install_liveness_check(engine, label)
+    return engine
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+# Lag is reported as 0 on a primary (single-instance stand-in) and on a replica
+# that has replayed everything it received, so an idle cluster is not "lagging".
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+def request_principal(request: Request) -> str:
+    """Key used to group a caller's writes and reads (token subject or client IP)."""
+    auth_header = request.headers.get("authorization", "")
+    scheme, _, token = auth_header.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            # Routing only: the signature is verified by the auth dependencies.
+            subject = jwt.get_unverified_claims(token).get("sub")
+            if subject:
+                return f"user:{subject}"
+        except JWTError:
+            pass
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+class ReadYourWritesTracker:
+    """Remembers which principals wrote recently so their reads stay on the primary."""
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, principal: Optional[str]) -> None:
+        if not principal:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[principal] = now
+            if len(self._last_write) > self.max_entries:
+                self._prune(now)
+
+    def recently_wrote(self, principal: str) -> bool:
+        last_write = self._last_write.get(principal)
+        return (
+            last_write is not None
+            and time.monotonic() - last_write < self.window_seconds
+        )
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            key
+            for key, written_at in self._last_write.items()
+            if now - written_at >= self.window_seconds
+        ]
+        for key in expired:
+            del self._last_write[key]
+
+
+class ReplicaLagMonitor:
+    """Periodically measures replica lag; callers get a cached verdict."""
+
+    def __init__(
+        self, engine: Engine, max_lag_seconds: float, check_interval_seconds: float
+    ):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: Optional[float] = None  # None = unknown/unreachable
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def replica_is_fresh(self) -> bool:
+        if time.monotonic() - self._checked_at >= self.check_interval_seconds:
+            # Only one thread probes; the others use the previous measurement.
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._refresh()
+                finally:
+                    self._lock.release()
+        lag = self.lag_seconds
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def _refresh(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                lag = conn.execute(REPLICA_LAG_SQL).scalar()
+            self.lag_seconds = float(lag or 0)
+        except SQLAlchemyError as e:
+            print(f"Replica lag check failed, routing reads to primary: {e}")
+            self.lag_seconds = None
+        self._checked_at = time.monotonic()
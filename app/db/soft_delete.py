@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Index, event, text, true
+from sqlalchemy.orm import Session, with_loader_criteria
+
+LIVE = "deleted_at IS NULL"
+
+
+class SoftDeleteMixin:
+    """Rows are tombstoned with ``deleted_at`` instead of being deleted.
+
+    Every ORM SELECT that names a soft-deletable model (including
+    ``Session.get``) is filtered to live rows automatically. Pass
+    ``execution_options(include_deleted=True)`` to see tombstones, and
+    ``execution_options(active_only=True)`` to also require ``is_active`` on
+    models that have it. Relationship loads are left alone, so a live row
+    still reaches a parent that was deleted after it, and collections list
+    tombstoned children too.
+    """
+
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+    def soft_delete(self) -> None:
+        self.deleted_at = datetime.now(timezone.utc)
+
+
+def live_index(name: str, *columns: str, unique: bool = False) -> Index:
+    """Partial index over live rows only, so tombstones never bloat it."""
+    return Index(
+        name,
+        *columns,
+        unique=unique,
+        postgresql_where=text(LIVE),
+        sqlite_where=text(LIVE),
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(state) -> None:
+    if (
+        not state.is_select
+        or state.is_column_load
+        or state.is_relationship_load
+        or state.execution_options.get("include_deleted", False)
+    ):
+        return
+    options = [
+        with_loader_criteria(
+            SoftDeleteMixin,
+            lambda cls: cls.deleted_at.is_(None),
+            include_aliases=True,
+            propagate_to_loaders=False,
+        )
+    ]
+    if state.execution_options.get("active_only", False):
+        for mapper in state.all_mappers:
+            if hasattr(mapper.class_, "is_active"):
+                options.append(
+                    with_loader_criteria(
+                        mapper.class_,
+                        lambda cls: cls.is_active == true(),
+                        include_aliases=True,
+                        propagate_to_loaders=False,
+                    )
+                )
+    state.statement = state.statement.options(*options)
@@ -0,0 +1,13 @@
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """INSERT construct with ON CONFLICT support for the session's dialect.
+
+    Production runs on PostgreSQL; SQLite is accepted for local scripts.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model)
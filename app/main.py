@@ -1,8 +1,24 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.api import api_router
+from app.core.admission import AdmissionMiddleware
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import BackgroundSessionLocal
+from app.services.audit_log import audit_log
+from app.services.event_bus import event_bus
+from app.services.flight_lifecycle import flight_lifecycle
+from app.services.nfz_geometry import nfz_index
+from app.services.nfz_revalidation import nfz_revalidator
+from app.services.nfz_schedule import nfz_scheduler
+from app.services.org_directory import org_directory
+from app.services.route_planner import route_planner
+from app.services.telemetry_tail import telemetry_tail
+from app.services.telemetry_udp import udp_telemetry
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -10,6 +26,9 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json",
 )
 
+# Admission control sits inside CORS so rejections still carry CORS headers.
+app.add_middleware(AdmissionMiddleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -30,12 +49,63 @@ async def root():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    return metrics.render()
+
+
 @app.on_event("startup")
 async def startup_event():
     print(f"{settings.PROJECT_NAME} is starting up...")
     # Potential DB connection check or initial data seeding here later
+    await event_bus.start()
+    await audit_log.start()
+    await org_directory.start()
+    await telemetry_tail.start()
+    if settings.TELEMETRY_UDP_ENABLED:
+        try:
+            await udp_telemetry.start(
+                settings.TELEMETRY_UDP_HOST, settings.TELEMETRY_UDP_PORT
+            )
+        except OSError as e:
+            print(f"Could not start UDP telemetry listener: {e}")
+    await nfz_scheduler.start()
+    await nfz_revalidator.start()
+    db = BackgroundSessionLocal()
+    try:
+        nfz_scheduler.load(db)
+        print(
+            f"Loaded {len(nfz_scheduler.zones)} restricted zones, "
+            f"{len(nfz_index.zones)} active now."
+        )
+    except Exception as e:
+        print(f"Could not load restricted zones: {e}")
+    finally:
+        db.close()
+    await flight_lifecycle.start()
+    db = BackgroundSessionLocal()
+    try:
+        flight_lifecycle.load(db)
+        print(f"Scheduled {len(flight_lifecycle.next_steps)} flight lifecycle steps.")
+    except Exception as e:
+        print(f"Could not load flight lifecycle schedule: {e}")
+    finally:
+        db.close()
+    # Build the route planner's visibility graph off the event loop.
+    app.state.route_graph_warmup = asyncio.create_task(
+        asyncio.to_thread(route_planner.refresh)
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print(f"{settings.PROJECT_NAME} is shutting down...")
+    await flight_lifecycle.stop()
+    await nfz_revalidator.stop()
+    await nfz_scheduler.stop()
+    await udp_telemetry.stop()
+    await telemetry_tail.stop()
+    await org_directory.stop()
+    # Last, so state changes made while shutting down are still written.
+    await audit_log.stop()
+    await event_bus.stop()
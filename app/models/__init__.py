@@ -1,8 +1,12 @@
+from .audit_event import AuditEvent
 from .drone import Drone, DroneOwnerType, DroneStatus
 from .flight_plan import FlightPlan, FlightPlanStatus
 from .organization import Organization
+from .rate_limit_bucket import RateLimitBucket
+from .refresh_token import RefreshToken
 from .restricted_zone import NFZGeometryType, RestrictedZone
 from .telemetry_log import TelemetryLog
+from .telemetry_rollup import DroneDailyTelemetryRollup, FlightTelemetryRollup
 from .user import User, UserRole
 from .user_drone_assignment import UserDroneAssignment
 from .waypoint import Waypoint
@@ -0,0 +1,29 @@
+# backend/app/models/audit_event.py
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String
+
+from app.db.base_class import Base
+
+
+class AuditEvent(Base):
+    """Append-only history of state changes; rows are never updated."""
+
+    __table_args__ = (
+        Index("ix_audit_events_entity", "entity_type", "entity_id", "id"),
+        Index("ix_audit_events_actor", "actor_user_id", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+
+    entity_type = Column(String(32), nullable=False)  # "flight_plan", "drone", "user"
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(64), nullable=False)
+    # No foreign key: history is written in batches and must outlive its actors.
+    actor_user_id = Column(Integer, nullable=True)
+    old_value = Column(String(64), nullable=True)
+    new_value = Column(String(64), nullable=True)
+    details = Column(JSON, nullable=True)
+    # When the change happened; created_at is when the batch was written.
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<AuditEvent(id={self.id}, {self.entity_type}:{self.entity_id} {self.action})>"
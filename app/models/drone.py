@@ -7,6 +7,7 @@ from sqlalchemy import Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.soft_delete import SoftDeleteMixin, live_index
 from app.models.telemetry_log import TelemetryLog
 
 
@@ -23,10 +24,14 @@ class DroneStatus(str, enum.Enum):
     # Consider adding more specific error/alert statuses if needed at drone level
 
 
-class Drone(Base):
+class Drone(SoftDeleteMixin, Base):
+    __table_args__ = (
+        live_index("ix_drones_serial_number_live", "serial_number", unique=True),
+    )
+
     brand = Column(String(100), nullable=False)
     model = Column(String(100), nullable=False)
-    serial_number = Column(String(100), unique=True, index=True, nullable=False)
+    serial_number = Column(String(100), nullable=False)
 
     owner_type = Column(SQLAlchemyEnum(DroneOwnerType), nullable=False)
 
@@ -61,7 +66,6 @@ class Drone(Base):
         nullable=True,
     )  # use_alter for potential circular dep
     last_seen_at = Column(DateTime(timezone=True), nullable=True)
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     telemetry_logs = relationship(
         TelemetryLog,  # or "TelemetryLog"
@@ -86,5 +90,13 @@ class Drone(Base):
         primaryjoin="Drone.last_telemetry_id == TelemetryLog.id",
     )
 
+    @property
+    def assigned_pilots(self):
+        return [
+            a.user
+            for a in self.assigned_users_association
+            if a.user is not None and not a.user.is_deleted
+        ]
+
     def __repr__(self):
         return f"<Drone(id={self.id}, serial_number='{self.serial_number}')>"
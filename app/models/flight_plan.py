@@ -1,12 +1,14 @@
 # backend/app/models/flight_plan.py
 import enum
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import JSON, Column, DateTime
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Integer, String, column, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.soft_delete import SoftDeleteMixin, live_index
 
 
 class FlightPlanStatus(str, enum.Enum):
@@ -23,7 +25,44 @@ class FlightPlanStatus(str, enum.Enum):
     CANCELLED_BY_ADMIN = "CANCELLED_BY_ADMIN"  # Org or Authority
 
 
-class FlightPlan(Base):
+# Plans that hold their drone for the planned window.
+BOOKED_STATUSES = (
+    FlightPlanStatus.PENDING_ORG_APPROVAL,
+    FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    FlightPlanStatus.APPROVED,
+    FlightPlanStatus.ACTIVE,
+)
+
+
+def booked_window(departure, arrival):
+    return func.tstzrange(departure, arrival, text("'[)'"))
+
+
+class FlightPlan(SoftDeleteMixin, Base):
+    __table_args__ = (
+        live_index("ix_flight_plans_status_live", "status"),
+        # No two live bookings of one drone may overlap (needs btree_gist).
+        ExcludeConstraint(
+            (column("drone_id"), "="),
+            (
+                booked_window(
+                    column("planned_departure_time"), column("planned_arrival_time")
+                ),
+                "&&",
+            ),
+            name="ex_flight_plans_drone_booking",
+            using="gist",
+            # Inverted windows book nothing and would make tstzrange() fail.
+            where=text(
+                "deleted_at IS NULL"
+                " AND planned_departure_time < planned_arrival_time"
+                " AND status IN ("
+                + ", ".join(f"'{s.value}'" for s in BOOKED_STATUSES)
+                + ")"
+            ),
+        ).ddl_if(dialect="postgresql"),
+    )
+
     user_id = Column(
         Integer, ForeignKey("users.id", name="fk_flightplan_user_id"), nullable=False
     )
@@ -60,7 +99,18 @@ class FlightPlan(Base):
     )
     approved_at = Column(DateTime(timezone=True), nullable=True)  # Final approval time
 
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Columnar telemetry archive written once the flight is COMPLETED
+    archive_path = Column(String(500), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Ids of active restricted zones the planned route crosses, kept current by
+    # the NFZ revalidator whenever a zone is created, edited or removed.
+    nfz_conflict_zone_ids = Column(JSON, nullable=True)
+    nfz_checked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Set by the lifecycle scheduler once an overdue alert went out, so other
+    # workers and restarts don't raise it again.
+    overdue_alerted_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     submitter_user = relationship(
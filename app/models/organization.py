@@ -1,11 +1,14 @@
 # backend/app/models/organization.py
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.soft_delete import SoftDeleteMixin, live_index
 
 
-class Organization(Base):
+class Organization(SoftDeleteMixin, Base):
+    __table_args__ = (live_index("ix_organizations_is_active_live", "is_active"),)
+
     name = Column(String(255), unique=True, index=True, nullable=False)
     bin = Column(
         String(12), unique=True, index=True, nullable=False
@@ -22,7 +25,6 @@ class Organization(Base):
     )
 
     is_active = Column(Boolean(), default=True, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationships
     # admin_user = relationship("User", foreign_keys=[admin_id]) # If needed, define carefully to avoid cycles
@@ -0,0 +1,15 @@
+# backend/app/models/rate_limit_bucket.py
+from sqlalchemy import Column, DateTime, Float, String
+
+from app.db.base_class import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by all workers when RATE_LIMIT_BACKEND is "database"."""
+
+    key = Column(String(255), unique=True, nullable=False)  # "<class>:<caller>"
+    tokens = Column(Float, nullable=False)
+    refilled_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<RateLimitBucket(key='{self.key}', tokens={self.tokens})>"
@@ -0,0 +1,24 @@
+# backend/app/models/refresh_token.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.db.base_class import Base
+
+
+class RefreshToken(Base):
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", name="fk_refresh_token_user_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # SHA-256 of the token; the token itself is only ever held by the client.
+    token_hash = Column(String(64), unique=True, nullable=False)
+    # Every token rotated from one login shares a family, so replaying a used
+    # token can revoke the whole chain.
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family='{self.family_id}')>"
@@ -1,12 +1,13 @@
 # backend/app/models/restricted_zone.py
 import enum
 
-from sqlalchemy import JSON, Boolean, Column, DateTime
+from sqlalchemy import JSON, Boolean, CheckConstraint, Column, DateTime
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy import Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.soft_delete import SoftDeleteMixin, live_index
 
 
 class NFZGeometryType(str, enum.Enum):
@@ -15,7 +16,15 @@ class NFZGeometryType(str, enum.Enum):
     # RECTANGLE could be a special case of POLYGON or handled separately
 
 
-class RestrictedZone(Base):
+class RestrictedZone(SoftDeleteMixin, Base):
+    __table_args__ = (
+        CheckConstraint(
+            "active_from IS NULL OR active_until IS NULL OR active_from < active_until",
+            name="ck_restricted_zones_window",
+        ),
+        live_index("ix_restricted_zones_is_active_live", "is_active"),
+    )
+
     name = Column(String(255), index=True, nullable=False)
     description = Column(String(1000), nullable=True)
 
@@ -29,7 +38,9 @@ class RestrictedZone(Base):
     max_altitude_m = Column(Float, nullable=True)
 
     is_active = Column(Boolean(), default=True, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    # Optional window for temporary restrictions; NULL means unbounded.
+    active_from = Column(DateTime(timezone=True), nullable=True, index=True)
+    active_until = Column(DateTime(timezone=True), nullable=True, index=True)
 
     created_by_authority_id = Column(
         Integer, ForeignKey("users.id", name="fk_nfz_creator_id"), nullable=False
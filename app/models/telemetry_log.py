@@ -1,12 +1,17 @@
 # backend/app/models/telemetry_log.py
 from sqlalchemy import (BigInteger, Column, DateTime, Float, ForeignKey,
-                        Integer, String)
+                        Integer, String, UniqueConstraint)
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
 
 class TelemetryLog(Base):
+    # A drone reports one position per instant; retransmissions collide here.
+    __table_args__ = (
+        UniqueConstraint("drone_id", "timestamp", name="uq_telemetry_drone_timestamp"),
+    )
+
     # Override id for BigInteger if high frequency telemetry is expected
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
 
@@ -33,7 +38,10 @@ class TelemetryLog(Base):
     heading_degrees = Column(Float, nullable=True)  # 0-359.9, North is 0
     status_message = Column(
         String(255), nullable=True
-    )  # e.g., "ON_SCHEDULE", "NFZ_ALERT: Parliament", "SIGNAL_LOST_SIMULATED"
+    )  # As reported by the drone, e.g. "ON_SCHEDULE", "SIGNAL_LOST_SIMULATED"
+    # Set by ingest when the point lies inside restricted zones, e.g.
+    # "NFZ_ALERT: Parliament"; kept apart so the drone's own status survives
+    nfz_alert = Column(String(255), nullable=True)
 
     # Relationships
     flight_plan = relationship("FlightPlan", back_populates="telemetry_logs")
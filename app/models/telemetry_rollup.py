@@ -0,0 +1,83 @@
+# backend/app/models/telemetry_rollup.py
+from sqlalchemy import (Column, Date, DateTime, Float, ForeignKey, Integer,
+                        UniqueConstraint)
+
+from app.db.base_class import Base
+
+
+class RollupColumnsMixin:
+    """Running aggregates shared by every rollup grain."""
+
+    point_count = Column(Integer, default=0, nullable=False)
+    distance_m = Column(Float, default=0.0, nullable=False)
+    min_altitude_m = Column(Float, nullable=True)
+    max_altitude_m = Column(Float, nullable=True)
+    speed_sum_mps = Column(Float, default=0.0, nullable=False)
+    speed_count = Column(Integer, default=0, nullable=False)
+    max_speed_mps = Column(Float, nullable=True)
+    violation_count = Column(Integer, default=0, nullable=False)
+    first_timestamp = Column(DateTime(timezone=True), nullable=True)
+    last_timestamp = Column(DateTime(timezone=True), nullable=True)
+    # Time between consecutive points of one flight, leaving out long gaps
+    airborne_seconds = Column(Float, default=0.0, nullable=False)
+    # Last point seen, so the next batch can add the leg joining it (only if
+    # it continues the same flight)
+    last_latitude = Column(Float, nullable=True)
+    last_longitude = Column(Float, nullable=True)
+    last_flight_plan_id = Column(Integer, nullable=True)
+
+    @property
+    def average_speed_mps(self):
+        return self.speed_sum_mps / self.speed_count if self.speed_count else None
+
+    @property
+    def flight_time_seconds(self):
+        return self.airborne_seconds or 0.0
+
+
+class FlightTelemetryRollup(RollupColumnsMixin, Base):
+    flight_plan_id = Column(
+        Integer,
+        ForeignKey(
+            "flight_plans.id", name="fk_flight_rollup_flightplan_id", ondelete="CASCADE"
+        ),
+        nullable=False,
+        unique=True,
+    )
+    drone_id = Column(
+        Integer,
+        ForeignKey("drones.id", name="fk_flight_rollup_drone_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    organization_id = Column(
+        Integer,
+        ForeignKey("organizations.id", name="fk_flight_rollup_organization_id"),
+        nullable=True,
+        index=True,
+    )
+
+    def __repr__(self):
+        return f"<FlightTelemetryRollup(flight_plan_id={self.flight_plan_id}, points={self.point_count})>"
+
+
+class DroneDailyTelemetryRollup(RollupColumnsMixin, Base):
+    __table_args__ = (
+        UniqueConstraint("drone_id", "day", name="uq_drone_daily_rollup_drone_day"),
+    )
+
+    drone_id = Column(
+        Integer,
+        ForeignKey("drones.id", name="fk_daily_rollup_drone_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day = Column(Date, nullable=False, index=True)  # UTC day
+    organization_id = Column(
+        Integer,
+        ForeignKey("organizations.id", name="fk_daily_rollup_organization_id"),
+        nullable=True,
+        index=True,
+    )
+
+    def __repr__(self):
+        return f"<DroneDailyTelemetryRollup(drone_id={self.drone_id}, day={self.day})>"
@@ -1,12 +1,13 @@
 # backend/app/models/user.py
 import enum
 
-from sqlalchemy import Boolean, Column, DateTime
+from sqlalchemy import Boolean, Column
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.soft_delete import SoftDeleteMixin, live_index
 
 
 class UserRole(str, enum.Enum):
@@ -16,9 +17,12 @@ class UserRole(str, enum.Enum):
     SOLO_PILOT = "SOLO_PILOT"
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
+    # Emails are unique among live users; a deleted account frees its email.
+    __table_args__ = (live_index("ix_users_email_live", "email", unique=True),)
+
     full_name = Column(String(100), nullable=False)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), nullable=False)
     phone_number = Column(String(20), unique=True, nullable=True, index=True)
     iin = Column(String(12), unique=True, nullable=True, index=True)  # Kazakhstani IIN
     hashed_password = Column(String(255), nullable=False)
@@ -31,7 +35,6 @@ class User(Base):
         nullable=True,
     )
     is_active = Column(Boolean(), default=True, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationships
     organization = relationship(
@@ -0,0 +1,123 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RollupTotals(BaseModel):
+    point_count: int = 0
+    distance_m: float = Field(0.0, description="Ground distance flown in meters")
+    min_altitude_m: Optional[float] = None
+    max_altitude_m: Optional[float] = None
+    average_speed_mps: Optional[float] = Field(
+        None, description="Mean of the reported speeds"
+    )
+    max_speed_mps: Optional[float] = None
+    flight_time_seconds: float = Field(
+        0.0, description="Time in the air, summed over each flight's legs"
+    )
+    violation_count: int = Field(0, description="Points reported inside an NFZ")
+
+
+class FlightAnalyticsRead(RollupTotals):
+    flight_plan_id: int
+    drone_id: int
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DailyAnalyticsRead(RollupTotals):
+    day: date
+
+    class Config:
+        from_attributes = True
+
+
+class DroneAnalyticsRead(BaseModel):
+    drone_id: int
+    start: date
+    end: date
+    totals: RollupTotals
+    days: List[DailyAnalyticsRead]
+
+
+class OrganizationAnalyticsRead(BaseModel):
+    organization_id: int
+    start: date
+    end: date
+    drone_count: int = Field(..., description="Drones that reported in the range")
+    totals: RollupTotals
+    days: List[DailyAnalyticsRead]
+
+
+class ValueStats(BaseModel):
+    min: float
+    mean: float
+    p95: float
+    max: float
+
+
+class RouteConformance(BaseModel):
+    tolerance_m: float
+    mean_deviation_m: float
+    p95_deviation_m: float
+    max_deviation_m: float
+    within_tolerance_ratio: float = Field(
+        ..., description="Share of points within tolerance of the planned route"
+    )
+    seconds_outside_tolerance: float
+
+
+class ProfileBucket(BaseModel):
+    offset_seconds: float = Field(..., description="Bucket start, from first point")
+    altitude_mean_m: float
+    altitude_max_m: float
+    speed_mean_mps: Optional[float] = None
+
+
+class ZoneProximity(BaseModel):
+    zone_id: int
+    name: str
+    min_distance_m: float
+    seconds_inside: float
+    seconds_near: float
+    points_inside: int
+
+
+class SignalGap(BaseModel):
+    start: datetime
+    end: datetime
+    duration_seconds: float
+
+
+class SignalGaps(BaseModel):
+    threshold_seconds: float
+    count: int
+    total_seconds: float
+    longest_seconds: float
+    intervals: List[SignalGap] = Field(..., description="Longest gaps first")
+
+
+class FlightReportRead(BaseModel):
+    flight_plan_id: int
+    source: str = Field(..., description="'archive' or 'database'")
+    point_count: int
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    duration_seconds: float
+    distance_m: float
+    conformance: Optional[RouteConformance] = Field(
+        None, description="Deviation from the planned route, if it has waypoints"
+    )
+    altitude: Optional[ValueStats] = None
+    speed: Optional[ValueStats] = None
+    max_climb_rate_mps: Optional[float] = None
+    max_descent_rate_mps: Optional[float] = None
+    profile: List[ProfileBucket]
+    zones: List[ZoneProximity] = Field(
+        ..., description="Restricted zones the flight came near while in force"
+    )
+    gaps: SignalGaps
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AuditEventRead(BaseModel):
+    id: int
+    entity_type: str
+    entity_id: int
+    action: str
+    actor_user_id: Optional[int] = None
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+    occurred_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AuditEventPage(BaseModel):
+    items: List[AuditEventRead]
+    next_cursor: Optional[int] = Field(
+        None, description="Pass as `before` to fetch older events; null on the last"
+    )
@@ -92,6 +92,13 @@ class OrganizationAdminRegister(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = Field(
+        None, description="Single-use token for POST /auth/refresh"
+    )
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -110,6 +117,13 @@ class OrganizationResponse(BaseModel):
         from_attributes = True
 
 
+class OrganizationUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    company_address: Optional[str] = Field(None, min_length=1, max_length=500)
+    city: Optional[str] = Field(None, min_length=1, max_length=100)
+    is_active: Optional[bool] = None
+
+
 class UserResponse(BaseModel):
     id: int
     email: str
@@ -124,6 +138,10 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserActivationUpdate(BaseModel):
+    is_active: bool
+
+
 class OrganizationWithAdminResponse(BaseModel):
     organization: OrganizationResponse
     admin_user: UserResponse
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.drone import DroneOwnerType, DroneStatus
+from app.schemas.telemetry import TelemetryPointRead
+
+
+class DroneUserRead(BaseModel):
+    id: int
+    full_name: str
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
+class DroneOrganizationRead(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class DroneFleetItem(BaseModel):
+    id: int
+    brand: str
+    model: str
+    serial_number: str
+    owner_type: DroneOwnerType
+    current_status: DroneStatus
+    last_seen_at: Optional[datetime] = None
+    organization_owner: Optional[DroneOrganizationRead] = None
+    solo_owner_user: Optional[DroneUserRead] = None
+    assigned_pilots: List[DroneUserRead] = []
+    last_telemetry_point: Optional[TelemetryPointRead] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DroneStatusUpdate(BaseModel):
+    status: DroneStatus
+
+
+class DroneFleetPage(BaseModel):
+    items: List[DroneFleetItem]
+    next_cursor: Optional[int] = Field(
+        None, description="Pass as `after` to fetch the next page; null on the last"
+    )
+
+
+class DroneTrailRead(BaseModel):
+    drone_id: int
+    source: str = Field(..., description='"memory" or "database"')
+    points: List[TelemetryPointRead]
+
+
+class DroneBooking(BaseModel):
+    flight_plan_id: int
+    start: datetime
+    end: datetime
+
+
+class TimeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class DroneAvailabilityRead(BaseModel):
+    drone_id: int
+    start: datetime
+    end: datetime
+    bookings: List[DroneBooking]
+    free: List[TimeSlot]
+
+
+class FreeDronesRead(BaseModel):
+    start: datetime
+    end: datetime
+    drone_ids: List[int]
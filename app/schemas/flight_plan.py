@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.flight_plan import FlightPlanStatus
+from app.schemas.telemetry import TelemetryPointRead
+
+
+class WaypointRead(BaseModel):
+    id: int
+    latitude: float
+    longitude: float
+    altitude_m: float
+    sequence_order: int
+
+    class Config:
+        from_attributes = True
+
+
+class WaypointCreate(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    altitude_m: float = Field(..., ge=0, description="Altitude in meters")
+
+
+class FlightPlanCreate(BaseModel):
+    drone_id: int
+    planned_departure_time: datetime
+    planned_arrival_time: datetime
+    notes: Optional[str] = Field(None, max_length=1000)
+    waypoints: List[WaypointCreate] = Field(
+        ..., min_length=2, max_length=500, description="Route in flying order"
+    )
+
+
+class FlightPlanViolation(BaseModel):
+    stage: str = Field(..., description="ownership, schedule, overlap or nfz")
+    code: str
+    message: str
+    ids: Optional[List[int]] = Field(
+        None, description="Conflicting flight plans or restricted zones"
+    )
+
+
+class FlightPlanRejection(BaseModel):
+    reason: str = Field(..., min_length=1, max_length=500)
+
+
+class FlightPlanRead(BaseModel):
+    id: int
+    user_id: int
+    drone_id: int
+    organization_id: Optional[int] = None
+    planned_departure_time: datetime
+    planned_arrival_time: datetime
+    actual_departure_time: Optional[datetime] = None
+    actual_arrival_time: Optional[datetime] = None
+    status: FlightPlanStatus
+    notes: Optional[str] = None
+    rejection_reason: Optional[str] = None
+    approved_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+    nfz_conflict_zone_ids: Optional[List[int]] = None
+    nfz_checked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FlightPlanHistory(BaseModel):
+    flight_plan_details: FlightPlanRead
+    planned_waypoints: List[WaypointRead]
+    actual_telemetry: List[TelemetryPointRead]
+    source: str  # "archive" or "database"
@@ -0,0 +1,156 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.models.restricted_zone import NFZGeometryType
+
+
+def validate_definition(
+    geometry_type: NFZGeometryType, definition: Dict[str, Any]
+) -> None:
+    """Check definition_json has the shape the geometry type expects."""
+    if geometry_type == NFZGeometryType.CIRCLE:
+        try:
+            lat = float(definition["center_lat"])
+            lon = float(definition["center_lon"])
+            radius = float(definition["radius_m"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                "CIRCLE zones need numeric center_lat, center_lon and radius_m"
+            )
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("Circle center is out of range")
+        if radius <= 0:
+            raise ValueError("radius_m must be positive")
+        return
+
+    try:
+        ring = definition["coordinates"][0]
+        points = [(float(lon), float(lat)) for lon, lat, *_ in ring]
+    except (KeyError, IndexError, TypeError, ValueError):
+        raise ValueError("POLYGON zones need GeoJSON coordinates [[[lon, lat], ...]]")
+    if len(set(points)) < 3:
+        raise ValueError("A polygon needs at least three distinct vertices")
+    if any(not (-90 <= lat <= 90 and -180 <= lon <= 180) for lon, lat in points):
+        raise ValueError("Polygon vertex is out of range")
+
+
+def validate_limits(
+    min_altitude_m: Optional[float],
+    max_altitude_m: Optional[float],
+    active_from: Optional[datetime],
+    active_until: Optional[datetime],
+) -> None:
+    if (
+        min_altitude_m is not None
+        and max_altitude_m is not None
+        and min_altitude_m > max_altitude_m
+    ):
+        raise ValueError("min_altitude_m must not exceed max_altitude_m")
+    if active_from is not None and active_until is not None:
+        if _utc(active_from) >= _utc(active_until):
+            raise ValueError("active_from must be before active_until")
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Windows without an offset are taken as UTC, like device timestamps.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class RestrictedZoneBase(BaseModel):
+    name: str = Field(..., max_length=255)
+    description: Optional[str] = Field(None, max_length=1000)
+    geometry_type: NFZGeometryType
+    definition_json: Dict[str, Any] = Field(
+        ..., description="Circle center/radius or a GeoJSON polygon ring"
+    )
+    min_altitude_m: Optional[float] = None
+    max_altitude_m: Optional[float] = None
+    is_active: bool = True
+    active_from: Optional[datetime] = Field(
+        None, description="Start of a temporary restriction; empty for always"
+    )
+    active_until: Optional[datetime] = Field(
+        None, description="End of a temporary restriction; empty for indefinite"
+    )
+
+
+class RestrictedZoneCreate(RestrictedZoneBase):
+    @field_validator("active_from", "active_until")
+    @classmethod
+    def assume_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return _utc(value)
+
+    @model_validator(mode="after")
+    def check_geometry(self) -> "RestrictedZoneCreate":
+        validate_definition(self.geometry_type, self.definition_json)
+        validate_limits(
+            self.min_altitude_m,
+            self.max_altitude_m,
+            self.active_from,
+            self.active_until,
+        )
+        return self
+
+
+class RestrictedZoneUpdate(BaseModel):
+    """Partial update; geometry is re-validated against the merged zone"""
+
+    name: Optional[str] = Field(None, max_length=255)
+    description: Optional[str] = Field(None, max_length=1000)
+    geometry_type: Optional[NFZGeometryType] = None
+    definition_json: Optional[Dict[str, Any]] = None
+    min_altitude_m: Optional[float] = None
+    max_altitude_m: Optional[float] = None
+    is_active: Optional[bool] = None
+    active_from: Optional[datetime] = None
+    active_until: Optional[datetime] = None
+
+    @field_validator("active_from", "active_until")
+    @classmethod
+    def assume_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return _utc(value)
+
+
+class RestrictedZoneRead(RestrictedZoneBase):
+    id: int
+    created_by_authority_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RevalidationJobRead(BaseModel):
+    id: str
+    zone_id: int
+    status: str  # "queued", "running", "done" or "failed"
+    total: int
+    processed: int
+    flagged: int
+    cleared: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class RestrictedZoneChange(BaseModel):
+    """Result of a zone edit: the zone plus the revalidation it queued"""
+
+    zone: Optional[RestrictedZoneRead] = None
+    revalidation: RevalidationJobRead
+
+
+class ApplicableZone(BaseModel):
+    """A restricted zone whose activity window overlaps a flight plan"""
+
+    zone_id: int
+    name: str
+    geometry_type: NFZGeometryType
+    active_from: Optional[datetime] = None
+    active_until: Optional[datetime] = None
+    crosses_route: bool
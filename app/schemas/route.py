@@ -0,0 +1,27 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class RoutePlanRequest(BaseModel):
+    start_latitude: float = Field(..., ge=-90, le=90)
+    start_longitude: float = Field(..., ge=-180, le=180)
+    end_latitude: float = Field(..., ge=-90, le=90)
+    end_longitude: float = Field(..., ge=-180, le=180)
+    altitude_m: float = Field(..., description="Cruise altitude in meters")
+
+
+class RouteWaypoint(BaseModel):
+    latitude: float
+    longitude: float
+    altitude_m: float
+    sequence_order: int
+
+
+class RoutePlanResponse(BaseModel):
+    """Suggested waypoints, ready to submit with a flight plan"""
+
+    waypoints: List[RouteWaypoint]
+    distance_m: float
+    direct: bool  # True when the straight line is already clear
+    avoided_zone_ids: List[int]
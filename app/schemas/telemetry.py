@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TelemetryPointIn(BaseModel):
+    timestamp: datetime = Field(..., description="Time the position was measured")
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    altitude_m: float = Field(..., description="Altitude in meters")
+    speed_mps: Optional[float] = Field(None, ge=0, description="Speed in m/s")
+    heading_degrees: Optional[float] = Field(None, ge=0, lt=360)
+    status_message: Optional[str] = Field(None, max_length=255)
+
+
+class TelemetryBatchIn(BaseModel):
+    """One or more telemetry points reported for a single drone"""
+
+    drone_id: int
+    flight_plan_id: Optional[int] = None
+    points: List[TelemetryPointIn] = Field(..., min_length=1, max_length=1000)
+
+
+class TelemetryIngestResponse(BaseModel):
+    accepted: int
+    duplicates: int = Field(0, description="Points already received and skipped")
+
+
+class TelemetryPointRead(BaseModel):
+    timestamp: datetime
+    latitude: float
+    longitude: float
+    altitude_m: float
+    speed_mps: Optional[float] = None
+    heading_degrees: Optional[float] = None
+    status_message: Optional[str] = None
+    nfz_alert: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class LiveTelemetryMessage(BaseModel):
+    """Message pushed to live clients for every ingested point"""
+
+    flight_id: Optional[int] = None
+    drone_id: int
+    lat: float
+    lon: float
+    alt: float
+    timestamp: datetime
+    speed: Optional[float] = None
+    heading: Optional[float] = None
+    status_message: Optional[str] = None
+    nfz_alert: Optional[str] = None
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class WeatherInfo(BaseModel):
+    latitude: float = Field(..., description="Centre of the grid cell looked up")
+    longitude: float = Field(..., description="Centre of the grid cell looked up")
+    temperature_c: float
+    wind_speed_mps: float
+    wind_direction_degrees: float = Field(
+        ..., description="Direction the wind blows from, clockwise from north"
+    )
+    conditions_summary: str
+    observed_at: datetime
+    source: str = Field(..., description="Provider that answered")
+
+
+class WeatherPoint(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class WeatherRouteRequest(BaseModel):
+    waypoints: List[WeatherPoint] = Field(
+        ..., min_length=1, max_length=500, description="Route in flying order"
+    )
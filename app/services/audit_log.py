@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import BackgroundSessionLocal
+from app.models.audit_event import AuditEvent
+
+FLIGHT_PLAN = "flight_plan"
+DRONE = "drone"
+USER = "user"
+ORGANIZATION = "organization"
+
+audit_events_written = metrics.counter(
+    "utm_audit_events_written_total", "Audit events stored"
+)
+audit_events_dropped = metrics.counter(
+    "utm_audit_events_dropped_total",
+    "Audit events lost because the queue was full or the database kept failing",
+)
+audit_flush_seconds = metrics.summary(
+    "utm_audit_flush_duration_seconds", "Time spent writing one batch of audit events"
+)
+metrics.gauge(
+    "utm_audit_events_pending",
+    "Audit events waiting to be written",
+    callback=lambda: {(): len(audit_log._pending)},
+)
+
+
+def _value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return str(getattr(value, "value", value))
+
+
+class AuditLog:
+    """Append-only history of state changes, written off the request path.
+
+    ``record`` only queues the event. A background writer stores queued events
+    in one multi-row INSERT when AUDIT_BATCH_SIZE have built up or
+    AUDIT_FLUSH_INTERVAL_SECONDS after the first one, whichever comes first.
+    A failed batch is retried on the next flush; whatever is still queued at
+    shutdown is written before the process exits.
+    """
+
+    def __init__(
+        self, batch_size: int, flush_interval_seconds: float, max_pending: int
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        entity_type: str,
+        entity_id: int,
+        action: str,
+        *,
+        actor_user_id: Optional[int] = None,
+        old_value: Any = None,
+        new_value: Any = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue an event. Safe to call from worker threads as well as the loop."""
+        event = {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "action": action,
+            "actor_user_id": actor_user_id,
+            "old_value": _value(old_value),
+            "new_value": _value(new_value),
+            "details": details,
+            "occurred_at": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                audit_events_dropped.inc()
+                return
+            self._pending.append(event)
+            wake = len(self._pending) == 1 or len(self._pending) >= self.batch_size
+        if wake and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+        return batch
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            room = self.max_pending - len(self._pending)
+            if room < len(batch):
+                audit_events_dropped.inc(len(batch) - max(room, 0))
+                batch = batch[: max(room, 0)]
+            self._pending[:0] = batch
+
+    @staticmethod
+    def _write(batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        db = BackgroundSessionLocal()
+        try:
+            db.execute(insert(AuditEvent), batch)
+            db.commit()
+        finally:
+            db.close()
+        audit_flush_seconds.observe(time.perf_counter() - started)
+        audit_events_written.inc(len(batch))
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if len(self._pending) < self.batch_size:
+                # Bounded latency: the oldest event waits at most one interval.
+                await asyncio.sleep(self.flush_interval_seconds)
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                try:
+                    await asyncio.to_thread(self._write, batch)
+                except Exception as e:
+                    print(
+                        f"Audit log: batch of {len(batch)} not written, will retry: {e}"
+                    )
+                    self._requeue(batch)
+                    await asyncio.sleep(self.flush_interval_seconds)
+                    self._wake.set()
+                    break
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        if self._pending:
+            self._wake.set()
+        self._task = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._loop = None
+        while True:
+            batch = self._take()
+            if not batch:
+                break
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                audit_events_dropped.inc(len(batch) + len(self._pending))
+                print(f"Audit log: dropping unwritten events on shutdown: {e}")
+                break
+
+
+audit_log = AuditLog(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_seconds=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.AUDIT_MAX_PENDING,
+)
@@ -0,0 +1,180 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.flight_plan import BOOKED_STATUSES, FlightPlan, booked_window
+from app.services.telemetry_service import as_utc
+from app.utils.interval_tree import IntervalTree
+
+# Same reasoning as the NFZ footprint sync: updated_at is the transaction
+# start, so a plan committed during the previous sync can carry an older stamp.
+SYNC_OVERLAP = timedelta(minutes=1)
+PRUNE_INTERVAL_SECONDS = 60.0
+
+Booking = Tuple[int, datetime, datetime]  # flight plan id, departure, arrival
+
+
+def booking_overlaps(db: Session, start: datetime, end: datetime):
+    """Filter for live bookings overlapping ``[start, end)``.
+
+    On PostgreSQL this is the range overlap the booking exclusion constraint
+    indexes, so the lookup is a GiST index probe rather than a scan.
+    """
+    booked = FlightPlan.status.in_(BOOKED_STATUSES)
+    if db.get_bind().dialect.name == "postgresql":
+        window = booked_window(
+            FlightPlan.planned_departure_time, FlightPlan.planned_arrival_time
+        )
+        return and_(booked, window.op("&&")(booked_window(start, end)))
+    return and_(
+        booked,
+        FlightPlan.planned_departure_time < end,
+        FlightPlan.planned_arrival_time > start,
+    )
+
+
+class BookingCalendar:
+    """Upcoming bookings per drone, one interval tree each.
+
+    Answers "when is this drone free" and "which of these drones are free"
+    without touching flight_plans. Warmed with the future bookings, then kept
+    current by re-reading plans whose updated_at moved since the last sync,
+    at most every BOOKING_CALENDAR_SYNC_SECONDS. The exclusion constraint on
+    flight_plans stays the authority; this is the fast read path.
+    """
+
+    def __init__(self, sync_interval_seconds: float):
+        self.sync_interval_seconds = sync_interval_seconds
+        self.trees: Dict[int, IntervalTree] = {}
+        self._plan_drones: Dict[int, int] = {}
+        self._synced_at: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+
+    # Keeping current
+
+    def sync(self, db: Session, force: bool = False) -> None:
+        if (
+            not force
+            and time.monotonic() - self._checked_at < self.sync_interval_seconds
+        ):
+            return
+        started = datetime.now(timezone.utc)
+        stmt = select(
+            FlightPlan.id,
+            FlightPlan.drone_id,
+            FlightPlan.status,
+            FlightPlan.deleted_at,
+            FlightPlan.planned_departure_time,
+            FlightPlan.planned_arrival_time,
+        ).execution_options(include_deleted=True)
+        if self._synced_at is None:
+            stmt = stmt.where(
+                and_(
+                    FlightPlan.status.in_(BOOKED_STATUSES),
+                    FlightPlan.deleted_at.is_(None),
+                    FlightPlan.planned_arrival_time > started,
+                )
+            )
+        else:
+            stmt = stmt.where(FlightPlan.updated_at >= self._synced_at - SYNC_OVERLAP)
+
+        rows = db.execute(stmt).all()
+        with self._lock:
+            for plan_id, drone_id, status, deleted_at, departure, arrival in rows:
+                if status in BOOKED_STATUSES and deleted_at is None:
+                    self._add(plan_id, drone_id, as_utc(departure), as_utc(arrival))
+                else:
+                    self._remove(plan_id)
+            if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                self._prune(started)
+                self._pruned_at = time.monotonic()
+        self._synced_at = started
+        self._checked_at = time.monotonic()
+
+    def upsert_plan(self, plan: FlightPlan) -> None:
+        """Record a plan right away, e.g. after it was submitted."""
+        with self._lock:
+            if plan.status in BOOKED_STATUSES and plan.deleted_at is None:
+                self._add(
+                    plan.id,
+                    plan.drone_id,
+                    as_utc(plan.planned_departure_time),
+                    as_utc(plan.planned_arrival_time),
+                )
+            else:
+                self._remove(plan.id)
+
+    def _add(self, plan_id: int, drone_id: int, departure, arrival) -> None:
+        self._remove(plan_id)
+        if not departure < arrival:
+            return
+        tree = self.trees.get(drone_id)
+        if tree is None:
+            tree = self.trees[drone_id] = IntervalTree()
+        tree.add(plan_id, departure, arrival)
+        self._plan_drones[plan_id] = drone_id
+
+    def _remove(self, plan_id: int) -> None:
+        drone_id = self._plan_drones.pop(plan_id, None)
+        if drone_id is None:
+            return
+        tree = self.trees[drone_id]
+        tree.remove(plan_id)
+        if not len(tree):
+            del self.trees[drone_id]
+
+    def _prune(self, now: datetime) -> None:
+        for tree in list(self.trees.values()):
+            for plan_id, _, arrival in list(tree):
+                if arrival <= now:
+                    self._remove(plan_id)
+
+    # Queries
+
+    def busy(self, drone_id: int, start: datetime, end: datetime) -> List[Booking]:
+        """Bookings of a drone overlapping ``[start, end)``, by departure."""
+        with self._lock:
+            tree = self.trees.get(drone_id)
+            if tree is None:
+                return []
+            found = [
+                (plan_id, *tree.get(plan_id))
+                for plan_id in tree.overlapping(start, end)
+            ]
+        return sorted(found, key=lambda booking: booking[1])
+
+    def free_slots(
+        self, drone_id: int, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """Gaps between a drone's bookings within ``[start, end)``."""
+        slots = []
+        cursor = start
+        for _, departure, arrival in self.busy(drone_id, start, end):
+            if departure > cursor:
+                slots.append((cursor, departure))
+            cursor = max(cursor, arrival)
+        if cursor < end:
+            slots.append((cursor, end))
+        return slots
+
+    def free_drones(
+        self, drone_ids: List[int], start: datetime, end: datetime
+    ) -> List[int]:
+        """The drones with no booking overlapping ``[start, end)``."""
+        with self._lock:
+            return [
+                drone_id
+                for drone_id in drone_ids
+                if drone_id not in self.trees
+                or not self.trees[drone_id].overlapping(start, end)
+            ]
+
+
+booking_calendar = BookingCalendar(settings.BOOKING_CALENDAR_SYNC_SECONDS)
@@ -0,0 +1,348 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+TELEMETRY = "telemetry"
+DRONE_STATUS = "drone_status"
+FLIGHT_STATUS = "flight_status"
+ORGANIZATIONS = "organizations"
+RESTRICTED_ZONES = "restricted_zones"
+NFZ_REVALIDATION = "nfz_revalidation"
+
+# NOTIFY payloads must stay below 8000 bytes; leave room for the envelope.
+MAX_NOTIFY_PAYLOAD_BYTES = 7800
+
+events_published = metrics.counter(
+    "utm_event_bus_published_total", "Events published on this worker", ["topic"]
+)
+events_received = metrics.counter(
+    "utm_event_bus_remote_received_total",
+    "Events received from other workers via NOTIFY",
+    ["topic"],
+)
+events_dropped = metrics.counter(
+    "utm_event_bus_dropped_total",
+    "Events dropped because a subscriber queue was full",
+    ["topic"],
+)
+bus_reconnects = metrics.counter(
+    "utm_event_bus_reconnects_total", "LISTEN connection re-establishments"
+)
+
+
+class EventHistory:
+    """The most recent events on this worker, numbered in delivery order.
+
+    Event ids look like ``<origin>-<seq>-<ms>``: the worker, a counter that
+    only grows, and the publish time in milliseconds. ``since`` replays from
+    memory when the id came from this worker and is still inside the buffer;
+    otherwise the caller can fall back to the database from the timestamp.
+    """
+
+    def __init__(self, origin: str, maxlen: int):
+        self.origin = origin
+        self._events: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=maxlen)
+        self._seq = 0
+
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self._seq += 1
+        event = dict(event, id=f"{self.origin}-{self._seq}-{int(event['ts'] * 1000)}")
+        self._events.append((self._seq, event))
+        return event
+
+    @staticmethod
+    def parse_id(event_id: str) -> Optional[Tuple[str, int, float]]:
+        """(origin, seq, publish time in seconds), or None if malformed."""
+        try:
+            origin, seq, ms = event_id.rsplit("-", 2)
+            return origin, int(seq), int(ms) / 1000.0
+        except ValueError:
+            return None
+
+    def since(self, event_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Events after ``event_id``, or None if the gap is not in memory."""
+        parsed = self.parse_id(event_id)
+        if parsed is None or parsed[0] != self.origin:
+            return None
+        seq = parsed[1]
+        if seq > self._seq:
+            return None  # Never issued here.
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        if seq < oldest - 1:
+            return None
+        return [event for event_seq, event in self._events if event_seq > seq]
+
+
+class Subscription:
+    """A bounded queue of events for one consumer (e.g. a WebSocket client)."""
+
+    def __init__(self, bus: "EventBus", topics: Optional[Set[str]], maxsize: int):
+        self.bus = bus
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Events discarded because the queue was full; consumers that keep
+        # state built from the stream compare it to know they missed some.
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # Live feeds prefer fresh data: drop the oldest event when full.
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.dropped += 1
+            events_dropped.inc(topic=event["topic"])
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """In-process pub/sub with PostgreSQL LISTEN/NOTIFY as the cross-worker hop.
+
+    Local subscribers are served directly on publish. Events are also batched
+    into NOTIFY payloads so other workers can deliver them to their own
+    subscribers; each worker ignores notifications carrying its own origin id.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str],
+        channel: str,
+        flush_interval_seconds: float,
+        subscriber_queue_size: int,
+        history_size: int,
+    ):
+        self.database_url = database_url
+        self.channel = channel
+        self.flush_interval_seconds = flush_interval_seconds
+        self.subscriber_queue_size = subscriber_queue_size
+        self.origin = uuid.uuid4().hex[:12]
+        self.history = EventHistory(self.origin, history_size)
+        self._subscriptions: Set[Subscription] = set()
+        self._outbox: List[Dict[str, Any]] = []
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._listen_conn = None
+        self._notify_conn = None
+        self._listen_lost: Optional[asyncio.Event] = None
+        self._running = False
+
+    @property
+    def cross_process(self) -> bool:
+        if not self.database_url:
+            return False
+        return make_url(self.database_url).get_backend_name() == "postgresql"
+
+    def _libpq_dsn(self) -> str:
+        url = make_url(self.database_url).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    # Subscribing
+
+    def subscribe(self, topics: Optional[Set[str]] = None) -> Subscription:
+        subscription = Subscription(self, topics, self.subscriber_queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    # Publishing
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        """Publish an event. Safe to call from worker threads as well as the loop."""
+        event = {"topic": topic, "data": data, "ts": time.time()}
+        events_published.inc(topic=topic)
+        loop = self._loop
+        if loop is None:
+            return  # Not started (e.g. scripts); nobody is listening.
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        self._deliver_local(event)
+        if self.cross_process and self._running:
+            self._outbox.append(event)
+            self._outbox_ready.set()
+
+    def _deliver_local(self, event: Dict[str, Any]) -> None:
+        event = self.history.append(event)
+        for subscription in list(self._subscriptions):
+            if subscription.wants(event["topic"]):
+                subscription.offer(event)
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._running = True
+        if not self.cross_process:
+            print("Event bus running in-process only (no PostgreSQL URL).")
+            return
+        self._outbox_ready = asyncio.Event()
+        self._listen_lost = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._listen_forever()),
+            asyncio.create_task(self._flush_forever()),
+        ]
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._outbox:
+            try:
+                await asyncio.to_thread(self._send_batch, self._drain_outbox())
+            except Exception as e:
+                print(f"Event bus: dropping unsent events on shutdown: {e}")
+        self._close_listen_conn()
+        if self._notify_conn is not None:
+            self._notify_conn.close()
+            self._notify_conn = None
+
+    # Cross-process transport
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await self._outbox_ready.wait()
+            # Give concurrent publishers a moment so events share NOTIFYs.
+            await asyncio.sleep(self.flush_interval_seconds)
+            self._outbox_ready.clear()
+            batch = self._drain_outbox()
+            if not batch:
+                continue
+            try:
+                await asyncio.to_thread(self._send_batch, batch)
+            except Exception as e:
+                print(f"Event bus: NOTIFY failed, will reconnect: {e}")
+                if self._notify_conn is not None:
+                    self._notify_conn.close()
+                    self._notify_conn = None
+
+    def _drain_outbox(self) -> List[Dict[str, Any]]:
+        batch, self._outbox = self._outbox, []
+        return batch
+
+    def _pack(self, batch: List[Dict[str, Any]]) -> List[str]:
+        payloads: List[str] = []
+        chunk: List[str] = []
+        size = 0
+        for event in batch:
+            encoded = json.dumps(event, separators=(",", ":"), default=str)
+            if len(encoded) > MAX_NOTIFY_PAYLOAD_BYTES:
+                print(f"Event bus: {event['topic']} event too large for NOTIFY")
+                continue
+            if chunk and size + len(encoded) + 1 > MAX_NOTIFY_PAYLOAD_BYTES:
+                payloads.append(self._envelope(chunk))
+                chunk, size = [], 0
+            chunk.append(encoded)
+            size += len(encoded) + 1
+        if chunk:
+            payloads.append(self._envelope(chunk))
+        return payloads
+
+    def _envelope(self, encoded_events: List[str]) -> str:
+        return '{"o":"%s","e":[%s]}' % (self.origin, ",".join(encoded_events))
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> None:
+        import psycopg2
+
+        if self._notify_conn is None or self._notify_conn.closed:
+            self._notify_conn = psycopg2.connect(self._libpq_dsn())
+            self._notify_conn.autocommit = True
+        with self._notify_conn.cursor() as cursor:
+            for payload in self._pack(batch):
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+
+    async def _listen_forever(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                await asyncio.to_thread(self._open_listen_conn)
+                self._loop.add_reader(self._listen_conn.fileno(), self._on_notify)
+                backoff = 0.5
+                await self._listen_lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event bus: LISTEN connection failed: {e}")
+            self._close_listen_conn()
+            bus_reconnects.inc()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _open_listen_conn(self) -> None:
+        import psycopg2
+
+        conn = psycopg2.connect(self._libpq_dsn())
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        self._listen_lost.clear()
+        self._listen_conn = conn
+
+    def _close_listen_conn(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is None:
+            return
+        try:
+            self._loop.remove_reader(conn.fileno())
+        except Exception:
+            pass
+        conn.close()
+
+    def _on_notify(self) -> None:
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            print(f"Event bus: lost LISTEN connection: {e}")
+            self._loop.remove_reader(conn.fileno())
+            self._listen_lost.set()
+            return
+        while conn.notifies:
+            notification = conn.notifies.pop(0)
+            try:
+                envelope = json.loads(notification.payload)
+            except ValueError:
+                continue
+            if envelope.get("o") == self.origin:
+                continue  # Already delivered through the in-process path.
+            for event in envelope.get("e", []):
+                events_received.inc(topic=event.get("topic"))
+                self._deliver_local(event)
+
+
+event_bus = EventBus(
+    settings.EVENT_BUS_DATABASE_URL or settings.ASSEMBLED_DATABASE_URL,
+    channel=settings.EVENT_BUS_CHANNEL,
+    flush_interval_seconds=settings.EVENT_BUS_FLUSH_INTERVAL_SECONDS,
+    subscriber_queue_size=settings.EVENT_BUS_SUBSCRIBER_QUEUE_SIZE,
+    history_size=settings.EVENT_BUS_HISTORY_SIZE,
+)
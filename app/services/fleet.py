@@ -0,0 +1,53 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, or_, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.drone import Drone
+from app.models.user import User, UserRole
+from app.models.user_drone_assignment import UserDroneAssignment
+
+# Owner, pilots and latest point arrive in a fixed number of extra queries
+# however many drones are on the page: joinedload for the to-one rows,
+# selectinload (one IN query per relationship) for the rest.
+FLEET_LOAD_OPTIONS = (
+    joinedload(Drone.last_telemetry_point),
+    selectinload(Drone.organization_owner),
+    selectinload(Drone.solo_owner_user),
+    selectinload(Drone.assigned_users_association).joinedload(UserDroneAssignment.user),
+)
+
+
+def fleet_page(
+    db: Session, stmt: Select, after: Optional[int], limit: int
+) -> Tuple[List[Drone], Optional[int]]:
+    """One page of ``stmt`` (a ``select(Drone)``) ordered by id.
+
+    Keyset pagination: ``after`` is the last id of the previous page, so a
+    deep page costs the same as the first. Returns the drones and the cursor
+    for the next page, or None on the last page.
+    """
+    if after is not None:
+        stmt = stmt.where(Drone.id > after)
+    drones = (
+        db.execute(
+            stmt.options(*FLEET_LOAD_OPTIONS).order_by(Drone.id).limit(limit + 1)
+        )
+        .unique()
+        .scalars()
+        .all()
+    )
+    if len(drones) > limit:
+        return drones[:limit], drones[limit - 1].id
+    return drones, None
+
+
+def my_fleet_stmt(user: User) -> Select:
+    """Drones a user owns, flies, or administers through their organization."""
+    assigned = select(UserDroneAssignment.drone_id).where(
+        UserDroneAssignment.user_id == user.id
+    )
+    conditions = [Drone.solo_owner_user_id == user.id, Drone.id.in_(assigned)]
+    if user.role == UserRole.ORGANIZATION_ADMIN and user.organization_id is not None:
+        conditions.append(Drone.organization_id == user.organization_id)
+    return select(Drone).where(or_(*conditions))
@@ -0,0 +1,339 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.restricted_zone import RestrictedZone
+from app.models.telemetry_log import TelemetryLog
+from app.services.nfz_geometry import METERS_PER_DEGREE, CompiledZone, haversine_legs_m
+from app.services.telemetry_archive import TelemetryArchive
+
+# Upper bound on elements in one point x segment (or point x vertex) matrix.
+_CHUNK_ELEMENTS = 262_144
+MAX_REPORTED_GAPS = 50
+
+
+def _epoch_seconds(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_epoch(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+class FlightColumns:
+    """One flight's telemetry as parallel float64 arrays, ordered by time.
+
+    ``t`` is seconds since the epoch; ``speed`` holds NaN where the drone did
+    not report a speed.
+    """
+
+    __slots__ = ("t", "lat", "lon", "alt", "speed")
+
+    def __init__(self, t, lat, lon, alt, speed):
+        self.t = np.asarray(t, dtype=float)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.alt = np.asarray(alt, dtype=float)
+        self.speed = np.asarray(speed, dtype=float)
+
+    def __len__(self) -> int:
+        return self.t.size
+
+    @classmethod
+    def from_archive(cls, archive: TelemetryArchive) -> "FlightColumns":
+        # Copied out of the map so the archive can be closed straight away.
+        c = archive.columns
+        return cls(
+            np.frombuffer(c["timestamp_us"], dtype="<i8") / 1e6,
+            np.frombuffer(c["latitude"], dtype="<f8").copy(),
+            np.frombuffer(c["longitude"], dtype="<f8").copy(),
+            np.frombuffer(c["altitude_m"], dtype="<f8").copy(),
+            np.frombuffer(c["speed_mps"], dtype="<f4").astype(float),
+        )
+
+    @classmethod
+    def from_cursor(
+        cls, db: Session, flight_plan_id: int, chunk_size: int = 10000
+    ) -> "FlightColumns":
+        """Stream plain column tuples from telemetry_logs, no ORM objects."""
+        result = db.execute(
+            select(
+                TelemetryLog.timestamp,
+                TelemetryLog.latitude,
+                TelemetryLog.longitude,
+                TelemetryLog.altitude_m,
+                TelemetryLog.speed_mps,
+            )
+            .where(TelemetryLog.flight_plan_id == flight_plan_id)
+            .order_by(TelemetryLog.timestamp)
+            .execution_options(yield_per=chunk_size)
+        )
+        chunks = []
+        nan = float("nan")
+        for rows in result.partitions():
+            ts, lats, lons, alts, speeds = zip(*rows)
+            chunks.append(
+                (
+                    np.fromiter(map(_epoch_seconds, ts), float, len(rows)),
+                    np.fromiter(lats, float, len(rows)),
+                    np.fromiter(lons, float, len(rows)),
+                    np.fromiter(alts, float, len(rows)),
+                    np.fromiter(
+                        (nan if s is None else s for s in speeds), float, len(rows)
+                    ),
+                )
+            )
+        if not chunks:
+            return cls(*([],) * 5)
+        return cls(*(np.concatenate(column) for column in zip(*chunks)))
+
+
+def zones_for_flight(db: Session, start: datetime, end: datetime) -> List[CompiledZone]:
+    """Enabled zones whose activity window overlaps ``[start, end]``.
+
+    Read from the database rather than the live scheduler, so temporary
+    restrictions that have since expired still show up in old flights' reports.
+    """
+    rows = (
+        db.execute(
+            select(RestrictedZone).where(
+                and_(
+                    RestrictedZone.is_active == True,
+                    or_(
+                        RestrictedZone.active_from.is_(None),
+                        RestrictedZone.active_from <= end,
+                    ),
+                    or_(
+                        RestrictedZone.active_until.is_(None),
+                        RestrictedZone.active_until > start,
+                    ),
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    return [CompiledZone.from_model(row) for row in rows]
+
+
+def _stats(values: np.ndarray) -> Optional[dict]:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    return {
+        "min": float(values.min()),
+        "mean": float(values.mean()),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
+
+
+def _route_deviation_m(
+    lats: np.ndarray, lons: np.ndarray, route_lats: np.ndarray, route_lons: np.ndarray
+) -> np.ndarray:
+    """Horizontal distance from each point to the nearest leg of the route."""
+    lat0 = float(route_lats.mean())
+    lon0 = float(route_lons.mean())
+    kx = METERS_PER_DEGREE * np.cos(np.radians(lat0))
+    ky = METERS_PER_DEGREE
+    x, y = (lons - lon0) * kx, (lats - lat0) * ky
+    rx, ry = (route_lons - lon0) * kx, (route_lats - lat0) * ky
+    if rx.size == 1:
+        return np.hypot(x - rx[0], y - ry[0])
+    ax, ay = rx[:-1], ry[:-1]
+    ex, ey = rx[1:] - ax, ry[1:] - ay
+    length_sq = np.where(ex * ex + ey * ey == 0, 1.0, ex * ex + ey * ey)
+    out = np.empty(x.size)
+    step = max(1, _CHUNK_ELEMENTS // ax.size)
+    for lo in range(0, x.size, step):
+        px = x[lo : lo + step, None] - ax[None, :]
+        py = y[lo : lo + step, None] - ay[None, :]
+        t = np.minimum(np.maximum((px * ex + py * ey) / length_sq, 0.0), 1.0)
+        dx, dy = px - t * ex, py - t * ey
+        out[lo : lo + step] = np.sqrt((dx * dx + dy * dy).min(axis=1))
+    return out
+
+
+def _zone_distance_m(zone: CompiledZone, lats: np.ndarray, lons: np.ndarray):
+    step = max(1, _CHUNK_ELEMENTS // max(zone.xs.size, 1))
+    if lats.size <= step:
+        return zone.distance_many(lats, lons)
+    return np.concatenate(
+        [
+            zone.distance_many(lats[lo : lo + step], lons[lo : lo + step])
+            for lo in range(0, lats.size, step)
+        ]
+    )
+
+
+def analyse_flight(
+    columns: FlightColumns,
+    *,
+    route: Sequence[tuple] = (),
+    zones: Sequence[CompiledZone] = (),
+    route_tolerance_m: float = settings.ANALYTICS_ROUTE_TOLERANCE_M,
+    zone_proximity_m: float = settings.ANALYTICS_ZONE_PROXIMITY_M,
+    gap_seconds: float = settings.ANALYTICS_SIGNAL_GAP_SECONDS,
+    profile_buckets: int = 60,
+) -> dict:
+    """Conformance, speed/altitude profiles, zone proximity and signal gaps.
+
+    ``route`` is the planned (lat, lon) waypoint sequence. Time is attributed
+    to a point for the leg that follows it; legs longer than ``gap_seconds``
+    count as signal gaps and are left out of every time total.
+    """
+    n = len(columns)
+    report = {
+        "point_count": n,
+        "start_time": None,
+        "end_time": None,
+        "duration_seconds": 0.0,
+        "distance_m": 0.0,
+        "conformance": None,
+        "altitude": None,
+        "speed": None,
+        "max_climb_rate_mps": None,
+        "max_descent_rate_mps": None,
+        "profile": [],
+        "zones": [],
+        "gaps": {
+            "threshold_seconds": gap_seconds,
+            "count": 0,
+            "total_seconds": 0.0,
+            "longest_seconds": 0.0,
+            "intervals": [],
+        },
+    }
+    if n == 0:
+        return report
+    t, lat, lon, alt = columns.t, columns.lat, columns.lon, columns.alt
+    report["start_time"] = _from_epoch(t[0])
+    report["end_time"] = _from_epoch(t[-1])
+    report["duration_seconds"] = float(t[-1] - t[0])
+    report["altitude"] = _stats(alt)
+
+    dt = np.diff(t)
+    legs = haversine_legs_m(lat, lon) if n > 1 else np.empty(0)
+    report["distance_m"] = float(legs.sum())
+    gap = dt > gap_seconds
+    # Seconds each point stands for: the following leg, unless it is a gap.
+    weight = np.zeros(n)
+    weight[:-1] = np.where(gap, 0.0, dt)
+
+    # Reported speed where present, otherwise speed over the preceding leg.
+    moving = dt > 0
+    derived = np.full(n, np.nan)
+    derived[1:][moving] = legs[moving] / dt[moving]
+    speed = np.where(np.isnan(columns.speed), derived, columns.speed)
+    report["speed"] = _stats(speed)
+    if moving.any():
+        rates = np.diff(alt)[moving & ~gap] / dt[moving & ~gap]
+        if rates.size:
+            report["max_climb_rate_mps"] = float(max(rates.max(), 0.0))
+            report["max_descent_rate_mps"] = float(max(-rates.min(), 0.0))
+
+    if gap.any():
+        idx = np.nonzero(gap)[0]
+        durations = dt[idx]
+        report["gaps"].update(
+            count=int(idx.size),
+            total_seconds=float(durations.sum()),
+            longest_seconds=float(durations.max()),
+            intervals=[
+                {
+                    "start": _from_epoch(t[i]),
+                    "end": _from_epoch(t[i + 1]),
+                    "duration_seconds": float(dt[i]),
+                }
+                for i in idx[np.argsort(-durations)[:MAX_REPORTED_GAPS]]
+            ],
+        )
+
+    buckets = max(1, min(profile_buckets, n))
+    span = t[-1] - t[0]
+    if span > 0:
+        bucket = np.minimum(((t - t[0]) / span * buckets).astype(int), buckets - 1)
+    else:
+        bucket = np.zeros(n, dtype=int)
+    counts = np.bincount(bucket, minlength=buckets)
+    alt_sum = np.bincount(bucket, weights=alt, minlength=buckets)
+    alt_max = np.full(buckets, -np.inf)
+    np.maximum.at(alt_max, bucket, alt)
+    known = ~np.isnan(speed)
+    speed_counts = np.bincount(bucket[known], minlength=buckets)
+    speed_sum = np.bincount(bucket[known], weights=speed[known], minlength=buckets)
+    for b in np.nonzero(counts)[0]:
+        report["profile"].append(
+            {
+                "offset_seconds": float(span * b / buckets),
+                "altitude_mean_m": float(alt_sum[b] / counts[b]),
+                "altitude_max_m": float(alt_max[b]),
+                "speed_mean_mps": (
+                    float(speed_sum[b] / speed_counts[b]) if speed_counts[b] else None
+                ),
+            }
+        )
+
+    if len(route):
+        route_arr = np.asarray(route, dtype=float)
+        deviation = _route_deviation_m(lat, lon, route_arr[:, 0], route_arr[:, 1])
+        outside = deviation > route_tolerance_m
+        report["conformance"] = {
+            "tolerance_m": route_tolerance_m,
+            "mean_deviation_m": float(deviation.mean()),
+            "p95_deviation_m": float(np.percentile(deviation, 95)),
+            "max_deviation_m": float(deviation.max()),
+            "within_tolerance_ratio": float(1.0 - outside.mean()),
+            "seconds_outside_tolerance": float(weight[outside].sum()),
+        }
+
+    margin = zone_proximity_m / METERS_PER_DEGREE
+    lon_margin = margin / max(np.cos(np.radians(np.abs(lat).max())), 0.01)
+    bbox = (
+        lat.min() - margin,
+        lat.max() + margin,
+        lon.min() - lon_margin,
+        lon.max() + lon_margin,
+    )
+    for zone in zones:
+        if not zone.bbox_overlaps(*bbox):
+            continue
+        # Only points inside the zone's box grown by the proximity margin, at
+        # its altitudes and while it was in force, can count as near it.
+        lon_pad = margin / max(np.cos(np.radians(zone.lat0)), 0.01)
+        candidate = (
+            (lat >= zone.min_lat - margin)
+            & (lat <= zone.max_lat + margin)
+            & (lon >= zone.min_lon - lon_pad)
+            & (lon <= zone.max_lon + lon_pad)
+            & zone.in_altitude_band(alt)
+        )
+        if zone.active_from is not None:
+            candidate &= t >= zone.active_from.timestamp()
+        if zone.active_until is not None:
+            candidate &= t < zone.active_until.timestamp()
+        idx = np.nonzero(candidate)[0]
+        if idx.size == 0:
+            continue
+        distance = _zone_distance_m(zone, lat[idx], lon[idx])
+        near = distance <= zone_proximity_m
+        if not near.any():
+            continue
+        inside = distance == 0.0
+        report["zones"].append(
+            {
+                "zone_id": zone.zone_id,
+                "name": zone.name,
+                "min_distance_m": float(distance.min()),
+                "seconds_inside": float(weight[idx[inside]].sum()),
+                "seconds_near": float(weight[idx[near]].sum()),
+                "points_inside": int(inside.sum()),
+            }
+        )
+    return report
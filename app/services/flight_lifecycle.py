@@ -0,0 +1,331 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import BackgroundSessionLocal
+from app.models.drone import Drone, DroneStatus
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.services.audit_log import DRONE, FLIGHT_PLAN, audit_log
+from app.services.booking_calendar import booking_calendar
+from app.services.event_bus import DRONE_STATUS, FLIGHT_STATUS, event_bus
+from app.services.nfz_revalidation import nfz_revalidator
+from app.services.telemetry_service import as_utc
+
+# First key of pg_try_advisory_xact_lock(key, flight_plan_id), so these locks
+# can't collide with advisory locks taken for anything else.
+ADVISORY_LOCK_NAMESPACE = 0x464C  # "FL"
+# A step another worker is already firing is looked at again after this.
+LOCK_RETRY_SECONDS = 5.0
+
+START = "start"
+OVERDUE = "overdue"
+COMPLETE = "complete"
+
+Step = Tuple[datetime, str]
+
+lifecycle_steps = metrics.counter(
+    "utm_flight_lifecycle_steps_total",
+    "Flight lifecycle steps taken by the scheduler, by step",
+    ["step"],
+)
+metrics.gauge(
+    "utm_flight_lifecycle_scheduled",
+    "Flight plans with a pending lifecycle step on this worker",
+    callback=lambda: {(): len(flight_lifecycle.next_steps)},
+)
+
+
+def next_step(
+    status: FlightPlanStatus,
+    departure: datetime,
+    arrival: datetime,
+    overdue_alerted_at: Optional[datetime],
+) -> Optional[Step]:
+    """When the plan needs attention next and why, or None if it never will."""
+    if status == FlightPlanStatus.APPROVED:
+        return as_utc(departure), START
+    if status == FlightPlanStatus.ACTIVE:
+        arrival = as_utc(arrival)
+        if overdue_alerted_at is None:
+            delay = timedelta(seconds=settings.FLIGHT_OVERDUE_AFTER_SECONDS)
+            return arrival + delay, OVERDUE
+        delay = timedelta(seconds=settings.FLIGHT_AUTO_COMPLETE_AFTER_SECONDS)
+        return arrival + delay, COMPLETE
+    return None
+
+
+class FlightLifecycleScheduler:
+    """Moves flight plans along when their planned times come up.
+
+    APPROVED plans become ACTIVE when their departure window opens. ACTIVE
+    plans raise an overdue alert FLIGHT_OVERDUE_AFTER_SECONDS past their
+    planned arrival and are completed FLIGHT_AUTO_COMPLETE_AFTER_SECONDS past
+    it. Each plan's next step sits in a min-heap, so the scheduler sleeps
+    until exactly the earliest one instead of polling flight_plans.
+
+    Loaded from the database at startup, so steps missed while the service
+    was down fire right away. FLIGHT_STATUS events, local or from other
+    workers, re-read the plans they name. Every worker schedules every plan;
+    a step is taken under a transaction-level advisory lock on the plan and
+    only after re-reading it locked FOR UPDATE, so exactly one worker acts,
+    the others find it already done, and a status change made through the
+    API at the same moment is never overwritten.
+    """
+
+    def __init__(self):
+        self.next_steps: Dict[int, Step] = {}
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._events_task: Optional[asyncio.Task] = None
+
+    # Keeping current
+
+    def load(self, db: Session) -> None:
+        rows = db.execute(
+            select(
+                FlightPlan.id,
+                FlightPlan.status,
+                FlightPlan.planned_departure_time,
+                FlightPlan.planned_arrival_time,
+                FlightPlan.overdue_alerted_at,
+            ).where(
+                FlightPlan.status.in_(
+                    (FlightPlanStatus.APPROVED, FlightPlanStatus.ACTIVE)
+                )
+            )
+        ).all()
+        self.next_steps = {}
+        self._heap = []
+        for plan_id, *state in rows:
+            self._schedule(plan_id, next_step(*state))
+        self._poke()
+
+    def _schedule(self, plan_id: int, step: Optional[Step]) -> None:
+        # Superseded heap entries are left in place and skipped when popped.
+        if step is None:
+            self.next_steps.pop(plan_id, None)
+            return
+        if self.next_steps.get(plan_id) == step:
+            return
+        self.next_steps[plan_id] = step
+        heapq.heappush(self._heap, (step[0], plan_id, step[1]))
+
+    @staticmethod
+    def _read_steps(plan_ids: Iterable[int]) -> Dict[int, Optional[Step]]:
+        plan_ids = list(plan_ids)
+        db = BackgroundSessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    FlightPlan.id,
+                    FlightPlan.status,
+                    FlightPlan.planned_departure_time,
+                    FlightPlan.planned_arrival_time,
+                    FlightPlan.overdue_alerted_at,
+                ).where(FlightPlan.id.in_(plan_ids))
+            ).all()
+        finally:
+            db.close()
+        steps: Dict[int, Optional[Step]] = dict.fromkeys(plan_ids)
+        for plan_id, *state in rows:
+            steps[plan_id] = next_step(*state)
+        return steps
+
+    # Taking steps
+
+    @staticmethod
+    def _take_step(plan_id: int, step: str) -> Tuple[bool, Optional[Step]]:
+        """Take ``step`` if it is still due; returns (locked, the plan's next step)."""
+        db = BackgroundSessionLocal()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                locked = db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:namespace, :plan_id)"),
+                    {"namespace": ADVISORY_LOCK_NAMESPACE, "plan_id": plan_id},
+                ).scalar()
+                if not locked:
+                    return False, None
+            # Row locks, so a concurrent approve/cancel or drone status change
+            # either lands first and is seen here, or waits for this step.
+            plan = db.execute(
+                select(FlightPlan).where(FlightPlan.id == plan_id).with_for_update()
+            ).scalar_one_or_none()
+            if plan is None:
+                return True, None
+
+            now = datetime.now(timezone.utc)
+            current = next_step(
+                plan.status,
+                plan.planned_departure_time,
+                plan.planned_arrival_time,
+                plan.overdue_alerted_at,
+            )
+            if current is None or current[1] != step or current[0] > now:
+                # Changed since it was scheduled, possibly by another worker.
+                return True, current
+
+            old_status = plan.status
+            drone_freed = False
+            if step == START:
+                plan.status = FlightPlanStatus.ACTIVE
+                plan.actual_departure_time = plan.actual_departure_time or now
+            elif step == OVERDUE:
+                plan.overdue_alerted_at = now
+            else:
+                drone = db.get(Drone, plan.drone_id, with_for_update=True)
+                last_seen = drone.last_seen_at if drone is not None else None
+                departed = plan.actual_departure_time or plan.planned_departure_time
+                if last_seen is not None and as_utc(last_seen) >= as_utc(departed):
+                    plan.actual_arrival_time = plan.actual_arrival_time or last_seen
+                else:
+                    plan.actual_arrival_time = plan.actual_arrival_time or now
+                plan.status = FlightPlanStatus.COMPLETED
+                if drone is not None and drone.current_status == DroneStatus.ACTIVE:
+                    drone.current_status = DroneStatus.IDLE
+                    drone_freed = True
+            db.commit()  # Also releases the advisory lock.
+            db.refresh(plan)
+            lifecycle_steps.inc(step=step)
+
+            details: Dict[str, Any] = {"source": "lifecycle"}
+            if step == OVERDUE:
+                audit_log.record(
+                    FLIGHT_PLAN,
+                    plan.id,
+                    "overdue",
+                    new_value=plan.status,
+                    details=details,
+                )
+                event_bus.publish(
+                    FLIGHT_STATUS,
+                    {
+                        "flight_plan_id": plan.id,
+                        "status": plan.status.value,
+                        "alert": "overdue",
+                    },
+                )
+            else:
+                audit_log.record(
+                    FLIGHT_PLAN,
+                    plan.id,
+                    "started" if step == START else "completed",
+                    old_value=old_status,
+                    new_value=plan.status,
+                    details=details,
+                )
+                # Neither ACTIVE nor COMPLETED plans are revalidated.
+                nfz_revalidator.footprints.remove(plan.id)
+                booking_calendar.upsert_plan(plan)
+                event_bus.publish(
+                    FLIGHT_STATUS,
+                    {"flight_plan_id": plan.id, "status": plan.status.value},
+                )
+            if drone_freed:
+                audit_log.record(
+                    DRONE,
+                    plan.drone_id,
+                    "status_changed",
+                    old_value=DroneStatus.ACTIVE,
+                    new_value=DroneStatus.IDLE,
+                    details={"source": "lifecycle", "flight_plan_id": plan.id},
+                )
+                event_bus.publish(
+                    DRONE_STATUS,
+                    {"drone_id": plan.drone_id, "status": DroneStatus.IDLE.value},
+                )
+            return True, next_step(
+                plan.status,
+                plan.planned_departure_time,
+                plan.planned_arrival_time,
+                plan.overdue_alerted_at,
+            )
+        finally:
+            db.close()
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        self._wake = asyncio.Event()
+        subscription = event_bus.subscribe({FLIGHT_STATUS})
+
+        async def follow_status_changes():
+            try:
+                while True:
+                    plan_ids: Set[int] = set()
+                    event = await subscription.get()
+                    while True:
+                        try:
+                            plan_ids.add(int(event["data"]["flight_plan_id"]))
+                        except (KeyError, TypeError, ValueError):
+                            pass
+                        if subscription.queue.empty():
+                            break
+                        event = subscription.queue.get_nowait()
+                    if not plan_ids:
+                        continue
+                    try:
+                        steps = await asyncio.to_thread(self._read_steps, plan_ids)
+                    except Exception as e:
+                        print(f"Flight lifecycle: could not re-read plans: {e}")
+                        continue
+                    for plan_id, step in steps.items():
+                        self._schedule(plan_id, step)
+                    self._poke()
+            finally:
+                subscription.close()
+
+        self._events_task = asyncio.create_task(follow_status_changes())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._events_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = self._events_task = None
+
+    def _poke(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._heap:
+                delay = self._heap[0][0] - datetime.now(timezone.utc)
+                timeout = max(delay.total_seconds(), 0.0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            now = datetime.now(timezone.utc)
+            while self._heap and self._heap[0][0] <= now:
+                due, plan_id, step = heapq.heappop(self._heap)
+                if self.next_steps.get(plan_id) != (due, step):
+                    continue
+                del self.next_steps[plan_id]
+                try:
+                    locked, following = await asyncio.to_thread(
+                        self._take_step, plan_id, step
+                    )
+                except Exception as e:
+                    print(f"Flight lifecycle: {step} of plan {plan_id} failed: {e}")
+                    locked, following = False, None
+                if not locked:
+                    # Another worker holds the plan (or the database failed);
+                    # look again shortly.
+                    retry = now + timedelta(seconds=LOCK_RETRY_SECONDS)
+                    self._schedule(plan_id, (retry, step))
+                else:
+                    self._schedule(plan_id, following)
+
+
+flight_lifecycle = FlightLifecycleScheduler()
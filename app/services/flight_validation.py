@@ -0,0 +1,256 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import SessionLocal
+from app.models.drone import Drone, DroneStatus
+from app.models.flight_plan import FlightPlan
+from app.models.user import User, UserRole
+from app.schemas.flight_plan import FlightPlanCreate
+from app.services.booking_calendar import booking_overlaps
+from app.services.nfz_schedule import nfz_scheduler
+from app.services.telemetry_service import as_utc
+
+validation_seconds = metrics.summary(
+    "utm_flight_plan_validation_duration_seconds",
+    "Time spent validating a submitted flight plan",
+)
+violations_found = metrics.counter(
+    "utm_flight_plan_violations_total",
+    "Problems found in submitted flight plans, by stage",
+    ["stage"],
+)
+
+Violation = Dict[str, Any]
+
+# Ownership failures after which other plans' ids must not be disclosed.
+NOT_YOUR_DRONE = ("drone_not_found", "drone_not_operable")
+
+
+def _violation(
+    stage: str, code: str, message: str, ids: Optional[List[int]] = None
+) -> Violation:
+    violations_found.inc(stage=stage)
+    return {"stage": stage, "code": code, "message": message, "ids": ids}
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Render stage timings (seconds) as a Server-Timing header value."""
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+    )
+
+
+class FlightPlanValidator:
+    """Checks a flight plan submission and reports every problem at once.
+
+    The drone snapshot (with its pilot assignments), the booking overlap
+    query and the NFZ check run concurrently: the two queries on separate
+    sessions, the geometry against the zones scheduled for the flight window.
+    """
+
+    # Snapshot
+
+    @staticmethod
+    def _load_drone(db: Session, drone_id: int) -> Optional[Drone]:
+        return db.execute(
+            select(Drone)
+            .where(Drone.id == drone_id)
+            .options(selectinload(Drone.assigned_users_association))
+        ).scalar_one_or_none()
+
+    # Stages
+
+    @staticmethod
+    def check_ownership(user: User, drone: Optional[Drone]) -> List[Violation]:
+        if drone is None:
+            return [_violation("ownership", "drone_not_found", "Drone not found")]
+        if user.role == UserRole.AUTHORITY_ADMIN:
+            allowed = True
+        elif user.role == UserRole.SOLO_PILOT:
+            allowed = drone.solo_owner_user_id == user.id
+        elif user.role == UserRole.ORGANIZATION_ADMIN:
+            allowed = (
+                user.organization_id is not None
+                and drone.organization_id == user.organization_id
+            )
+        else:
+            allowed = any(
+                a.user_id == user.id for a in drone.assigned_users_association
+            )
+        violations = []
+        if not allowed:
+            violations.append(
+                _violation(
+                    "ownership",
+                    "drone_not_operable",
+                    "Drone is not owned by or assigned to you",
+                )
+            )
+        if drone.current_status == DroneStatus.MAINTENANCE:
+            violations.append(
+                _violation(
+                    "ownership", "drone_in_maintenance", "Drone is under maintenance"
+                )
+            )
+        return violations
+
+    @staticmethod
+    def check_schedule(
+        departure: datetime, arrival: datetime, now: datetime
+    ) -> List[Violation]:
+        violations = []
+        if arrival <= departure:
+            violations.append(
+                _violation(
+                    "schedule",
+                    "arrival_before_departure",
+                    "Arrival must follow departure",
+                )
+            )
+        elif arrival - departure > timedelta(
+            hours=settings.FLIGHT_PLAN_MAX_DURATION_HOURS
+        ):
+            violations.append(
+                _violation(
+                    "schedule",
+                    "flight_too_long",
+                    f"Flights may last at most "
+                    f"{settings.FLIGHT_PLAN_MAX_DURATION_HOURS:g} hours",
+                )
+            )
+        grace = timedelta(seconds=settings.FLIGHT_PLAN_DEPARTURE_GRACE_SECONDS)
+        if departure < now - grace:
+            violations.append(
+                _violation(
+                    "schedule", "departure_in_past", "Departure time is in the past"
+                )
+            )
+        elif departure > now + timedelta(days=settings.FLIGHT_PLAN_MAX_LEAD_DAYS):
+            violations.append(
+                _violation(
+                    "schedule",
+                    "departure_too_far",
+                    f"Flights may be booked at most "
+                    f"{settings.FLIGHT_PLAN_MAX_LEAD_DAYS} days ahead",
+                )
+            )
+        return violations
+
+    @staticmethod
+    def check_overlap(
+        drone_id: int, departure: datetime, arrival: datetime
+    ) -> List[Violation]:
+        if arrival <= departure:
+            # check_schedule reports this; PostgreSQL rejects the inverted range.
+            return []
+        # Own session, so it can run next to the snapshot query.
+        db = SessionLocal()
+        try:
+            clashes = (
+                db.execute(
+                    select(FlightPlan.id)
+                    .where(
+                        and_(
+                            FlightPlan.drone_id == drone_id,
+                            booking_overlaps(db, departure, arrival),
+                        )
+                    )
+                    .order_by(FlightPlan.id)
+                )
+                .scalars()
+                .all()
+            )
+        finally:
+            db.close()
+        if not clashes:
+            return []
+        return [
+            _violation(
+                "overlap",
+                "drone_already_booked",
+                "Drone is already booked for part of this window",
+                list(clashes),
+            )
+        ]
+
+    @staticmethod
+    def check_nfz(
+        lats: List[float],
+        lons: List[float],
+        alts: List[float],
+        departure: datetime,
+        arrival: datetime,
+    ) -> List[Violation]:
+        # Zones scheduled at any point of the flight, not just those active now.
+        bbox = (min(lats), max(lats), min(lons), max(lons))
+        crossed = sorted(
+            zone.zone_id
+            for zone in nfz_scheduler.zones_for_window(departure, arrival)
+            if zone.bbox_overlaps(*bbox) and zone.intersects_path(lats, lons, alts)
+        )
+        if not crossed:
+            return []
+        return [
+            _violation(
+                "nfz",
+                "route_crosses_restricted_zone",
+                "Route crosses restricted zones in force during the flight",
+                crossed,
+            )
+        ]
+
+    # Pipeline
+
+    async def validate(
+        self, db: Session, user: User, plan_in: FlightPlanCreate
+    ) -> Tuple[Optional[Drone], List[Violation], Dict[str, float]]:
+        """Returns the drone snapshot, all violations and per-stage seconds."""
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        departure = as_utc(plan_in.planned_departure_time)
+        arrival = as_utc(plan_in.planned_arrival_time)
+        lats = [w.latitude for w in plan_in.waypoints]
+        lons = [w.longitude for w in plan_in.waypoints]
+        alts = [w.altitude_m for w in plan_in.waypoints]
+
+        async def timed(name: str, fn: Callable, *args):
+            stage_started = time.perf_counter()
+            try:
+                return await asyncio.to_thread(fn, *args)
+            finally:
+                timings[name] = time.perf_counter() - stage_started
+
+        async def drone_checks():
+            drone = await timed("snapshot", self._load_drone, db, plan_in.drone_id)
+            stage_started = time.perf_counter()
+            violations = self.check_ownership(user, drone)
+            timings["ownership"] = time.perf_counter() - stage_started
+            return drone, violations
+
+        stage_started = time.perf_counter()
+        schedule = self.check_schedule(departure, arrival, datetime.now(timezone.utc))
+        timings["schedule"] = time.perf_counter() - stage_started
+        (drone, ownership), overlap, nfz = await asyncio.gather(
+            drone_checks(),
+            timed("overlap", self.check_overlap, plan_in.drone_id, departure, arrival),
+            timed("nfz", self.check_nfz, lats, lons, alts, departure, arrival),
+        )
+
+        if any(v["code"] in NOT_YOUR_DRONE for v in ownership):
+            # Still say the drone is booked, but not by which plans.
+            for violation in overlap:
+                violation["ids"] = None
+
+        timings["total"] = time.perf_counter() - started
+        validation_seconds.observe(timings["total"])
+        return drone, ownership + schedule + overlap + nfz, timings
+
+
+flight_plan_validator = FlightPlanValidator()
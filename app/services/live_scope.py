@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.db.database import BackgroundSessionLocal
+from app.models.drone import Drone
+from app.models.flight_plan import FlightPlan
+from app.models.user import User, UserRole
+from app.services.event_bus import DRONE_STATUS, FLIGHT_STATUS, TELEMETRY
+from app.services.fleet import my_fleet_stmt
+
+# Fleet membership and plan visibility are re-read this often, so a drone
+# handed to someone else, or a deleted plan, stops streaming to those who can
+# no longer see it.
+RECHECK_SECONDS = 60.0
+# Expired plan answers are swept out once this many are cached.
+MAX_CACHED_PLANS = 1000
+
+
+class LiveEventScope:
+    """Which live events one connected user may receive.
+
+    Mirrors the REST checks: telemetry and drone-status events for drones in
+    the user's fleet (what ``get_operable_drone`` allows), flight-status
+    events for plans ``get_viewable_flight_plan`` would return. Authority
+    admins get everything. Answers are cached per connection for
+    RECHECK_SECONDS.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self.everything = user.role == UserRole.AUTHORITY_ADMIN
+        self._drone_ids: Set[int] = set()
+        # flight plan id -> (visible, when it was checked)
+        self._plans: Dict[int, Tuple[bool, float]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _read_drone_ids(self) -> Set[int]:
+        db = BackgroundSessionLocal()
+        try:
+            stmt = my_fleet_stmt(self.user).with_only_columns(Drone.id)
+            return set(db.execute(stmt).scalars().all())
+        finally:
+            db.close()
+
+    def _can_view_plan(self, flight_plan_id: int) -> Optional[bool]:
+        """None while the plan can't be found, so it is asked about again."""
+        db = BackgroundSessionLocal()
+        try:
+            plan = db.execute(
+                select(FlightPlan.user_id, FlightPlan.organization_id).where(
+                    FlightPlan.id == flight_plan_id
+                )
+            ).first()
+        finally:
+            db.close()
+        if plan is None:
+            return None
+        return plan.user_id == self.user.id or (
+            self.user.role == UserRole.ORGANIZATION_ADMIN
+            and self.user.organization_id is not None
+            and plan.organization_id == self.user.organization_id
+        )
+
+    async def drone_ids(self) -> Set[int]:
+        """Drones whose events this user receives (unused for authority admins)."""
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > RECHECK_SECONDS:
+            self._drone_ids = await asyncio.to_thread(self._read_drone_ids)
+            self._loaded_at = now
+        return self._drone_ids
+
+    async def allows(self, event: Dict[str, Any]) -> bool:
+        if self.everything:
+            return True
+        data = event["data"]
+        if event["topic"] in (TELEMETRY, DRONE_STATUS):
+            return data.get("drone_id") in await self.drone_ids()
+        if event["topic"] == FLIGHT_STATUS:
+            flight_plan_id = data.get("flight_plan_id")
+            if flight_plan_id is None:
+                return False
+            now = time.monotonic()
+            cached = self._plans.get(flight_plan_id)
+            if cached is not None and now - cached[1] <= RECHECK_SECONDS:
+                return cached[0]
+            allowed = await asyncio.to_thread(self._can_view_plan, flight_plan_id)
+            if allowed is None:
+                self._plans.pop(flight_plan_id, None)
+                return False
+            if cached is None and len(self._plans) >= MAX_CACHED_PLANS:
+                self._plans = {
+                    plan_id: entry
+                    for plan_id, entry in self._plans.items()
+                    if now - entry[1] <= RECHECK_SECONDS
+                }
+            self._plans[flight_plan_id] = (allowed, now)
+            return allowed
+        return False
@@ -0,0 +1,346 @@
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.restricted_zone import NFZGeometryType
+from app.services.nfz_geometry import CompiledZone, nfz_index
+from app.services.telemetry_tail import ALT, HEADING, LAT, LON, SPEED, T
+from app.services.telemetry_tail import telemetry_tail
+
+# Tile-local coordinates run from 0 to TILE_EXTENT across a tile, as in
+# vector tiles. Geometry is simplified to one pixel of a 256 px tile and kept
+# TILE_BUFFER units past the edges, so outlines don't show seams.
+TILE_EXTENT = 4096
+SIMPLIFY_TOLERANCE = TILE_EXTENT / 256
+TILE_BUFFER = 64
+# Zones that simplify away at a zoom are drawn as a square this wide (4 px),
+# so small zones stay visible when zoomed out.
+MIN_ZONE_OUTLINE = 4 * SIMPLIFY_TOLERANCE
+CIRCLE_VERTICES = 64
+# Drones closer than this (tile units, 64 px) are drawn as one cluster.
+CLUSTER_CELL = TILE_EXTENT // 4
+MAX_MERCATOR_LAT = 85.0511287798
+
+tile_requests = metrics.counter(
+    "utm_map_tile_requests_total",
+    "Map tile requests, by layer and whether the tile was already built",
+    ["layer", "result"],
+)
+metrics.gauge(
+    "utm_map_tiles_cached",
+    "Zone tiles held serialized on this worker",
+    callback=lambda: {(): len(map_tiles.zone_tiles)},
+)
+
+Tile = Tuple[bytes, str]  # GeoJSON body, ETag
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) of a slippy-map tile."""
+    n = 1 << z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), lat(y), x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+
+
+def _to_tile(z: int, x: int, y: int, lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """Web Mercator lat/lon to tile-local coordinates."""
+    scale = (1 << z) * TILE_EXTENT
+    lats = np.clip(np.asarray(lats, dtype=float), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    px = (np.asarray(lons, dtype=float) + 180.0) / 360.0 * scale - x * TILE_EXTENT
+    sin = np.sin(np.radians(lats))
+    py = (0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * scale
+    return px, py - y * TILE_EXTENT
+
+
+def _from_tile(z: int, x: int, y: int, px, py) -> Tuple[np.ndarray, np.ndarray]:
+    scale = (1 << z) * TILE_EXTENT
+    lons = (np.asarray(px) + x * TILE_EXTENT) / scale * 360.0 - 180.0
+    my = math.pi * (1 - 2 * (np.asarray(py) + y * TILE_EXTENT) / scale)
+    return np.degrees(np.arctan(np.sinh(my))), lons
+
+
+def _square(cx: float, cy: float) -> List[Tuple[float, float]]:
+    half = MIN_ZONE_OUTLINE / 2
+    return [
+        (cx - half, cy - half),
+        (cx + half, cy - half),
+        (cx + half, cy + half),
+        (cx - half, cy + half),
+    ]
+
+
+def _zone_ring(zone: CompiledZone) -> Tuple[np.ndarray, np.ndarray]:
+    """The zone outline as lat/lon arrays; circles become polygons."""
+    if zone.geometry_type == NFZGeometryType.CIRCLE:
+        angles = np.linspace(0.0, 2 * math.pi, CIRCLE_VERTICES, endpoint=False)
+        radius = math.sqrt(zone.radius_sq)
+        return (
+            zone.lat0 + radius * np.sin(angles) / zone.ky,
+            zone.lon0 + radius * np.cos(angles) / zone.kx,
+        )
+    return zone.lat0 + zone.ys / zone.ky, zone.lon0 + zone.xs / zone.kx
+
+
+def simplify(px: np.ndarray, py: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices of the vertices Douglas-Peucker keeps for an open path."""
+    keep = np.zeros(len(px), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(px) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dx, dy = px[last] - px[first], py[last] - py[first]
+        xs, ys = px[first + 1 : last] - px[first], py[first + 1 : last] - py[first]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            distances = np.hypot(xs, ys)
+        else:
+            distances = np.abs(xs * dy - ys * dx) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.nonzero(keep)[0]
+
+
+def _clip_ring(points: List[Tuple[float, float]], low: float, high: float):
+    """Sutherland-Hodgman clip of a closed ring to the square [low, high]."""
+    for axis, bound, inside_is_greater in (
+        (0, low, True),
+        (0, high, False),
+        (1, low, True),
+        (1, high, False),
+    ):
+        if not points:
+            break
+
+        def inside(p):
+            return p[axis] >= bound if inside_is_greater else p[axis] <= bound
+
+        clipped = []
+        previous = points[-1]
+        for current in points:
+            if inside(current):
+                if not inside(previous):
+                    clipped.append(_crossing(previous, current, axis, bound))
+                clipped.append(current)
+            elif inside(previous):
+                clipped.append(_crossing(previous, current, axis, bound))
+            previous = current
+        points = clipped
+    return points
+
+
+def _crossing(a, b, axis: int, bound: float) -> Tuple[float, float]:
+    t = (bound - a[axis]) / (b[axis] - a[axis])
+    other = 1 - axis
+    point = [0.0, 0.0]
+    point[axis] = bound
+    point[other] = a[other] + t * (b[other] - a[other])
+    return point[0], point[1]
+
+
+def _serialize(features: List[Dict[str, Any]]) -> Tile:
+    body = json.dumps(
+        {"type": "FeatureCollection", "features": features}, separators=(",", ":")
+    ).encode("utf-8")
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+class MapTiles:
+    """GeoJSON tiles of the live restricted zones and of live drone traffic.
+
+    Zone tiles are clipped to the tile (plus a small buffer), simplified to
+    a pixel at the tile's zoom and kept serialized; any change to the live
+    zone index bumps nfz_index.version, which retires every cached tile.
+    Traffic tiles cluster the latest position of every drone heard from in
+    the last MAP_LIVE_DRONE_SECONDS. Positions come from the in-memory
+    telemetry buffers, snapshotted once per MAP_TRAFFIC_TICK_SECONDS, and
+    traffic tiles are rebuilt at most once per tick.
+    """
+
+    def __init__(
+        self,
+        max_zone_tiles: int,
+        traffic_tick_seconds: float,
+        live_drone_seconds: float,
+        cluster_max_zoom: int,
+    ):
+        self.max_zone_tiles = max_zone_tiles
+        self.traffic_tick_seconds = traffic_tick_seconds
+        self.live_drone_seconds = live_drone_seconds
+        self.cluster_max_zoom = cluster_max_zoom
+        self.zone_tiles: "OrderedDict[Tuple[int, int, int], Tuple[int, Tile]]"
+        self.zone_tiles = OrderedDict()
+        self._traffic_tiles: Dict[Tuple[int, int, int], Tile] = {}
+        self._traffic: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._traffic_at = 0.0
+
+    # Zones
+
+    def zone_tile(self, z: int, x: int, y: int) -> Tuple[Tile, bool]:
+        """The tile's body and ETag, and whether it was already built."""
+        version = nfz_index.version
+        key = (z, x, y)
+        cached = self.zone_tiles.get(key)
+        if cached is not None and cached[0] == version:
+            self.zone_tiles.move_to_end(key)
+            return cached[1], True
+
+        tile = _serialize(self._zone_features(z, x, y))
+        self.zone_tiles[key] = (version, tile)
+        self.zone_tiles.move_to_end(key)
+        while len(self.zone_tiles) > self.max_zone_tiles:
+            self.zone_tiles.popitem(last=False)
+        return tile, False
+
+    def _zone_features(self, z: int, x: int, y: int) -> List[Dict[str, Any]]:
+        min_lat, max_lat, min_lon, max_lon = tile_bounds(z, x, y)
+        # Pad by the buffer: a tile spans TILE_EXTENT units.
+        pad_lat = (max_lat - min_lat) * TILE_BUFFER / TILE_EXTENT
+        pad_lon = (max_lon - min_lon) * TILE_BUFFER / TILE_EXTENT
+        zones = [
+            zone
+            for zone in list(nfz_index.zones.values())
+            if zone.bbox_overlaps(
+                min_lat - pad_lat,
+                max_lat + pad_lat,
+                min_lon - pad_lon,
+                max_lon + pad_lon,
+            )
+        ]
+        # Coordinates only need to resolve a tile unit at this zoom.
+        decimals = min(7, max(1, round(math.log10((1 << z) * TILE_EXTENT / 360.0))))
+        features = []
+        for zone in sorted(zones, key=lambda zone: zone.zone_id):
+            lats, lons = _zone_ring(zone)
+            px, py = _to_tile(z, x, y, lats, lons)
+            # Close the ring so the simplification keeps its last edge.
+            px, py = np.append(px, px[0]), np.append(py, py[0])
+            kept = simplify(px, py, SIMPLIFY_TOLERANCE)[:-1]
+            if len(kept) >= 3:
+                outline = list(zip(px[kept].tolist(), py[kept].tolist()))
+            else:
+                outline = _square((px.min() + px.max()) / 2, (py.min() + py.max()) / 2)
+            ring = _clip_ring(outline, -TILE_BUFFER, TILE_EXTENT + TILE_BUFFER)
+            if len(ring) < 3:
+                continue
+            rx, ry = np.asarray(ring).T
+            ring_lats, ring_lons = _from_tile(z, x, y, rx, ry)
+            coordinates = [
+                [round(lon, decimals), round(lat, decimals)]
+                for lon, lat in zip(ring_lons.tolist(), ring_lats.tolist())
+            ]
+            coordinates.append(coordinates[0])
+            features.append(
+                {
+                    "type": "Feature",
+                    "id": zone.zone_id,
+                    "geometry": {"type": "Polygon", "coordinates": [coordinates]},
+                    "properties": {
+                        "name": zone.name,
+                        "geometry_type": zone.geometry_type.value,
+                        "min_altitude_m": zone.min_altitude_m,
+                        "max_altitude_m": zone.max_altitude_m,
+                        "active_until": (
+                            zone.active_until.isoformat() if zone.active_until else None
+                        ),
+                    },
+                }
+            )
+        return features
+
+    # Traffic
+
+    def traffic_tile(self, z: int, x: int, y: int) -> Tuple[Tile, bool]:
+        """The tile's body and ETag, and whether it was built this tick."""
+        if time.monotonic() - self._traffic_at >= self.traffic_tick_seconds:
+            cutoff = datetime.now(timezone.utc) - timedelta(
+                seconds=self.live_drone_seconds
+            )
+            self._traffic = telemetry_tail.latest(cutoff)
+            self._traffic_tiles = {}
+            self._traffic_at = time.monotonic()
+        key = (z, x, y)
+        cached = self._traffic_tiles.get(key)
+        if cached is not None:
+            return cached, True
+        tile = self._traffic_tiles[key] = _serialize(self._traffic_features(z, x, y))
+        return tile, False
+
+    def _traffic_features(self, z: int, x: int, y: int) -> List[Dict[str, Any]]:
+        drone_ids, rows = self._traffic
+        if not len(rows):
+            return []
+        px, py = _to_tile(z, x, y, rows[:, LAT], rows[:, LON])
+        inside = (px >= 0) & (px < TILE_EXTENT) & (py >= 0) & (py < TILE_EXTENT)
+        drone_ids, rows, px, py = (
+            drone_ids[inside],
+            rows[inside],
+            px[inside],
+            py[inside],
+        )
+
+        if z > self.cluster_max_zoom:
+            groups = [np.array([i]) for i in range(len(rows))]
+        else:
+            cells = (py // CLUSTER_CELL).astype(np.int64) * TILE_EXTENT + (
+                px // CLUSTER_CELL
+            ).astype(np.int64)
+            order = np.argsort(cells, kind="stable")
+            starts = np.flatnonzero(np.diff(cells[order], prepend=-1))
+            groups = np.split(order, starts[1:])
+
+        features = []
+        for group in groups:
+            if len(group) == 1:
+                row = rows[group[0]]
+                speed, heading = row[SPEED], row[HEADING]
+                properties = {
+                    "drone_id": int(drone_ids[group[0]]),
+                    "altitude_m": float(row[ALT]),
+                    "speed_mps": None if speed != speed else float(speed),
+                    "heading_degrees": None if heading != heading else float(heading),
+                    "timestamp": datetime.fromtimestamp(
+                        row[T], tz=timezone.utc
+                    ).isoformat(),
+                }
+                lat, lon = float(row[LAT]), float(row[LON])
+            else:
+                properties = {
+                    "cluster": True,
+                    "count": len(group),
+                    "drone_ids": sorted(int(i) for i in drone_ids[group]),
+                }
+                lat = float(rows[group, LAT].mean())
+                lon = float(rows[group, LON].mean())
+            features.append(
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": properties,
+                }
+            )
+        return features
+
+
+map_tiles = MapTiles(
+    max_zone_tiles=settings.MAP_TILE_CACHE_TILES,
+    traffic_tick_seconds=settings.MAP_TRAFFIC_TICK_SECONDS,
+    live_drone_seconds=settings.MAP_LIVE_DRONE_SECONDS,
+    cluster_max_zoom=settings.MAP_CLUSTER_MAX_ZOOM,
+)
@@ -0,0 +1,429 @@
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models.restricted_zone import NFZGeometryType, RestrictedZone
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180.0
+GRID_CELL_DEGREES = 0.1  # Candidate lookup grid, roughly 11 km north-south
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance; the reference the planar checks are measured against."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def haversine_legs_m(lats, lons) -> np.ndarray:
+    """Great-circle length of each leg of a point sequence (n points -> n-1 legs)."""
+    phi = np.radians(np.asarray(lats, dtype=float))
+    lmb = np.radians(np.asarray(lons, dtype=float))
+    dphi = np.diff(phi)
+    dlmb = np.diff(lmb)
+    a = (
+        np.sin(dphi / 2) ** 2
+        + np.cos(phi[:-1]) * np.cos(phi[1:]) * np.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class CompiledZone:
+    """A restricted zone projected once onto a local east/north plane (meters).
+
+    The projection is equirectangular around the zone center: near the edge of
+    a zone a few kilometers across it agrees with haversine to about a meter,
+    and every check becomes a handful of multiplications.
+    """
+
+    __slots__ = (
+        "zone_id",
+        "name",
+        "geometry_type",
+        "lat0",
+        "lon0",
+        "kx",
+        "ky",
+        "min_altitude_m",
+        "max_altitude_m",
+        "radius_sq",
+        "xs",
+        "ys",
+        "min_lat",
+        "max_lat",
+        "min_lon",
+        "max_lon",
+        "active_from",
+        "active_until",
+    )
+
+    def __init__(
+        self,
+        zone_id: int,
+        name: str,
+        geometry_type: NFZGeometryType,
+        definition: dict,
+        min_altitude_m: Optional[float],
+        max_altitude_m: Optional[float],
+        active_from: Optional[datetime] = None,
+        active_until: Optional[datetime] = None,
+    ):
+        self.zone_id = zone_id
+        self.name = name
+        self.geometry_type = geometry_type
+        self.min_altitude_m = min_altitude_m
+        self.max_altitude_m = max_altitude_m
+        self.active_from = _aware(active_from)
+        self.active_until = _aware(active_until)
+        self.radius_sq = 0.0
+        self.xs = self.ys = np.empty(0)
+
+        if geometry_type == NFZGeometryType.CIRCLE:
+            self.lat0 = float(definition["center_lat"])
+            self.lon0 = float(definition["center_lon"])
+            self._set_scale()
+            radius = float(definition["radius_m"])
+            self.radius_sq = radius * radius
+            dlat = radius / self.ky
+            dlon = radius / self.kx
+            self.min_lat, self.max_lat = self.lat0 - dlat, self.lat0 + dlat
+            self.min_lon, self.max_lon = self.lon0 - dlon, self.lon0 + dlon
+        else:
+            ring = np.asarray(definition["coordinates"][0], dtype=float)
+            if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                ring = ring[:-1]  # GeoJSON rings repeat the first vertex
+            lons, lats = ring[:, 0], ring[:, 1]
+            self.min_lat, self.max_lat = float(lats.min()), float(lats.max())
+            self.min_lon, self.max_lon = float(lons.min()), float(lons.max())
+            self.lat0 = (self.min_lat + self.max_lat) / 2
+            self.lon0 = (self.min_lon + self.max_lon) / 2
+            self._set_scale()
+            self.xs, self.ys = self.project(lats, lons)
+
+    def _set_scale(self) -> None:
+        self.ky = METERS_PER_DEGREE
+        self.kx = METERS_PER_DEGREE * math.cos(math.radians(self.lat0))
+
+    @classmethod
+    def from_model(cls, zone: RestrictedZone) -> "CompiledZone":
+        return cls(
+            zone.id,
+            zone.name,
+            NFZGeometryType(zone.geometry_type),
+            zone.definition_json,
+            zone.min_altitude_m,
+            zone.max_altitude_m,
+            zone.active_from,
+            zone.active_until,
+        )
+
+    def active_at(self, when: datetime) -> bool:
+        """Whether ``when`` falls in the zone's [active_from, active_until) window."""
+        return (self.active_from is None or self.active_from <= when) and (
+            self.active_until is None or when < self.active_until
+        )
+
+    def window_overlaps(self, start: datetime, end: datetime) -> bool:
+        return (self.active_from is None or self.active_from < end) and (
+            self.active_until is None or start < self.active_until
+        )
+
+    def project(self, lats, lons):
+        """Lat/lon (degrees, scalars or arrays) -> local east/north meters."""
+        return (
+            np.subtract(lons, self.lon0) * self.kx,
+            np.subtract(lats, self.lat0) * self.ky,
+        )
+
+    def in_altitude_band(self, alts):
+        mask = np.ones(np.shape(alts), dtype=bool)
+        if self.min_altitude_m is not None:
+            mask &= np.asarray(alts) >= self.min_altitude_m
+        if self.max_altitude_m is not None:
+            mask &= np.asarray(alts) <= self.max_altitude_m
+        return mask
+
+    def contains_many(
+        self, lats: np.ndarray, lons: np.ndarray, alts: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Vectorized containment test for arrays of points."""
+        mask = (
+            (lats >= self.min_lat)
+            & (lats <= self.max_lat)
+            & (lons >= self.min_lon)
+            & (lons <= self.max_lon)
+        )
+        if alts is not None:
+            mask &= self.in_altitude_band(alts)
+        idx = np.nonzero(mask)[0]
+        if idx.size == 0:
+            return mask
+        x, y = self.project(lats[idx], lons[idx])
+        if self.geometry_type == NFZGeometryType.CIRCLE:
+            mask[idx] = x * x + y * y <= self.radius_sq
+        else:
+            mask[idx] = _points_in_polygon(x, y, self.xs, self.ys)
+        return mask
+
+    def contains(self, lat: float, lon: float, alt: Optional[float] = None) -> bool:
+        return bool(
+            self.contains_many(
+                np.array([lat]),
+                np.array([lon]),
+                None if alt is None else np.array([alt]),
+            )[0]
+        )
+
+    def bbox_overlaps(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> bool:
+        return not (
+            max_lat < self.min_lat
+            or min_lat > self.max_lat
+            or max_lon < self.min_lon
+            or min_lon > self.max_lon
+        )
+
+    def intersects_path(self, lats, lons, alts) -> bool:
+        """Whether any leg of a waypoint path passes through the zone.
+
+        Altitude is interpolated linearly along each leg, so a leg only counts
+        when its altitude range overlaps the zone's vertical band.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        alts = np.asarray(alts, dtype=float)
+        if lats.size == 0:
+            return False
+        if lats.size == 1:
+            return bool(self.contains_many(lats, lons, alts)[0])
+
+        low = np.minimum(alts[:-1], alts[1:])
+        high = np.maximum(alts[:-1], alts[1:])
+        legs = np.ones(low.shape, dtype=bool)
+        if self.min_altitude_m is not None:
+            legs &= high >= self.min_altitude_m
+        if self.max_altitude_m is not None:
+            legs &= low <= self.max_altitude_m
+        legs &= ~(
+            (np.maximum(lats[:-1], lats[1:]) < self.min_lat)
+            | (np.minimum(lats[:-1], lats[1:]) > self.max_lat)
+            | (np.maximum(lons[:-1], lons[1:]) < self.min_lon)
+            | (np.minimum(lons[:-1], lons[1:]) > self.max_lon)
+        )
+        idx = np.nonzero(legs)[0]
+        if idx.size == 0:
+            return False
+
+        x, y = self.project(lats, lons)
+        ax, ay, bx, by = x[idx], y[idx], x[idx + 1], y[idx + 1]
+        if self.geometry_type == NFZGeometryType.CIRCLE:
+            dx, dy = bx - ax, by - ay
+            length_sq = np.where(dx * dx + dy * dy == 0, 1.0, dx * dx + dy * dy)
+            t = np.clip(-(ax * dx + ay * dy) / length_sq, 0.0, 1.0)
+            cx, cy = ax + t * dx, ay + t * dy
+            return bool(np.any(cx * cx + cy * cy <= self.radius_sq))
+
+        if np.any(_points_in_polygon(ax, ay, self.xs, self.ys)) or np.any(
+            _points_in_polygon(bx, by, self.xs, self.ys)
+        ):
+            return True
+        return bool(
+            np.any(
+                _segments_cross(
+                    ax,
+                    ay,
+                    bx,
+                    by,
+                    self.xs,
+                    self.ys,
+                    np.roll(self.xs, -1),
+                    np.roll(self.ys, -1),
+                )
+            )
+        )
+
+    def distance_many(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Horizontal distance in meters to the zone (0 inside)."""
+        x, y = self.project(lats, lons)
+        if self.geometry_type == NFZGeometryType.CIRCLE:
+            return np.maximum(np.hypot(x, y) - math.sqrt(self.radius_sq), 0.0)
+        inside = _points_in_polygon(x, y, self.xs, self.ys)
+        ax, ay = self.xs, self.ys
+        bx, by = np.roll(ax, -1), np.roll(ay, -1)
+        ex, ey = bx - ax, by - ay
+        length_sq = np.where(ex * ex + ey * ey == 0, 1.0, ex * ex + ey * ey)
+        px = x[:, None] - ax[None, :]
+        py = y[:, None] - ay[None, :]
+        t = np.clip((px * ex + py * ey) / length_sq, 0.0, 1.0)
+        dx = px - t * ex
+        dy = py - t * ey
+        nearest = np.sqrt((dx * dx + dy * dy).min(axis=1))
+        return np.where(inside, 0.0, nearest)
+
+
+def _points_in_polygon(
+    x: np.ndarray, y: np.ndarray, xs: np.ndarray, ys: np.ndarray
+) -> np.ndarray:
+    """Even-odd ray casting, broadcast over points x edges."""
+    x = np.asarray(x)[:, None]
+    y = np.asarray(y)[:, None]
+    x1, y1 = xs[None, :], ys[None, :]
+    x2, y2 = np.roll(xs, -1)[None, :], np.roll(ys, -1)[None, :]
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    crossings = straddles & (x < x_cross)
+    return (np.count_nonzero(crossings, axis=1) % 2) == 1
+
+
+def _segments_cross(ax, ay, bx, by, cx, cy, dx, dy) -> np.ndarray:
+    """Proper intersection of segments AB (rows) with CD (columns)."""
+    ax, ay, bx, by = (v[:, None] for v in (ax, ay, bx, by))
+    cx, cy, dx, dy = (v[None, :] for v in (cx, cy, dx, dy))
+
+    def orient(px, py, qx, qy, rx, ry):
+        return np.sign((qx - px) * (ry - py) - (qy - py) * (rx - px))
+
+    o1 = orient(ax, ay, bx, by, cx, cy)
+    o2 = orient(ax, ay, bx, by, dx, dy)
+    o3 = orient(cx, cy, dx, dy, ax, ay)
+    o4 = orient(cx, cy, dx, dy, bx, by)
+    return (o1 != o2) & (o3 != o4)
+
+
+def grid_cells(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float
+) -> Iterable[Tuple[int, int]]:
+    for i in range(
+        math.floor(min_lat / GRID_CELL_DEGREES),
+        math.floor(max_lat / GRID_CELL_DEGREES) + 1,
+    ):
+        for j in range(
+            math.floor(min_lon / GRID_CELL_DEGREES),
+            math.floor(max_lon / GRID_CELL_DEGREES) + 1,
+        ):
+            yield i, j
+
+
+class NFZIndex:
+    """Live set of compiled active zones with a coarse grid for candidate lookup."""
+
+    def __init__(self):
+        self.zones: Dict[int, CompiledZone] = {}
+        self._grid: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.version = 0  # Bumped on every change; lets caches key on it
+
+    def replace(self, zones: Iterable[CompiledZone]) -> None:
+        """Swap the whole set of live zones in one step."""
+        with self._lock:
+            self.zones = {}
+            self._grid = defaultdict(set)
+            for zone in zones:
+                self._insert(zone)
+            self.version += 1
+
+    def upsert(self, zone: CompiledZone) -> None:
+        with self._lock:
+            self._remove(zone.zone_id)
+            self._insert(zone)
+            self.version += 1
+
+    def remove(self, zone_id: int) -> None:
+        with self._lock:
+            self._remove(zone_id)
+            self.version += 1
+
+    def _insert(self, zone: CompiledZone) -> None:
+        self.zones[zone.zone_id] = zone
+        for cell in grid_cells(zone.min_lat, zone.max_lat, zone.min_lon, zone.max_lon):
+            self._grid[cell].add(zone.zone_id)
+
+    def _remove(self, zone_id: int) -> None:
+        zone = self.zones.pop(zone_id, None)
+        if zone is None:
+            return
+        for cell in grid_cells(zone.min_lat, zone.max_lat, zone.min_lon, zone.max_lon):
+            ids = self._grid.get(cell)
+            if ids is not None:
+                ids.discard(zone_id)
+                if not ids:
+                    del self._grid[cell]
+
+    def candidates(self, lats: np.ndarray, lons: np.ndarray) -> List[CompiledZone]:
+        """Zones whose grid cells are touched by any of the points."""
+        cells = set(
+            zip(
+                np.floor(lats / GRID_CELL_DEGREES).astype(int).tolist(),
+                np.floor(lons / GRID_CELL_DEGREES).astype(int).tolist(),
+            )
+        )
+        zones = self.zones
+        grid = self._grid
+        ids: Set[int] = set()
+        for cell in cells:
+            ids |= grid.get(cell, set())
+        return [zones[i] for i in ids if i in zones]
+
+    def candidates_in_bbox(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> List[CompiledZone]:
+        zones = self.zones
+        ids: Set[int] = set()
+        for cell in grid_cells(min_lat, max_lat, min_lon, max_lon):
+            ids |= self._grid.get(cell, set())
+        return [
+            zones[i]
+            for i in ids
+            if i in zones and zones[i].bbox_overlaps(min_lat, max_lat, min_lon, max_lon)
+        ]
+
+    def path_conflicts(self, lats, lons, alts) -> List[CompiledZone]:
+        """Active zones crossed by any leg of a waypoint path."""
+        if len(lats) == 0:
+            return []
+        candidates = self.candidates_in_bbox(min(lats), max(lats), min(lons), max(lons))
+        return [zone for zone in candidates if zone.intersects_path(lats, lons, alts)]
+
+    def check_points(
+        self,
+        lats: Iterable[float],
+        lons: Iterable[float],
+        alts: Optional[Iterable[float]] = None,
+    ) -> List[List[CompiledZone]]:
+        """Zones containing each point; one vectorized pass per candidate zone."""
+        lat_arr = np.asarray(lats, dtype=float)
+        lon_arr = np.asarray(lons, dtype=float)
+        alt_arr = None if alts is None else np.asarray(alts, dtype=float)
+        hits: List[List[CompiledZone]] = [[] for _ in range(lat_arr.size)]
+        if lat_arr.size == 0:
+            return hits
+        for zone in self.candidates(lat_arr, lon_arr):
+            for i in np.nonzero(zone.contains_many(lat_arr, lon_arr, alt_arr))[0]:
+                hits[i].append(zone)
+        return hits
+
+    def zones_at(
+        self, lat: float, lon: float, alt: Optional[float] = None
+    ) -> List[CompiledZone]:
+        return self.check_points([lat], [lon], None if alt is None else [alt])[0]
+
+
+nfz_index = NFZIndex()
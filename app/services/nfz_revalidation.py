@@ -0,0 +1,407 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+from app.db.database import BackgroundSessionLocal
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.waypoint import Waypoint
+from app.services.event_bus import FLIGHT_STATUS, NFZ_REVALIDATION, event_bus
+from app.services.nfz_geometry import CompiledZone, grid_cells
+from app.services.nfz_schedule import DAWN, FOREVER
+
+# Plans that have not flown yet and can still be stopped by a new zone.
+REVALIDATED_STATUSES = (
+    FlightPlanStatus.PENDING_ORG_APPROVAL,
+    FlightPlanStatus.PENDING_AUTHORITY_APPROVAL,
+    FlightPlanStatus.APPROVED,
+)
+# updated_at comes from the transaction start on the DB side, so a plan written
+# by a transaction that was open during the last sync can carry an older stamp.
+SYNC_OVERLAP = timedelta(minutes=1)
+CHUNK_SIZE = 200
+MAX_KEPT_JOBS = 200
+
+plans_rechecked = metrics.counter(
+    "utm_nfz_revalidation_plans_rechecked_total",
+    "Flight plans re-checked after a restricted zone changed",
+)
+plans_flagged = metrics.counter(
+    "utm_nfz_revalidation_plans_flagged_total",
+    "Flight plans newly found to cross a changed restricted zone",
+)
+revalidation_seconds = metrics.summary(
+    "utm_nfz_revalidation_duration_seconds", "Time spent per revalidation job"
+)
+
+BBox = Tuple[float, float, float, float]  # min_lat, max_lat, min_lon, max_lon
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class PlanFootprint:
+    __slots__ = ("plan_id", "bbox", "departure", "arrival")
+
+    def __init__(
+        self, plan_id: int, bbox: BBox, departure: datetime, arrival: datetime
+    ):
+        self.plan_id = plan_id
+        self.bbox = bbox
+        self.departure = _utc(departure)
+        self.arrival = _utc(arrival)
+
+
+class PlanFootprintIndex:
+    """Grid of the route bounding boxes and time windows of revalidated plans.
+
+    Warmed with one aggregate query over waypoints, then kept current by
+    re-reading only plans whose updated_at moved since the previous sync.
+    """
+
+    def __init__(self):
+        self.footprints: Dict[int, PlanFootprint] = {}
+        self._grid: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._synced_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def sync(self, db: Session) -> None:
+        started = datetime.now(timezone.utc)
+        stmt = (
+            select(
+                FlightPlan.id,
+                FlightPlan.status,
+                FlightPlan.deleted_at,
+                FlightPlan.planned_departure_time,
+                FlightPlan.planned_arrival_time,
+                func.min(Waypoint.latitude),
+                func.max(Waypoint.latitude),
+                func.min(Waypoint.longitude),
+                func.max(Waypoint.longitude),
+            )
+            .join(Waypoint, Waypoint.flight_plan_id == FlightPlan.id)
+            .group_by(FlightPlan.id)
+            # Incremental syncs must see tombstones to drop deleted plans.
+            .execution_options(include_deleted=True)
+        )
+        if self._synced_at is None:
+            stmt = stmt.where(
+                and_(
+                    FlightPlan.status.in_(REVALIDATED_STATUSES),
+                    FlightPlan.deleted_at.is_(None),
+                    FlightPlan.planned_arrival_time > started,
+                )
+            )
+        else:
+            stmt = stmt.where(FlightPlan.updated_at >= self._synced_at - SYNC_OVERLAP)
+
+        for row in db.execute(stmt):
+            plan_id, plan_status, deleted_at, departure, arrival = row[:5]
+            if plan_status in REVALIDATED_STATUSES and deleted_at is None:
+                self.upsert(PlanFootprint(plan_id, tuple(row[5:]), departure, arrival))
+            else:
+                self.remove(plan_id)
+        self._prune_expired(started)
+        self._synced_at = started
+
+    def upsert_plan(self, plan: FlightPlan) -> None:
+        """Index a plan right away, e.g. after it was submitted."""
+        if not plan.waypoints:
+            return
+        lats = [w.latitude for w in plan.waypoints]
+        lons = [w.longitude for w in plan.waypoints]
+        self.upsert(
+            PlanFootprint(
+                plan.id,
+                (min(lats), max(lats), min(lons), max(lons)),
+                plan.planned_departure_time,
+                plan.planned_arrival_time,
+            )
+        )
+
+    def upsert(self, footprint: PlanFootprint) -> None:
+        with self._lock:
+            self._remove(footprint.plan_id)
+            self.footprints[footprint.plan_id] = footprint
+            for cell in grid_cells(*footprint.bbox):
+                self._grid[cell].add(footprint.plan_id)
+
+    def remove(self, plan_id: int) -> None:
+        with self._lock:
+            self._remove(plan_id)
+
+    def _remove(self, plan_id: int) -> None:
+        footprint = self.footprints.pop(plan_id, None)
+        if footprint is None:
+            return
+        for cell in grid_cells(*footprint.bbox):
+            ids = self._grid.get(cell)
+            if ids is not None:
+                ids.discard(plan_id)
+                if not ids:
+                    del self._grid[cell]
+
+    def _prune_expired(self, now: datetime) -> None:
+        expired = [p.plan_id for p in self.footprints.values() if p.arrival <= now]
+        for plan_id in expired:
+            self.remove(plan_id)
+
+    def candidates(
+        self,
+        bbox: BBox,
+        window: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None,
+    ) -> List[int]:
+        """Plans whose route box and schedule overlap ``bbox`` and ``window``."""
+        min_lat, max_lat, min_lon, max_lon = bbox
+        start, end = window or (None, None)
+        now = datetime.now(timezone.utc)
+        start = max(_utc(start), now) if start is not None else now
+        with self._lock:
+            ids: Set[int] = set()
+            for cell in grid_cells(min_lat, max_lat, min_lon, max_lon):
+                ids |= self._grid.get(cell, set())
+            footprints = [self.footprints[i] for i in ids]
+        return sorted(
+            p.plan_id
+            for p in footprints
+            if not (
+                p.bbox[1] < min_lat
+                or p.bbox[0] > max_lat
+                or p.bbox[3] < min_lon
+                or p.bbox[2] > max_lon
+            )
+            and p.arrival > start
+            and (end is None or p.departure < _utc(end))
+        )
+
+
+class RevalidationJob:
+    def __init__(self, zone_id: int):
+        self.id = uuid.uuid4().hex
+        self.zone_id = zone_id
+        self.status = "queued"
+        self.total = 0
+        self.processed = 0
+        self.flagged = 0
+        self.cleared = 0
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "zone_id": self.zone_id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "flagged": self.flagged,
+            "cleared": self.cleared,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class NFZRevalidator:
+    """Re-checks only the flight plans a restricted zone change can affect.
+
+    Jobs run one at a time on a background thread so zone edits return
+    immediately; each job recomputes just the changed zone's membership in
+    every candidate plan's nfz_conflict_zone_ids.
+
+    A job runs on the worker that took the zone edit, which broadcasts its
+    progress on the event bus; other workers keep the latest snapshot, so
+    the job can be polled through any of them.
+    """
+
+    def __init__(self):
+        self.footprints = PlanFootprintIndex()
+        self.jobs: "OrderedDict[str, RevalidationJob]" = OrderedDict()
+        self.remote_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="nfz-revalidate"
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(
+        self,
+        zone_id: int,
+        previous: Optional[CompiledZone],
+        current: Optional[CompiledZone],
+    ) -> RevalidationJob:
+        """Queue a re-check for a zone that was created, edited or removed.
+
+        ``previous`` and ``current`` are the compiled zone before and after
+        the change; either is None when the zone did not exist or no longer
+        applies.
+        """
+        job = RevalidationJob(zone_id)
+        self.jobs[job.id] = job
+        while len(self.jobs) > MAX_KEPT_JOBS:
+            self.jobs.popitem(last=False)
+        self._announce(job)
+        self._executor.submit(self._run, job, previous, current)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job's state, whichever worker runs it."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.as_dict()
+        return self.remote_jobs.get(job_id)
+
+    @staticmethod
+    def _announce(job: RevalidationJob) -> None:
+        event_bus.publish(
+            NFZ_REVALIDATION, {"origin": event_bus.origin, "job": job.as_dict()}
+        )
+
+    async def start(self) -> None:
+        subscription = event_bus.subscribe({NFZ_REVALIDATION})
+
+        async def follow_jobs():
+            try:
+                while True:
+                    data = (await subscription.get())["data"]
+                    if data.get("origin") == event_bus.origin:
+                        continue
+                    try:
+                        job = data["job"]
+                        self.remote_jobs[job["id"]] = job
+                    except (KeyError, TypeError):
+                        continue
+                    self.remote_jobs.move_to_end(job["id"])
+                    while len(self.remote_jobs) > MAX_KEPT_JOBS:
+                        self.remote_jobs.popitem(last=False)
+            finally:
+                subscription.close()
+
+        self._task = asyncio.create_task(follow_jobs())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _run(
+        self,
+        job: RevalidationJob,
+        previous: Optional[CompiledZone],
+        current: Optional[CompiledZone],
+    ) -> None:
+        job.status = "running"
+        self._announce(job)
+        started = time.perf_counter()
+        try:
+            with BackgroundSessionLocal() as db:
+                self.footprints.sync(db)
+                zones = [zone for zone in (previous, current) if zone is not None]
+                if zones:
+                    bbox = (
+                        min(zone.min_lat for zone in zones),
+                        max(zone.max_lat for zone in zones),
+                        min(zone.min_lon for zone in zones),
+                        max(zone.max_lon for zone in zones),
+                    )
+                    window = (
+                        min(zone.active_from or DAWN for zone in zones),
+                        max(zone.active_until or FOREVER for zone in zones),
+                    )
+                    plan_ids = self.footprints.candidates(bbox, window)
+                else:
+                    plan_ids = []
+                job.total = len(plan_ids)
+                for i in range(0, len(plan_ids), CHUNK_SIZE):
+                    self._recheck(db, job, plan_ids[i : i + CHUNK_SIZE], current)
+                    self._announce(job)
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"NFZ revalidation for zone {job.zone_id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            revalidation_seconds.observe(time.perf_counter() - started)
+            self._announce(job)
+
+    def _recheck(
+        self,
+        db: Session,
+        job: RevalidationJob,
+        plan_ids: List[int],
+        zone: Optional[CompiledZone],
+    ) -> None:
+        # Jobs for different zones edit the same conflict lists, so the plans
+        # are locked (in id order, so two jobs can't deadlock) and re-read
+        # before their lists are changed.
+        plans = (
+            db.execute(
+                select(FlightPlan)
+                .where(
+                    and_(
+                        FlightPlan.id.in_(plan_ids),
+                        FlightPlan.status.in_(REVALIDATED_STATUSES),
+                    )
+                )
+                .order_by(FlightPlan.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            .scalars()
+            .all()
+        )
+        now = datetime.now(timezone.utc)
+        changed: List[dict] = []
+        for plan in plans:
+            conflicts = set(plan.nfz_conflict_zone_ids or [])
+            crosses = (
+                zone is not None
+                and zone.window_overlaps(
+                    _utc(plan.planned_departure_time), _utc(plan.planned_arrival_time)
+                )
+                and zone.intersects_path(
+                    [w.latitude for w in plan.waypoints],
+                    [w.longitude for w in plan.waypoints],
+                    [w.altitude_m for w in plan.waypoints],
+                )
+            )
+            if crosses != (job.zone_id in conflicts):
+                if crosses:
+                    conflicts.add(job.zone_id)
+                    job.flagged += 1
+                else:
+                    conflicts.discard(job.zone_id)
+                    job.cleared += 1
+                changed.append(
+                    {
+                        "flight_plan_id": plan.id,
+                        "status": plan.status.value,
+                        "nfz_conflict_zone_ids": sorted(conflicts),
+                    }
+                )
+            plan.nfz_conflict_zone_ids = sorted(conflicts)
+            plan.nfz_checked_at = now
+        db.commit()
+
+        plans_rechecked.inc(len(plans))
+        job.processed += len(plan_ids)
+        for event in changed:
+            if job.zone_id in event["nfz_conflict_zone_ids"]:
+                plans_flagged.inc()
+            event_bus.publish(FLIGHT_STATUS, event)
+
+
+nfz_revalidator = NFZRevalidator()
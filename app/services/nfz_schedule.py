@@ -0,0 +1,240 @@
+import asyncio
+import heapq
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+from app.db.database import BackgroundSessionLocal
+from app.models.restricted_zone import RestrictedZone
+from app.services.event_bus import RESTRICTED_ZONES, event_bus
+from app.services.nfz_geometry import CompiledZone, nfz_index
+from app.utils.interval_tree import IntervalTree
+
+# Open-ended windows are stored with these bounds in the interval tree.
+DAWN = datetime.min.replace(tzinfo=timezone.utc)
+FOREVER = datetime.max.replace(tzinfo=timezone.utc)
+
+zone_switches = metrics.counter(
+    "utm_nfz_schedule_switches_total",
+    "Restricted zones swapped into or out of the live index at a boundary",
+    ["action"],
+)
+metrics.gauge(
+    "utm_nfz_scheduled_zones",
+    "Enabled restricted zones known to the activation scheduler",
+    callback=lambda: {(): len(nfz_scheduler.zones)},
+)
+
+
+class NFZActivationScheduler:
+    """Keeps nfz_index in step with the time windows of restricted zones.
+
+    Every enabled zone, whether current or upcoming, is held compiled and is
+    stored in an interval tree keyed by its window. A min-heap of window
+    boundaries wakes the scheduler exactly when a zone starts or stops
+    applying, and only that zone is swapped in or out of the live index.
+
+    Zone edits are applied on the worker that took the request and announced
+    with ``changed``; the other workers re-read the zones named on the event
+    bus, so every worker's index follows every edit.
+    """
+
+    def __init__(self):
+        self.zones: Dict[int, CompiledZone] = {}
+        self.windows = IntervalTree()
+        self._boundaries: List[Tuple[datetime, int]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._events_task: Optional[asyncio.Task] = None
+
+    # Loading and edits
+
+    def load(self, db: Session) -> None:
+        now = datetime.now(timezone.utc)
+        rows = (
+            db.execute(
+                select(RestrictedZone).where(
+                    and_(
+                        RestrictedZone.is_active == True,
+                        or_(
+                            RestrictedZone.active_until.is_(None),
+                            RestrictedZone.active_until > now,
+                        ),
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        self.zones = {}
+        self.windows = IntervalTree()
+        self._boundaries = []
+        for row in rows:
+            self._track(CompiledZone.from_model(row))
+        nfz_index.replace(zone for zone in self.zones.values() if zone.active_at(now))
+        self._poke()
+
+    def upsert(self, zone: RestrictedZone) -> Optional[CompiledZone]:
+        """Apply a created or edited zone; returns the compiled state it replaced."""
+        previous = self.zones.get(zone.id)
+        if not zone.is_active or zone.deleted_at is not None:
+            self.remove(zone.id)
+            return previous
+        self._track(CompiledZone.from_model(zone))
+        self._sync(zone.id, datetime.now(timezone.utc))
+        self._poke()
+        return previous
+
+    def remove(self, zone_id: int) -> Optional[CompiledZone]:
+        previous = self.zones.pop(zone_id, None)
+        self.windows.remove(zone_id)
+        if zone_id in nfz_index.zones:
+            nfz_index.remove(zone_id)
+        return previous
+
+    def changed(self, zone_id: int) -> None:
+        """Tell the other workers to re-read a zone this worker just applied."""
+        event_bus.publish(
+            RESTRICTED_ZONES, {"zone_id": zone_id, "origin": event_bus.origin}
+        )
+
+    @staticmethod
+    def _read_zones(zone_ids: Iterable[int]) -> Dict[int, Optional[RestrictedZone]]:
+        zone_ids = list(zone_ids)
+        db = BackgroundSessionLocal()
+        try:
+            rows = (
+                db.execute(
+                    select(RestrictedZone)
+                    .where(RestrictedZone.id.in_(zone_ids))
+                    .execution_options(include_deleted=True)
+                )
+                .scalars()
+                .all()
+            )
+            db.expunge_all()
+        finally:
+            db.close()
+        zones: Dict[int, Optional[RestrictedZone]] = dict.fromkeys(zone_ids)
+        zones.update((row.id, row) for row in rows)
+        return zones
+
+    def _track(self, zone: CompiledZone) -> None:
+        self.zones[zone.zone_id] = zone
+        self.windows.add(
+            zone.zone_id, zone.active_from or DAWN, zone.active_until or FOREVER
+        )
+        now = datetime.now(timezone.utc)
+        for boundary in (zone.active_from, zone.active_until):
+            if boundary is not None and boundary > now:
+                heapq.heappush(self._boundaries, (boundary, zone.zone_id))
+
+    def _sync(self, zone_id: int, now: datetime) -> None:
+        zone = self.zones.get(zone_id)
+        live = zone_id in nfz_index.zones
+        if zone is not None and zone.active_at(now):
+            if not live or nfz_index.zones[zone_id] is not zone:
+                nfz_index.upsert(zone)
+                zone_switches.inc(action="activate")
+        elif live:
+            nfz_index.remove(zone_id)
+            zone_switches.inc(action="deactivate")
+        if (
+            zone is not None
+            and zone.active_until is not None
+            and zone.active_until <= now
+        ):
+            # Expired for good; nothing will bring it back without an edit.
+            del self.zones[zone_id]
+            self.windows.remove(zone_id)
+
+    # Queries
+
+    def zones_for_window(self, start: datetime, end: datetime) -> List[CompiledZone]:
+        """Enabled zones whose activity window overlaps ``[start, end)``."""
+        return [self.zones[i] for i in self.windows.overlapping(start, end)]
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        subscription = event_bus.subscribe({RESTRICTED_ZONES})
+
+        async def follow_zone_changes():
+            try:
+                while True:
+                    zone_ids: Set[int] = set()
+                    event = await subscription.get()
+                    while True:
+                        data = event["data"]
+                        if data.get("origin") != event_bus.origin:
+                            try:
+                                zone_ids.add(int(data["zone_id"]))
+                            except (KeyError, TypeError, ValueError):
+                                pass
+                        if subscription.queue.empty():
+                            break
+                        event = subscription.queue.get_nowait()
+                    if not zone_ids:
+                        continue
+                    try:
+                        zones = await asyncio.to_thread(self._read_zones, zone_ids)
+                    except Exception as e:
+                        print(f"NFZ scheduler: could not re-read zones: {e}")
+                        continue
+                    for zone_id, zone in zones.items():
+                        if zone is None:
+                            self.remove(zone_id)
+                        else:
+                            self.upsert(zone)
+            finally:
+                subscription.close()
+
+        self._events_task = asyncio.create_task(follow_zone_changes())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._events_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = self._events_task = None
+
+    def _poke(self) -> None:
+        # Edits can move the next boundary earlier; re-arm the timer.
+        if self._wake is None or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._boundaries:
+                delay = self._boundaries[0][0] - datetime.now(timezone.utc)
+                timeout = max(delay.total_seconds(), 0.0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            now = datetime.now(timezone.utc)
+            due = set()
+            while self._boundaries and self._boundaries[0][0] <= now:
+                due.add(heapq.heappop(self._boundaries)[1])
+            for zone_id in due:
+                self._sync(zone_id, now)
+
+
+nfz_scheduler = NFZActivationScheduler()
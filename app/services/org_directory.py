@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.organization import Organization
+from app.schemas.auth import OrganizationResponse
+from app.services.event_bus import ORGANIZATIONS, event_bus
+
+# Distinct (skip, limit) pages kept serialized per directory version.
+MAX_CACHED_PAGES = 64
+
+directory_requests = metrics.counter(
+    "utm_org_directory_requests_total",
+    "Organization directory requests, by how they were answered",
+    ["result"],
+)
+
+_organizations_json = TypeAdapter(List[OrganizationResponse])
+
+Page = Tuple[bytes, str]  # JSON body, ETag
+
+
+class OrganizationDirectory:
+    """Serialized pages of the active organizations, ready to send.
+
+    A page is built from the database once and then served as stored bytes,
+    with an ETag derived from its content, so every worker hands out the
+    same tag for the same list and ``If-None-Match`` gets a 304 anywhere.
+    Organization writes call ``invalidate``, which also tells the other
+    workers over the event bus; ORG_DIRECTORY_MAX_AGE_SECONDS bounds how
+    stale a page can get if such an event is lost.
+    """
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self.pages: "OrderedDict[Tuple[int, int], Page]" = OrderedDict()
+        self.version = 0
+        self._built_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def page(self, db: Session, skip: int, limit: int) -> Tuple[Page, bool]:
+        """The page's body and ETag, and whether it came from memory."""
+        if time.monotonic() - self._built_at > self.max_age_seconds:
+            self._clear()
+        key = (skip, limit)
+        cached = self.pages.get(key)
+        if cached is not None:
+            self.pages.move_to_end(key)
+            return cached, True
+
+        version = self.version
+        organizations = (
+            db.execute(
+                select(Organization)
+                .order_by(Organization.id)
+                .offset(skip)
+                .limit(limit)
+                .execution_options(active_only=True)
+            )
+            .scalars()
+            .all()
+        )
+        body = _organizations_json.dump_json(
+            [OrganizationResponse.model_validate(o) for o in organizations]
+        )
+        page = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        # Skip storing if an invalidation arrived while this page was read.
+        if version == self.version:
+            if not self.pages:
+                self._built_at = time.monotonic()
+            self.pages[key] = page
+            while len(self.pages) > MAX_CACHED_PAGES:
+                self.pages.popitem(last=False)
+        return page, False
+
+    def _clear(self) -> None:
+        self.version += 1
+        self.pages.clear()
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """Drop every page here and on the other workers."""
+        self._clear()
+        event_bus.publish(ORGANIZATIONS, {"organization_id": organization_id})
+
+    async def start(self) -> None:
+        subscription = event_bus.subscribe({ORGANIZATIONS})
+
+        async def follow_changes():
+            try:
+                while True:
+                    await subscription.get()
+                    self._clear()
+            finally:
+                subscription.close()
+
+        self._task = asyncio.create_task(follow_changes())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+org_directory = OrganizationDirectory(settings.ORG_DIRECTORY_MAX_AGE_SECONDS)
@@ -0,0 +1,125 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import generate_refresh_token, hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+refreshes = metrics.counter(
+    "utm_auth_token_refreshes_total",
+    "Refresh token exchanges, by outcome",
+    ["outcome"],
+)
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class RefreshTokenService:
+    """Long-lived, single-use refresh tokens.
+
+    Each exchange revokes the presented token and issues its successor in the
+    same family. Presenting a token that was already rotated means it was
+    copied, so the whole family is revoked and the user has to log in again.
+    """
+
+    def issue(self, db: Session, user: User, family_id: Optional[str] = None) -> str:
+        token = generate_refresh_token()
+        db.add(
+            RefreshToken(
+                user_id=user.id,
+                token_hash=hash_refresh_token(token),
+                family_id=family_id or secrets.token_hex(16),
+                expires_at=datetime.now(timezone.utc)
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        return token
+
+    def rotate(self, db: Session, token: str) -> Optional[Tuple[User, str]]:
+        """Exchange a refresh token for its successor; None if it is not valid.
+
+        Commits either way, so a detected reuse stays revoked.
+        """
+        row = db.execute(
+            select(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(token))
+            .with_for_update()
+        ).scalar_one_or_none()
+        now = datetime.now(timezone.utc)
+        if row is None:
+            refreshes.inc(outcome="unknown")
+            return None
+        if row.revoked_at is not None:
+            if row.rotated_at is not None:
+                self.revoke_family(db, row.family_id)
+                db.commit()
+                refreshes.inc(outcome="reused")
+            else:
+                refreshes.inc(outcome="revoked")
+            return None
+        if _aware(row.expires_at) <= now:
+            refreshes.inc(outcome="expired")
+            return None
+        user = db.get(User, row.user_id)
+        if user is None or not user.is_active:
+            refreshes.inc(outcome="inactive")
+            return None
+
+        row.revoked_at = now
+        row.rotated_at = now
+        successor = self.issue(db, user, family_id=row.family_id)
+        db.commit()
+        refreshes.inc(outcome="rotated")
+        return user, successor
+
+    def revoke(self, db: Session, token: str) -> bool:
+        """Revoke the family a token belongs to (logout on one device)."""
+        family_id = db.execute(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(token)
+            )
+        ).scalar_one_or_none()
+        if family_id is None:
+            return False
+        self.revoke_family(db, family_id)
+        db.commit()
+        return True
+
+    @staticmethod
+    def revoke_family(db: Session, family_id: str) -> None:
+        db.execute(
+            update(RefreshToken)
+            .where(
+                and_(
+                    RefreshToken.family_id == family_id,
+                    RefreshToken.revoked_at.is_(None),
+                )
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+
+    @staticmethod
+    def revoke_user(db: Session, user: User) -> None:
+        """Revoke every refresh token of a user (logout everywhere)."""
+        db.execute(
+            update(RefreshToken)
+            .where(
+                and_(
+                    RefreshToken.user_id == user.id,
+                    RefreshToken.revoked_at.is_(None),
+                )
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+
+
+refresh_tokens = RefreshTokenService()
@@ -0,0 +1,680 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.restricted_zone import NFZGeometryType
+from app.services.nfz_geometry import (
+    METERS_PER_DEGREE,
+    CompiledZone,
+    haversine_m,
+    nfz_index,
+)
+
+CIRCLE_SEGMENTS = 12
+# Edges crossing more zones than this are kept out of the search: they are
+# only usable at altitudes clear of all of them, where the direct line usually
+# is too. They are set aside rather than forgotten, so removing zones can
+# bring them back.
+MAX_BLOCKERS = 2
+# After this many incremental patches the graph is rebuilt from scratch.
+REBUILD_AFTER_PATCHES = 100
+EPS = 1e-6
+# Beyond this the shared plane's east-west scale is off by a few percent and
+# the graph is rebuilt around a new origin.
+FRAME_MAX_LAT_OFFSET = 2.0
+
+graph_patches = metrics.counter(
+    "utm_route_planner_graph_patches_total",
+    "Visibility graph updates after restricted zone changes",
+    ["kind"],
+)
+query_seconds = metrics.summary(
+    "utm_route_planner_query_seconds", "Time spent answering route queries"
+)
+
+
+class NoRouteError(ValueError):
+    pass
+
+
+class _Frame:
+    """Equirectangular plane shared by every obstacle in one graph."""
+
+    def __init__(self, lat0: float, lon0: float):
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.ky = METERS_PER_DEGREE
+        self.kx = METERS_PER_DEGREE * math.cos(math.radians(lat0))
+
+    def to_xy(self, lats, lons):
+        return (
+            np.subtract(lons, self.lon0) * self.kx,
+            np.subtract(lats, self.lat0) * self.ky,
+        )
+
+    def to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+        return self.lat0 + y / self.ky, self.lon0 + x / self.kx
+
+    def fits(self, zone: CompiledZone) -> bool:
+        """Whether the zone is close enough to the frame origin for its scale."""
+        return abs(zone.lat0 - self.lat0) <= FRAME_MAX_LAT_OFFSET
+
+
+def _convex_hull(points: np.ndarray) -> np.ndarray:
+    """Counter-clockwise hull of (n, 2) points (Andrew's monotone chain)."""
+    pts = sorted(set(map(tuple, points.tolist())))
+    if len(pts) < 3:
+        return np.asarray(pts, dtype=float)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: List[tuple] = []
+    for p in pts:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper: List[tuple] = []
+    for p in reversed(pts):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return np.asarray(lower[:-1] + upper[:-1], dtype=float)
+
+
+class _Obstacle:
+    """A zone as a buffered convex polygon in the graph frame."""
+
+    def __init__(self, zone: CompiledZone, frame: _Frame, buffer_m: float):
+        self.zone = zone
+        self.zone_id = zone.zone_id
+        if zone.geometry_type == NFZGeometryType.CIRCLE:
+            # Circumscribed polygon, so the circle is fully inside it.
+            angles = np.linspace(0, 2 * np.pi, CIRCLE_SEGMENTS, endpoint=False)
+            r = math.sqrt(zone.radius_sq) / math.cos(math.pi / CIRCLE_SEGMENTS)
+            local_x, local_y = r * np.cos(angles), r * np.sin(angles)
+        else:
+            local_x, local_y = zone.xs, zone.ys
+        lats = zone.lat0 + np.asarray(local_y) / zone.ky
+        lons = zone.lon0 + np.asarray(local_x) / zone.kx
+        x, y = frame.to_xy(lats, lons)
+        ring = _convex_hull(np.column_stack([x, y]))
+
+        # Miter offset of every hull vertex keeps the polygon convex.
+        dx = np.roll(ring[:, 0], -1) - ring[:, 0]
+        dy = np.roll(ring[:, 1], -1) - ring[:, 1]
+        length = np.hypot(dx, dy)
+        nx, ny = dy / length, -dx / length  # Outward normals of a CCW ring
+        pnx, pny = np.roll(nx, 1), np.roll(ny, 1)
+        scale = buffer_m / np.maximum(1 + nx * pnx + ny * pny, 0.1)
+        self.xs = ring[:, 0] + (nx + pnx) * scale
+        self.ys = ring[:, 1] + (ny + pny) * scale
+
+        dx = np.roll(self.xs, -1) - self.xs
+        dy = np.roll(self.ys, -1) - self.ys
+        length = np.hypot(dx, dy)
+        self.nx, self.ny = dy / length, -dx / length
+        self.offsets = self.nx * self.xs + self.ny * self.ys
+        self.min_x, self.max_x = float(self.xs.min()), float(self.xs.max())
+        self.min_y, self.max_y = float(self.ys.min()), float(self.ys.max())
+        self.node_ids: List[int] = []
+
+    def applies_at(self, altitude_m: float) -> bool:
+        return bool(self.zone.in_altitude_band(np.array([altitude_m]))[0])
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Points strictly inside the buffered polygon."""
+        inside = (
+            np.outer(x, self.nx) + np.outer(y, self.ny) < self.offsets[None, :] - EPS
+        )
+        return inside.all(axis=1)
+
+    def blocks(
+        self, ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray
+    ) -> np.ndarray:
+        """Segments passing through the polygon interior (touching is allowed).
+
+        Separating axis test: a segment misses a convex polygon iff one of the
+        polygon's edge normals or the segment's own normal separates them.
+        """
+        blocked = np.zeros(ax.shape, dtype=bool)
+        near = ~(
+            (np.maximum(ax, bx) < self.min_x)
+            | (np.minimum(ax, bx) > self.max_x)
+            | (np.maximum(ay, by) < self.min_y)
+            | (np.minimum(ay, by) > self.max_y)
+        )
+        idx = np.nonzero(near)[0]
+        if idx.size == 0:
+            return blocked
+        ax, ay, bx, by = ax[idx], ay[idx], bx[idx], by[idx]
+        limit = self.offsets[None, :] - EPS
+        a_out = np.outer(ax, self.nx) + np.outer(ay, self.ny) >= limit
+        b_out = np.outer(bx, self.nx) + np.outer(by, self.ny) >= limit
+        separated = (a_out & b_out).any(axis=1)
+
+        mx, my = ay - by, bx - ax
+        tolerance = EPS * np.hypot(mx, my)[:, None]
+        side = (
+            np.outer(mx, self.xs) + np.outer(my, self.ys) - (mx * ax + my * ay)[:, None]
+        )
+        separated |= (side >= -tolerance).all(axis=1)
+        separated |= (side <= tolerance).all(axis=1)
+        blocked[idx] = ~separated
+        return blocked
+
+
+class _ObstacleArrays:
+    """Every obstacle's edges padded into (obstacles, corners) arrays.
+
+    Lets one vectorized pass test many segments against many polygons at once
+    instead of looping over obstacles in Python.
+    """
+
+    def __init__(self, obstacles: List[_Obstacle]):
+        self.zone_ids = np.array([o.zone_id for o in obstacles], dtype=np.int64)
+        width = max((len(o.xs) for o in obstacles), default=1)
+
+        def padded(attr: str) -> np.ndarray:
+            out = np.zeros((len(obstacles), width))
+            for i, o in enumerate(obstacles):
+                values = getattr(o, attr)
+                out[i, : len(values)] = values
+                out[i, len(values) :] = values[0]  # Repeats are harmless here
+            return out
+
+        self.nx, self.ny, self.offsets = padded("nx"), padded("ny"), padded("offsets")
+        self.vx, self.vy = padded("xs"), padded("ys")
+        self.cx = self.vx.mean(axis=1) if len(obstacles) else np.zeros(0)
+        self.cy = self.vy.mean(axis=1) if len(obstacles) else np.zeros(0)
+        self.radius = (
+            np.hypot(self.vx - self.cx[:, None], self.vy - self.cy[:, None]).max(axis=1)
+            if len(obstacles)
+            else np.zeros(0)
+        )
+        self.min_x = np.array([o.min_x for o in obstacles])
+        self.max_x = np.array([o.max_x for o in obstacles])
+        self.min_y = np.array([o.min_y for o in obstacles])
+        self.max_y = np.array([o.max_y for o in obstacles])
+
+    def _near(self, min_x, max_x, min_y, max_y, subset):
+        near = (
+            (max_x[:, None] >= self.min_x[None, :])
+            & (min_x[:, None] <= self.max_x[None, :])
+            & (max_y[:, None] >= self.min_y[None, :])
+            & (min_y[:, None] <= self.max_y[None, :])
+        )
+        if subset is not None:
+            near &= subset[None, :]
+        return np.nonzero(near)
+
+    def crossings(self, ax, ay, bx, by, subset: Optional[np.ndarray] = None):
+        """(segment, obstacle) index pairs where a segment enters an interior.
+
+        Same separating axis test as _Obstacle.blocks, over all pairs whose
+        bounding boxes overlap.
+        """
+        si, oj = self._near(
+            np.minimum(ax, bx),
+            np.maximum(ax, bx),
+            np.minimum(ay, by),
+            np.maximum(ay, by),
+            subset,
+        )
+        if si.size == 0:
+            return si, oj
+        # Cheap reject first: segments passing clear of the bounding circle.
+        pax, pay, pbx, pby = ax[si], ay[si], bx[si], by[si]
+        dx, dy = pbx - pax, pby - pay
+        length_sq = np.maximum(dx * dx + dy * dy, EPS)
+        t = np.clip(
+            ((self.cx[oj] - pax) * dx + (self.cy[oj] - pay) * dy) / length_sq, 0.0, 1.0
+        )
+        near = np.hypot(pax + t * dx - self.cx[oj], pay + t * dy - self.cy[oj]) < (
+            self.radius[oj]
+        )
+        si, oj = si[near], oj[near]
+        pax, pay, pbx, pby = pax[near], pay[near], pbx[near], pby[near]
+        nx, ny, limit = self.nx[oj], self.ny[oj], self.offsets[oj] - EPS
+        a_out = pax[:, None] * nx + pay[:, None] * ny >= limit
+        b_out = pbx[:, None] * nx + pby[:, None] * ny >= limit
+        separated = (a_out & b_out).any(axis=1)
+        mx, my = pay - pby, pbx - pax
+        tolerance = EPS * np.hypot(mx, my)[:, None]
+        side = (
+            mx[:, None] * self.vx[oj]
+            + my[:, None] * self.vy[oj]
+            - (mx * pax + my * pay)[:, None]
+        )
+        separated |= (side >= -tolerance).all(axis=1)
+        separated |= (side <= tolerance).all(axis=1)
+        return si[~separated], oj[~separated]
+
+    def containing(self, xs, ys):
+        """(point, obstacle) index pairs with the point strictly inside."""
+        pi, oj = self._near(xs, xs, ys, ys, None)
+        if pi.size == 0:
+            return pi, oj
+        inside = (
+            xs[pi][:, None] * self.nx[oj] + ys[pi][:, None] * self.ny[oj]
+            < self.offsets[oj] - EPS
+        ).all(axis=1)
+        return pi[inside], oj[inside]
+
+
+class _NodeArrays:
+    def __init__(self, nodes: Dict[int, "_Node"]):
+        self.ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        values = list(nodes.values())
+        self.xs = np.array([n.x for n in values], dtype=float)
+        self.ys = np.array([n.y for n in values], dtype=float)
+        self.px = np.array([n.px for n in values], dtype=float)
+        self.py = np.array([n.py for n in values], dtype=float)
+        self.qx = np.array([n.qx for n in values], dtype=float)
+        self.qy = np.array([n.qy for n in values], dtype=float)
+        self.position = {node_id: i for i, node_id in enumerate(self.ids.tolist())}
+
+    def tangent_from(self, x: float, y: float) -> np.ndarray:
+        """Whether the line from (x, y) to each corner grazes that corner's polygon."""
+        dx, dy = self.xs - x, self.ys - y
+        s1 = dx * (self.py - self.ys) - dy * (self.px - self.xs)
+        s2 = dx * (self.qy - self.ys) - dy * (self.qx - self.xs)
+        return s1 * s2 >= -EPS
+
+
+class _Node:
+    __slots__ = ("x", "y", "zone_id", "px", "py", "qx", "qy")
+
+    def __init__(self, x, y, zone_id, px, py, qx, qy):
+        self.x, self.y, self.zone_id = x, y, zone_id
+        self.px, self.py, self.qx, self.qy = px, py, qx, qy  # Ring neighbours
+
+
+class VisibilityGraph:
+    """Reduced visibility graph over buffered zone polygons.
+
+    Only bitangent edges are kept, since a shortest path can only bend around
+    a convex corner. Each edge remembers which zones it passes through,
+    so one graph serves every altitude. A query only ignores the edges
+    blocked by zones that apply at the requested altitude.
+    """
+
+    def __init__(self, frame: _Frame, buffer_m: float):
+        self.frame = frame
+        self.buffer_m = buffer_m
+        self.obstacles: Dict[int, _Obstacle] = {}
+        self.nodes: Dict[int, _Node] = {}
+        self.adj: Dict[int, Dict[int, Tuple[float, Tuple[int, ...]]]] = {}
+        self.inside: Dict[int, Set[int]] = {}  # corner -> other zones covering it
+        # (u, v) with u < v -> (length, blockers) for edges past MAX_BLOCKERS.
+        self.overblocked: Dict[Tuple[int, int], Tuple[float, Tuple[int, ...]]] = {}
+        self.patches = 0
+        self._ids = itertools.count()
+        self._node_arrays: Optional[_NodeArrays] = None
+        self._obstacle_arrays: Optional[_ObstacleArrays] = None
+
+    @property
+    def node_arrays(self) -> _NodeArrays:
+        if self._node_arrays is None:
+            self._node_arrays = _NodeArrays(self.nodes)
+        return self._node_arrays
+
+    @property
+    def obstacle_arrays(self) -> _ObstacleArrays:
+        if self._obstacle_arrays is None:
+            self._obstacle_arrays = _ObstacleArrays(list(self.obstacles.values()))
+        return self._obstacle_arrays
+
+    # Building and incremental maintenance
+
+    def add_zones(self, zones) -> None:
+        """Bulk build: place every polygon first, then link each corner once."""
+        for zone in zones:
+            self._add_corners(_Obstacle(zone, self.frame, self.buffer_m))
+        self._mark_covered_corners()
+        for node_id in list(self.nodes):
+            self._connect(node_id, later_only=True)
+
+    def add_zone(self, zone: CompiledZone) -> None:
+        """Patch one zone in: cut the edges it blocks, then link its corners."""
+        obstacle = _Obstacle(zone, self.frame, self.buffer_m)
+        arrays = self.node_arrays
+        pairs = [(u, v) for u, edges in self.adj.items() for v in edges if u < v]
+        pairs.extend(self.overblocked)
+        if pairs:
+            ui = np.array([arrays.position[u] for u, _ in pairs])
+            vi = np.array([arrays.position[v] for _, v in pairs])
+            hit = obstacle.blocks(
+                arrays.xs[ui], arrays.ys[ui], arrays.xs[vi], arrays.ys[vi]
+            )
+            for k in np.nonzero(hit)[0].tolist():
+                u, v = pairs[k]
+                if (u, v) in self.overblocked:
+                    weight, blockers = self.overblocked[(u, v)]
+                    self.overblocked[(u, v)] = (weight, blockers + (zone.zone_id,))
+                    continue
+                weight, blockers = self.adj[u][v]
+                entry = (weight, blockers + (zone.zone_id,))
+                if len(blockers) >= MAX_BLOCKERS:
+                    self.adj[u].pop(v)
+                    self.adj[v].pop(u)
+                    self.overblocked[(u, v)] = entry
+                else:
+                    self.adj[u][v] = self.adj[v][u] = entry
+        self._add_corners(obstacle)
+        self._mark_covered_corners()
+        for node_id in obstacle.node_ids:
+            self._connect(node_id)
+
+    def remove_zone(self, zone_id: int) -> None:
+        obstacle = self.obstacles.pop(zone_id, None)
+        if obstacle is None:
+            return
+        removed = set(obstacle.node_ids)
+        for node_id in obstacle.node_ids:
+            for other in self.adj.pop(node_id, {}):
+                self.adj[other].pop(node_id, None)
+            self.nodes.pop(node_id, None)
+            self.inside.pop(node_id, None)
+        for zones in self.inside.values():
+            zones.discard(zone_id)
+        for edges in self.adj.values():
+            for v, (weight, blockers) in list(edges.items()):
+                if zone_id in blockers:
+                    edges[v] = (weight, tuple(b for b in blockers if b != zone_id))
+        for (u, v), (weight, blockers) in list(self.overblocked.items()):
+            if u in removed or v in removed:
+                del self.overblocked[(u, v)]
+            elif zone_id in blockers:
+                entry = (weight, tuple(b for b in blockers if b != zone_id))
+                if len(entry[1]) <= MAX_BLOCKERS:
+                    del self.overblocked[(u, v)]
+                    self.adj[u][v] = self.adj[v][u] = entry
+                else:
+                    self.overblocked[(u, v)] = entry
+        self._node_arrays = self._obstacle_arrays = None
+
+    def _add_corners(self, obstacle: _Obstacle) -> None:
+        self.obstacles[obstacle.zone_id] = obstacle
+        ring = np.column_stack([obstacle.xs, obstacle.ys]).tolist()
+        for i, (x, y) in enumerate(ring):
+            px, py = ring[i - 1]
+            qx, qy = ring[(i + 1) % len(ring)]
+            node_id = next(self._ids)
+            self.nodes[node_id] = _Node(x, y, obstacle.zone_id, px, py, qx, qy)
+            self.adj[node_id] = {}
+            obstacle.node_ids.append(node_id)
+        self._node_arrays = self._obstacle_arrays = None
+
+    def _mark_covered_corners(self) -> None:
+        arrays = self.node_arrays
+        pi, oj = self.obstacle_arrays.containing(arrays.xs, arrays.ys)
+        zone_ids = self.obstacle_arrays.zone_ids
+        self.inside = {}
+        for node_id, zone_id in zip(arrays.ids[pi].tolist(), zone_ids[oj].tolist()):
+            if self.nodes[node_id].zone_id != zone_id:
+                self.inside.setdefault(node_id, set()).add(zone_id)
+
+    def _connect(self, node_id: int, later_only: bool = False) -> None:
+        node = self.nodes[node_id]
+        arrays = self.node_arrays
+        keep = (arrays.ids > node_id) if later_only else (arrays.ids != node_id)
+        keep &= arrays.tangent_from(node.x, node.y)
+        # The line must graze this corner's own polygon as well.
+        dx, dy = arrays.xs - node.x, arrays.ys - node.y
+        s1 = dx * (node.py - node.y) - dy * (node.px - node.x)
+        s2 = dx * (node.qy - node.y) - dy * (node.qx - node.x)
+        keep &= s1 * s2 >= -EPS
+        idx = np.nonzero(keep)[0]
+        if idx.size == 0:
+            return
+        tx, ty = arrays.xs[idx], arrays.ys[idx]
+        ax, ay = np.full(idx.size, node.x), np.full(idx.size, node.y)
+        si, oj = self.obstacle_arrays.crossings(ax, ay, tx, ty)
+        counts = np.bincount(si, minlength=idx.size)
+        blockers: Dict[int, Tuple[int, ...]] = {}
+        for k, zone_id in zip(si.tolist(), self.obstacle_arrays.zone_ids[oj].tolist()):
+            blockers[k] = blockers.get(k, ()) + (zone_id,)
+        lengths = np.hypot(tx - node.x, ty - node.y).tolist()
+        targets = arrays.ids[idx].tolist()
+        for k, count in enumerate(counts.tolist()):
+            entry = (lengths[k], blockers.get(k, ()))
+            target = targets[k]
+            if count <= MAX_BLOCKERS:
+                self.adj[node_id][target] = entry
+                self.adj[target][node_id] = entry
+            else:
+                self.overblocked[(min(node_id, target), max(node_id, target))] = entry
+
+    # Queries
+
+    def shortest_path(
+        self,
+        start: Tuple[float, float],
+        goal: Tuple[float, float],
+        applicable: Set[int],
+    ) -> Tuple[List[Tuple[float, float]], List[int]]:
+        """A* from start to goal in the graph frame, avoiding ``applicable`` zones.
+
+        Returns the path and the zones whose corners it bends around.
+        """
+        obstacle_arrays = self.obstacle_arrays
+        subset = np.isin(obstacle_arrays.zone_ids, list(applicable))
+        sx, sy = start
+        gx, gy = goal
+        pi, oj = obstacle_arrays.containing(np.array([sx, gx]), np.array([sy, gy]))
+        for k in range(pi.size):
+            if subset[oj[k]]:
+                zone = self.obstacles[int(obstacle_arrays.zone_ids[oj[k]])].zone
+                raise NoRouteError(
+                    f"Start or end is within {self.buffer_m:g} m of restricted "
+                    f"zone '{zone.name}'"
+                )
+        si, _ = obstacle_arrays.crossings(
+            np.array([sx]), np.array([sy]), np.array([gx]), np.array([gy]), subset
+        )
+        if si.size == 0:
+            return [start, goal], []
+
+        arrays = self.node_arrays
+        usable = np.ones(arrays.ids.size, dtype=bool)
+        for node_id, zones in self.inside.items():
+            if zones & applicable:
+                usable[arrays.position[node_id]] = False
+
+        def links(px: float, py: float) -> Dict[int, float]:
+            idx = np.nonzero(usable & arrays.tangent_from(px, py))[0]
+            ax, ay = np.full(idx.size, px), np.full(idx.size, py)
+            si, _ = obstacle_arrays.crossings(
+                ax, ay, arrays.xs[idx], arrays.ys[idx], subset
+            )
+            free = np.delete(idx, np.unique(si))
+            lengths = np.hypot(arrays.xs[free] - px, arrays.ys[free] - py)
+            return dict(zip(arrays.ids[free].tolist(), lengths.tolist()))
+
+        from_start = links(sx, sy)
+        to_goal = links(gx, gy)
+        blocked_nodes = set(arrays.ids[~usable].tolist())
+
+        START, GOAL = -1, -2
+        nodes = self.nodes
+        best = {START: 0.0}
+        parent: Dict[int, int] = {}
+        queue = [(math.hypot(gx - sx, gy - sy), 0.0, START)]
+        closed: Set[int] = set()
+        while queue:
+            _, cost, n = heapq.heappop(queue)
+            if n == GOAL:
+                break
+            if n in closed:
+                continue
+            closed.add(n)
+            if n == START:
+                neighbours = list(from_start.items())
+            else:
+                neighbours = [
+                    (m, weight)
+                    for m, (weight, blockers) in self.adj[n].items()
+                    if m not in blocked_nodes and not applicable.intersection(blockers)
+                ]
+                if n in to_goal:
+                    neighbours.append((GOAL, to_goal[n]))
+            for m, weight in neighbours:
+                new_cost = cost + weight
+                if new_cost < best.get(m, math.inf):
+                    best[m] = new_cost
+                    parent[m] = n
+                    if m == GOAL:
+                        h = 0.0
+                    else:
+                        h = math.hypot(gx - nodes[m].x, gy - nodes[m].y)
+                    heapq.heappush(queue, (new_cost + h, new_cost, m))
+        if GOAL not in parent:
+            raise NoRouteError("No route clear of restricted zones was found")
+
+        path = [goal]
+        corners: Set[int] = set()
+        n = parent[GOAL]
+        while n != START:
+            path.append((nodes[n].x, nodes[n].y))
+            corners.add(nodes[n].zone_id)
+            n = parent[n]
+        path.append(start)
+        return path[::-1], sorted(corners & applicable)
+
+
+class RoutePlanner:
+    """Suggests routes around active restricted zones.
+
+    The visibility graph is built once from nfz_index. When the index
+    version moves, only the zones that were added, changed or removed are
+    patched in or out. A full rebuild (after many patches, or when a zone
+    falls outside the graph's frame) runs on a background thread; queries
+    keep using the previous graph until the new one is swapped in, and the
+    final conflict check in ``plan`` catches anything it is missing.
+    """
+
+    def __init__(self, buffer_m: float):
+        self.buffer_m = buffer_m
+        self._graph: Optional[VisibilityGraph] = None
+        self._version = -1
+        self._lock = threading.Lock()
+        self._rebuilding: Optional[threading.Thread] = None
+
+    def refresh(self) -> VisibilityGraph:
+        with self._lock:
+            version = nfz_index.version
+            zones = dict(nfz_index.zones)
+            graph = self._graph
+            if graph is None:
+                graph = self._build(zones)
+                graph_patches.inc(kind="rebuild")
+            elif version != self._version:
+                if any(not graph.frame.fits(zone) for zone in zones.values()):
+                    # Can't be patched in; serve the old graph meanwhile.
+                    self._rebuild_in_background()
+                    return graph
+                for zone_id, obstacle in list(graph.obstacles.items()):
+                    if zones.get(zone_id) is not obstacle.zone:
+                        graph.remove_zone(zone_id)
+                        graph.patches += 1
+                        graph_patches.inc(kind="remove")
+                for zone_id, zone in zones.items():
+                    if zone_id not in graph.obstacles:
+                        graph.add_zone(zone)
+                        graph.patches += 1
+                        graph_patches.inc(kind="add")
+                if graph.patches >= REBUILD_AFTER_PATCHES:
+                    self._rebuild_in_background()
+            self._graph = graph
+            self._version = version
+            return graph
+
+    def _rebuild_in_background(self) -> None:
+        if self._rebuilding is not None and self._rebuilding.is_alive():
+            return
+        self._rebuilding = threading.Thread(
+            target=self._rebuild, name="route-graph-rebuild", daemon=True
+        )
+        self._rebuilding.start()
+
+    def _rebuild(self) -> None:
+        version = nfz_index.version
+        zones = dict(nfz_index.zones)
+        try:
+            graph = self._build(zones)
+        except Exception as e:
+            print(f"Route planner: graph rebuild failed: {e}")
+            return
+        with self._lock:
+            # Changes made meanwhile are patched in by the next refresh.
+            self._graph = graph
+            self._version = version
+        graph_patches.inc(kind="rebuild")
+
+    def _build(self, zones: Dict[int, CompiledZone]) -> VisibilityGraph:
+        if zones:
+            lat0 = float(np.mean([z.lat0 for z in zones.values()]))
+            lon0 = float(np.mean([z.lon0 for z in zones.values()]))
+        else:
+            lat0 = lon0 = 0.0
+        graph = VisibilityGraph(_Frame(lat0, lon0), self.buffer_m)
+        graph.add_zones(zones.values())
+        return graph
+
+    def plan(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        altitude_m: float,
+    ) -> Tuple[List[Tuple[float, float]], List[int]]:
+        """Shortest (lat, lon) path from start to end clear of applicable zones.
+
+        Returns the path and the ids of zones whose buffer it had to avoid.
+        """
+        started = time.perf_counter()
+        graph = self.refresh()
+        with self._lock:
+            for point in (start, end):
+                zones = nfz_index.zones_at(point[0], point[1], altitude_m)
+                if zones:
+                    raise NoRouteError(
+                        f"Point {point} lies inside restricted zone '{zones[0].name}'"
+                    )
+            applicable = {
+                zone_id
+                for zone_id, obstacle in graph.obstacles.items()
+                if obstacle.applies_at(altitude_m)
+            }
+            frame = graph.frame
+            sx, sy = frame.to_xy(start[0], start[1])
+            gx, gy = frame.to_xy(end[0], end[1])
+            path_xy, avoided = graph.shortest_path(
+                (float(sx), float(sy)), (float(gx), float(gy)), applicable
+            )
+
+        path = [start] + [frame.to_latlon(x, y) for x, y in path_xy[1:-1]] + [end]
+        lats = [p[0] for p in path]
+        lons = [p[1] for p in path]
+        # The shared plane is approximate; confirm with each zone's own frame.
+        conflicts = nfz_index.path_conflicts(lats, lons, [altitude_m] * len(path))
+        if conflicts:
+            raise NoRouteError(
+                f"Suggested route still touches restricted zone '{conflicts[0].name}'"
+            )
+        query_seconds.observe(time.perf_counter() - started)
+        return path, avoided
+
+
+def path_length_m(path: List[Tuple[float, float]]) -> float:
+    return sum(haversine_m(a[0], a[1], b[0], b[1]) for a, b in zip(path, path[1:]))
+
+
+route_planner = RoutePlanner(settings.ROUTE_PLANNER_BUFFER_M)
@@ -0,0 +1,229 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.drone import Drone
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.telemetry_log import TelemetryLog
+
+# File layout (little-endian, every section 8-byte aligned):
+#   header   magic, version, flight plan id, point count, dictionary length
+#   columns  timestamp int64 (µs since epoch), latitude/longitude/altitude
+#            float64, speed/heading float32 (NaN = null), status uint16
+#            (index into the dictionary, 0xFFFF = null)
+#   footer   status dictionary as a UTF-8 JSON list
+MAGIC = b"UTMTLA01"
+HEADER = struct.Struct("<8sHHIQI4x")
+NO_STATUS = 0xFFFF
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_COLUMNS = (
+    ("timestamp_us", "q", 8),
+    ("latitude", "d", 8),
+    ("longitude", "d", 8),
+    ("altitude_m", "d", 8),
+    ("speed_mps", "f", 4),
+    ("heading_degrees", "f", 4),
+    ("status", "H", 2),
+)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class TelemetryArchive:
+    """Read-only, memory-mapped view of one archived flight."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.flight_plan_id, count, dict_len = HEADER.unpack_from(
+            self._map, 0
+        )
+        if magic != MAGIC or version != 1:
+            self.close()
+            raise ValueError(f"Not a telemetry archive: {path}")
+        self.count = count
+        self.columns: Dict[str, memoryview] = {}
+        view = memoryview(self._map)
+        offset = HEADER.size
+        for name, typecode, width in _COLUMNS:
+            size = count * width
+            self.columns[name] = view[offset : offset + size].cast(typecode)
+            offset = _aligned(offset + size)
+        self.status_dictionary: List[str] = json.loads(
+            bytes(view[offset : offset + dict_len]).decode("utf-8")
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "TelemetryArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Views must be released before the map can be closed.
+        for column in getattr(self, "columns", {}).values():
+            column.release()
+        self.columns = {}
+        self._map.close()
+        self._file.close()
+
+    def iter_points(self) -> Iterator[dict]:
+        c = self.columns
+        statuses = self.status_dictionary
+        for i in range(self.count):
+            speed = c["speed_mps"][i]
+            heading = c["heading_degrees"][i]
+            status_code = c["status"][i]
+            yield {
+                "timestamp": _EPOCH + timedelta(microseconds=c["timestamp_us"][i]),
+                "latitude": c["latitude"][i],
+                "longitude": c["longitude"][i],
+                "altitude_m": c["altitude_m"][i],
+                "speed_mps": None if speed != speed else speed,
+                "heading_degrees": None if heading != heading else heading,
+                "status_message": (
+                    None if status_code == NO_STATUS else statuses[status_code]
+                ),
+            }
+
+
+def write_archive(path: str, flight_plan_id: int, rows) -> int:
+    """Write (timestamp, lat, lon, alt, speed, heading, status) rows to ``path``."""
+    arrays = {name: array(typecode) for name, typecode, _ in _COLUMNS}
+    status_codes: Dict[str, int] = {}
+    nan = float("nan")
+    for timestamp, lat, lon, alt, speed, heading, status_message in rows:
+        arrays["timestamp_us"].append(_to_micros(timestamp))
+        arrays["latitude"].append(lat)
+        arrays["longitude"].append(lon)
+        arrays["altitude_m"].append(alt)
+        arrays["speed_mps"].append(nan if speed is None else speed)
+        arrays["heading_degrees"].append(nan if heading is None else heading)
+        if status_message is None:
+            arrays["status"].append(NO_STATUS)
+        else:
+            code = status_codes.setdefault(status_message, len(status_codes))
+            if code >= NO_STATUS:
+                raise ValueError("Too many distinct status messages to archive")
+            arrays["status"].append(code)
+
+    if sys.byteorder != "little":
+        for column in arrays.values():
+            column.byteswap()
+    dictionary = json.dumps(list(status_codes), separators=(",", ":")).encode("utf-8")
+    count = len(arrays["timestamp_us"])
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 1, 0, flight_plan_id, count, len(dictionary)))
+        for name, _, _ in _COLUMNS:
+            data = arrays[name].tobytes()
+            f.write(data)
+            f.write(b"\0" * (_aligned(len(data)) - len(data)))
+        f.write(dictionary)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)  # Readers never see a half-written archive.
+    return count
+
+
+class TelemetryArchiver:
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+
+    def archive_flight(
+        self, db: Session, *, flight_plan: FlightPlan, prune: bool = False
+    ) -> str:
+        """Pack a completed flight's telemetry into a columnar archive file.
+
+        Archiving is done once: for a flight that already has its archive the
+        existing path is returned (pruning the rows if asked), since the rows
+        may be gone and rewriting would leave an empty file.
+        """
+        # Row lock, so concurrent calls don't both see the flight unarchived.
+        db.refresh(flight_plan, with_for_update=True)
+        if flight_plan.status != FlightPlanStatus.COMPLETED:
+            raise ValueError("Only COMPLETED flights can be archived.")
+        if flight_plan.archived_at is not None:
+            if not flight_plan.archive_path or not os.path.exists(
+                flight_plan.archive_path
+            ):
+                raise ValueError("Flight was archived but its archive file is missing.")
+            if prune:
+                self._prune_rows(db, flight_plan)
+            db.commit()
+            return flight_plan.archive_path
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"flight_{flight_plan.id}.utmta")
+        rows = db.execute(
+            select(
+                TelemetryLog.timestamp,
+                TelemetryLog.latitude,
+                TelemetryLog.longitude,
+                TelemetryLog.altitude_m,
+                TelemetryLog.speed_mps,
+                TelemetryLog.heading_degrees,
+                TelemetryLog.status_message,
+            )
+            .where(TelemetryLog.flight_plan_id == flight_plan.id)
+            .order_by(TelemetryLog.timestamp)
+            .execution_options(yield_per=5000)
+        )
+        # The file takes its final name before anything is committed: until
+        # archived_at is set a stray file is harmless and the next attempt
+        # overwrites it, whereas pruned rows with no archive would be lost.
+        write_archive(path, flight_plan.id, rows)
+
+        flight_plan.archive_path = path
+        flight_plan.archived_at = datetime.now(timezone.utc)
+        if prune:
+            self._prune_rows(db, flight_plan)
+        db.commit()
+        return path
+
+    @staticmethod
+    def _prune_rows(db: Session, flight_plan: FlightPlan) -> None:
+        # Keep the row a drone points at as its last known position.
+        last_point_ids = select(Drone.last_telemetry_id).where(
+            Drone.last_telemetry_id.is_not(None)
+        )
+        db.execute(
+            delete(TelemetryLog).where(
+                and_(
+                    TelemetryLog.flight_plan_id == flight_plan.id,
+                    TelemetryLog.id.not_in(last_point_ids),
+                )
+            )
+        )
+
+    @staticmethod
+    def open(flight_plan: FlightPlan) -> Optional[TelemetryArchive]:
+        if not flight_plan.archive_path or not os.path.exists(flight_plan.archive_path):
+            return None
+        return TelemetryArchive(flight_plan.archive_path)
+
+
+telemetry_archiver = TelemetryArchiver(settings.TELEMETRY_ARCHIVE_DIR)
@@ -0,0 +1,98 @@
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+duplicates_dropped = metrics.counter(
+    "utm_telemetry_duplicates_total",
+    "Retransmitted telemetry points dropped, by where they were caught",
+    ["stage"],
+)
+out_of_order_points = metrics.counter(
+    "utm_telemetry_out_of_order_total",
+    "Telemetry points older than the newest point already seen for the drone",
+    ["window"],
+)
+metrics.gauge(
+    "utm_telemetry_dedup_drones",
+    "Drones with in-memory duplicate-suppression state",
+    callback=lambda: {(): len(telemetry_dedup._drones)},
+)
+
+
+class _DroneWindow:
+    __slots__ = ("high_water", "order", "keys")
+
+    def __init__(self):
+        self.high_water: Optional[datetime] = None
+        self.order: Deque[datetime] = deque()
+        self.keys: Set[datetime] = set()
+
+
+class TelemetryDeduplicator:
+    """Drops retransmitted ``(drone_id, timestamp)`` points before they hit the DB.
+
+    Each drone keeps a high-water mark (its newest stored timestamp) and a
+    bounded set of the timestamps stored within ``window`` of it, which covers
+    links that reorder packets. Anything older than the window is passed on,
+    and the unique constraint on telemetry_logs settles it. State is per
+    process and only records points after their transaction commits, so a
+    failed insert never hides the retransmission that would repair it.
+    """
+
+    def __init__(self, window: timedelta, max_keys: int):
+        self.window = window
+        self.max_keys = max_keys
+        self._drones: Dict[int, _DroneWindow] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, drone_id: int, timestamps: Iterable[datetime]) -> List[int]:
+        """Indexes of the points worth inserting, given time-ordered timestamps."""
+        keep: List[int] = []
+        batch: Set[datetime] = set()
+        with self._lock:
+            state = self._drones.get(drone_id)
+            for i, ts in enumerate(timestamps):
+                if ts in batch or (state is not None and ts in state.keys):
+                    duplicates_dropped.inc(stage="memory")
+                    continue
+                batch.add(ts)
+                keep.append(i)
+                if state is not None and state.high_water is not None:
+                    if ts < state.high_water - self.window:
+                        out_of_order_points.inc(window="outside")
+                    elif ts < state.high_water:
+                        out_of_order_points.inc(window="inside")
+        return keep
+
+    def record(self, drone_id: int, timestamps: Iterable[datetime]) -> None:
+        """Remember timestamps that are now committed."""
+        with self._lock:
+            state = self._drones.get(drone_id)
+            if state is None:
+                state = self._drones[drone_id] = _DroneWindow()
+            for ts in timestamps:
+                if state.high_water is None or ts > state.high_water:
+                    state.high_water = ts
+                elif ts < state.high_water - self.window:
+                    continue  # Too old to be worth a slot.
+                if ts not in state.keys:
+                    state.keys.add(ts)
+                    state.order.append(ts)
+            if state.high_water is None:
+                return
+            # Keys leave in arrival order; a reordered key may outlive the
+            # window briefly, but never the size bound.
+            floor = state.high_water - self.window
+            order, keys = state.order, state.keys
+            while order and (len(order) > self.max_keys or order[0] < floor):
+                keys.discard(order.popleft())
+
+
+telemetry_dedup = TelemetryDeduplicator(
+    timedelta(seconds=settings.TELEMETRY_DEDUP_WINDOW_SECONDS),
+    settings.TELEMETRY_DEDUP_MAX_KEYS,
+)
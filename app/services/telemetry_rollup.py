@@ -0,0 +1,241 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import dialect_insert
+from app.models.drone import Drone
+from app.models.telemetry_log import TelemetryLog
+from app.models.telemetry_rollup import (
+    DroneDailyTelemetryRollup,
+    FlightTelemetryRollup,
+    RollupColumnsMixin,
+)
+from app.services.nfz_geometry import haversine_legs_m
+
+
+class RollupPoints:
+    """Column view of a time-ordered run of telemetry points."""
+
+    def __init__(
+        self,
+        timestamps: Sequence[datetime],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        alts: Sequence[float],
+        speeds: Sequence[Optional[float]],
+        violations: Sequence[bool],
+        flight_plan_ids: Sequence[Optional[int]],
+    ):
+        self.timestamps = list(timestamps)
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.alts = np.asarray(alts, dtype=float)
+        self.speeds = np.array(
+            [np.nan if s is None else s for s in speeds], dtype=float
+        )
+        self.violations = np.asarray(violations, dtype=bool)
+        self.flight_plan_ids = list(flight_plan_ids)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def take(self, idx: List[int]) -> "RollupPoints":
+        return RollupPoints(
+            [self.timestamps[i] for i in idx],
+            self.lats[idx],
+            self.lons[idx],
+            self.alts[idx],
+            [None if np.isnan(s) else s for s in self.speeds[idx]],
+            self.violations[idx],
+            [self.flight_plan_ids[i] for i in idx],
+        )
+
+    def by_day(self) -> Dict[date, "RollupPoints"]:
+        groups: Dict[date, List[int]] = defaultdict(list)
+        for i, ts in enumerate(self.timestamps):
+            groups[_utc_day(ts)].append(i)
+        return {day: self.take(idx) for day, idx in sorted(groups.items())}
+
+
+def _utc_day(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def accumulate(row: RollupColumnsMixin, points: RollupPoints) -> None:
+    """Fold a run of points into a rollup row's running aggregates."""
+    if not len(points):
+        return
+    timestamps, flights = points.timestamps, points.flight_plan_ids
+    lats, lons = points.lats, points.lons
+    # Join onto the previous batch if it ended on the same flight, unless these
+    # points arrived out of order.
+    if (
+        row.last_timestamp is not None
+        and row.last_latitude is not None
+        and row.last_flight_plan_id == flights[0]
+        and timestamps[0] >= row.last_timestamp
+    ):
+        timestamps = [row.last_timestamp] + timestamps
+        flights = [row.last_flight_plan_id] + flights
+        lats = np.concatenate([[row.last_latitude], lats])
+        lons = np.concatenate([[row.last_longitude], lons])
+    distance = airborne = 0.0
+    if len(lats) > 1:
+        # Only legs within one flight count; a drone-day spanning two flights
+        # has no leg from where one landed to where the next took off.
+        same_flight = np.array(
+            [a == b for a, b in zip(flights, flights[1:])], dtype=bool
+        )
+        gaps = np.array(
+            [(b - a).total_seconds() for a, b in zip(timestamps, timestamps[1:])]
+        )
+        airborne_legs = same_flight & (gaps <= settings.ANALYTICS_AIRBORNE_GAP_SECONDS)
+        distance = float(haversine_legs_m(lats, lons)[same_flight].sum())
+        airborne = float(gaps[airborne_legs].sum())
+
+    known = points.speeds[~np.isnan(points.speeds)]
+    row.point_count = (row.point_count or 0) + len(points)
+    row.distance_m = (row.distance_m or 0.0) + distance
+    row.airborne_seconds = (row.airborne_seconds or 0.0) + airborne
+    row.min_altitude_m = _fold(min, row.min_altitude_m, float(points.alts.min()))
+    row.max_altitude_m = _fold(max, row.max_altitude_m, float(points.alts.max()))
+    row.speed_sum_mps = (row.speed_sum_mps or 0.0) + float(known.sum())
+    row.speed_count = (row.speed_count or 0) + int(known.size)
+    if known.size:
+        row.max_speed_mps = _fold(max, row.max_speed_mps, float(known.max()))
+    row.violation_count = (row.violation_count or 0) + int(points.violations.sum())
+    row.first_timestamp = _fold(min, row.first_timestamp, points.timestamps[0])
+    if row.last_timestamp is None or points.timestamps[-1] >= row.last_timestamp:
+        row.last_timestamp = points.timestamps[-1]
+        row.last_latitude = float(points.lats[-1])
+        row.last_longitude = float(points.lons[-1])
+        row.last_flight_plan_id = points.flight_plan_ids[-1]
+
+
+def _fold(pick, current, value):
+    return value if current is None else pick(current, value)
+
+
+class TelemetryRollupService:
+    def apply(
+        self,
+        db: Session,
+        *,
+        drone: Drone,
+        flight_plan_id: Optional[int],
+        logs: List[TelemetryLog],
+        violations: Sequence[bool],
+    ) -> None:
+        """Fold an ingested batch (sorted by time) into its rollup rows.
+
+        Rows are locked in a fixed order (flight, then days ascending) so
+        concurrent batches for the same drone serialize instead of deadlocking.
+        """
+        points = RollupPoints(
+            [log.timestamp for log in logs],
+            [log.latitude for log in logs],
+            [log.longitude for log in logs],
+            [log.altitude_m for log in logs],
+            [log.speed_mps for log in logs],
+            violations,
+            [flight_plan_id] * len(logs),
+        )
+        if flight_plan_id is not None:
+            row = self._locked_row(
+                db,
+                FlightTelemetryRollup,
+                {"flight_plan_id": flight_plan_id},
+                {"drone_id": drone.id, "organization_id": drone.organization_id},
+            )
+            accumulate(row, points)
+        for day, day_points in points.by_day().items():
+            row = self._locked_row(
+                db,
+                DroneDailyTelemetryRollup,
+                {"drone_id": drone.id, "day": day},
+                {"organization_id": drone.organization_id},
+            )
+            accumulate(row, day_points)
+
+    @staticmethod
+    def _locked_row(db: Session, model, keys: dict, defaults: dict):
+        db.execute(
+            dialect_insert(db, model)
+            .values(**keys, **defaults)
+            .on_conflict_do_nothing(index_elements=list(keys))
+        )
+        return db.execute(
+            select(model)
+            .where(and_(*(getattr(model, k) == v for k, v in keys.items())))
+            .with_for_update()
+        ).scalar_one()
+
+    def backfill_drone(self, db: Session, drone: Drone, chunk_size: int = 5000) -> int:
+        """Rebuild one drone's rollups from telemetry_logs; returns points read."""
+        for model in (FlightTelemetryRollup, DroneDailyTelemetryRollup):
+            db.query(model).filter(model.drone_id == drone.id).delete(
+                synchronize_session=False
+            )
+        flights: Dict[int, FlightTelemetryRollup] = {}
+        days: Dict[date, DroneDailyTelemetryRollup] = {}
+        result = db.execute(
+            select(
+                TelemetryLog.timestamp,
+                TelemetryLog.latitude,
+                TelemetryLog.longitude,
+                TelemetryLog.altitude_m,
+                TelemetryLog.speed_mps,
+                TelemetryLog.nfz_alert,
+                TelemetryLog.flight_plan_id,
+            )
+            .where(TelemetryLog.drone_id == drone.id)
+            .order_by(TelemetryLog.timestamp)
+            .execution_options(yield_per=chunk_size)
+        )
+        total = 0
+        for rows in result.partitions():
+            total += len(rows)
+            points = RollupPoints(
+                [r.timestamp for r in rows],
+                [r.latitude for r in rows],
+                [r.longitude for r in rows],
+                [r.altitude_m for r in rows],
+                [r.speed_mps for r in rows],
+                [r.nfz_alert is not None for r in rows],
+                [r.flight_plan_id for r in rows],
+            )
+            per_flight: Dict[int, List[int]] = defaultdict(list)
+            for i, r in enumerate(rows):
+                if r.flight_plan_id is not None:
+                    per_flight[r.flight_plan_id].append(i)
+            for flight_plan_id, idx in per_flight.items():
+                row = flights.get(flight_plan_id)
+                if row is None:
+                    row = flights[flight_plan_id] = FlightTelemetryRollup(
+                        flight_plan_id=flight_plan_id,
+                        drone_id=drone.id,
+                        organization_id=drone.organization_id,
+                    )
+                accumulate(row, points.take(idx))
+            for day, day_points in points.by_day().items():
+                row = days.get(day)
+                if row is None:
+                    row = days[day] = DroneDailyTelemetryRollup(
+                        drone_id=drone.id,
+                        day=day,
+                        organization_id=drone.organization_id,
+                    )
+                accumulate(row, day_points)
+        db.add_all(list(flights.values()) + list(days.values()))
+        db.commit()
+        return total
+
+
+telemetry_rollups = TelemetryRollupService()
@@ -0,0 +1,174 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.drone import Drone, DroneStatus
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.telemetry_log import TelemetryLog
+from app.schemas.telemetry import LiveTelemetryMessage, TelemetryBatchIn
+from app.services.audit_log import DRONE, audit_log
+from app.services.event_bus import DRONE_STATUS, TELEMETRY, event_bus
+from app.services.nfz_geometry import nfz_index
+from app.services.telemetry_dedup import duplicates_dropped, telemetry_dedup
+from app.services.telemetry_rollup import telemetry_rollups
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps from devices as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# Plans a drone may report telemetry against.
+FLYABLE_STATUSES = (FlightPlanStatus.APPROVED, FlightPlanStatus.ACTIVE)
+
+
+class TelemetryIngestService:
+    @staticmethod
+    def flight_plan_problem(
+        db: Session, drone: Drone, flight_plan_id: Optional[int]
+    ) -> Optional[str]:
+        """Why points can't be filed under ``flight_plan_id``, or None if they can.
+
+        The plan must exist, belong to this drone and be approved or in the
+        air; anything else would attach the points to someone else's flight.
+        Deleted plans count as missing.
+        """
+        if flight_plan_id is None:
+            return None
+        row = db.execute(
+            select(FlightPlan.drone_id, FlightPlan.status).where(
+                FlightPlan.id == flight_plan_id, FlightPlan.deleted_at.is_(None)
+            )
+        ).first()
+        if row is None or row.drone_id != drone.id:
+            return "Flight plan not found for this drone"
+        if row.status not in FLYABLE_STATUSES:
+            return f"Flight plan is {row.status.value}, not approved or active"
+        return None
+
+    def ingest(
+        self, db: Session, *, drone: Drone, batch: TelemetryBatchIn
+    ) -> List[TelemetryLog]:
+        """Store a batch of points, update the drone's latest state and fan out.
+
+        Retransmitted points are dropped, first by the in-memory deduplicator
+        and then by the unique ``(drone_id, timestamp)`` constraint, so only
+        the newly stored points are returned, rolled up and published.
+        """
+        points = sorted(batch.points, key=lambda point: as_utc(point.timestamp))
+        fresh = telemetry_dedup.filter(
+            drone.id, [as_utc(point.timestamp) for point in points]
+        )
+        points = [points[i] for i in fresh]
+        if not points:
+            return []
+        zone_hits = nfz_index.check_points(
+            [point.latitude for point in points],
+            [point.longitude for point in points],
+            [point.altitude_m for point in points],
+        )
+        rows = [
+            {
+                "flight_plan_id": batch.flight_plan_id,
+                "drone_id": drone.id,
+                "timestamp": as_utc(point.timestamp),
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "altitude_m": point.altitude_m,
+                "speed_mps": point.speed_mps,
+                "heading_degrees": point.heading_degrees,
+                "status_message": point.status_message,
+                "nfz_alert": self.nfz_alert(zones),
+            }
+            for point, zones in zip(points, zone_hits)
+        ]
+        inserted = db.execute(
+            dialect_insert(db, TelemetryLog)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["drone_id", "timestamp"])
+            .returning(TelemetryLog.id, TelemetryLog.timestamp)
+        ).all()
+        ids = {as_utc(timestamp): log_id for log_id, timestamp in inserted}
+        if len(ids) < len(rows):
+            duplicates_dropped.inc(len(rows) - len(ids), stage="database")
+        logs, violations = [], []
+        for row in rows:
+            log_id = ids.get(row["timestamp"])
+            if log_id is not None:
+                logs.append(TelemetryLog(id=log_id, **row))
+                # The same test the rollup backfill applies to stored rows.
+                violations.append(row["nfz_alert"] is not None)
+        if not logs:
+            db.commit()
+            telemetry_dedup.record(drone.id, [row["timestamp"] for row in rows])
+            return []
+        telemetry_rollups.apply(
+            db,
+            drone=drone,
+            flight_plan_id=batch.flight_plan_id,
+            logs=logs,
+            violations=violations,
+        )
+
+        latest = logs[-1]
+        if drone.last_seen_at is None or latest.timestamp >= drone.last_seen_at:
+            drone.last_seen_at = latest.timestamp
+            drone.last_telemetry_id = latest.id
+
+        old_status = drone.current_status
+        status_changed = False
+        if batch.flight_plan_id is not None and old_status in (
+            DroneStatus.IDLE,
+            DroneStatus.UNKNOWN,
+        ):
+            drone.current_status = DroneStatus.ACTIVE
+            status_changed = True
+
+        db.commit()
+        telemetry_dedup.record(drone.id, [row["timestamp"] for row in rows])
+
+        for log in logs:
+            event_bus.publish(TELEMETRY, self.live_message(log))
+        if status_changed:
+            audit_log.record(
+                DRONE,
+                drone.id,
+                "status_changed",
+                old_value=old_status,
+                new_value=DroneStatus.ACTIVE,
+                details={"source": "telemetry", "flight_plan_id": batch.flight_plan_id},
+            )
+            event_bus.publish(
+                DRONE_STATUS,
+                {"drone_id": drone.id, "status": DroneStatus.ACTIVE.value},
+            )
+        return logs
+
+    @staticmethod
+    def nfz_alert(zones) -> Optional[str]:
+        if not zones:
+            return None
+        return f"NFZ_ALERT: {', '.join(zone.name for zone in zones)}"[:255]
+
+    @staticmethod
+    def live_message(log: TelemetryLog) -> dict:
+        return LiveTelemetryMessage(
+            flight_id=log.flight_plan_id,
+            drone_id=log.drone_id,
+            lat=log.latitude,
+            lon=log.longitude,
+            alt=log.altitude_m,
+            timestamp=log.timestamp,
+            speed=log.speed_mps,
+            heading=log.heading_degrees,
+            status_message=log.status_message,
+            nfz_alert=log.nfz_alert,
+        ).model_dump(mode="json")
+
+
+telemetry_ingest_service = TelemetryIngestService()
@@ -0,0 +1,289 @@
+import asyncio
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.telemetry_log import TelemetryLog
+from app.services.event_bus import TELEMETRY, event_bus
+from app.services.telemetry_service import as_utc
+
+tail_requests = metrics.counter(
+    "utm_telemetry_tail_requests_total",
+    "Trail and tail lookups, by where they were served from",
+    ["source"],
+)
+tail_evictions = metrics.counter(
+    "utm_telemetry_tail_evictions_total",
+    "Idle drones dropped from the recent-telemetry buffers to stay under the cap",
+)
+metrics.gauge(
+    "utm_telemetry_tail_drones",
+    "Drones with a recent-telemetry buffer on this worker",
+    callback=lambda: {(): len(telemetry_tail._drones)},
+)
+
+# Columns of a buffer row; speed and heading are NaN when not reported.
+T, LAT, LON, ALT, SPEED, HEADING = range(6)
+_COLUMNS = 6
+
+
+class _DroneTail:
+    __slots__ = ("rows", "head", "count", "seeded", "complete")
+
+    def __init__(self, capacity: int):
+        self.rows = np.empty((capacity, _COLUMNS), dtype=np.float64)
+        self.head = 0  # Next slot to write
+        self.count = 0
+        # Backfilled from the database, so nothing older than the buffer is
+        # missing; complete when the drone has no more history than this.
+        self.seeded = False
+        self.complete = False
+
+    def push(self, row) -> None:
+        if self.count == len(self.rows):
+            self.complete = False  # Overwriting the oldest point
+        self.rows[self.head] = row
+        self.head = (self.head + 1) % len(self.rows)
+        self.count = min(self.count + 1, len(self.rows))
+
+    def ordered(self) -> np.ndarray:
+        rows = self.rows[: self.count] if self.count < len(self.rows) else self.rows
+        return rows[np.argsort(rows[:, T], kind="stable")]
+
+
+def _row(timestamp: datetime, lat, lon, alt, speed, heading) -> List[float]:
+    return [
+        as_utc(timestamp).timestamp(),
+        lat,
+        lon,
+        alt,
+        math.nan if speed is None else speed,
+        math.nan if heading is None else heading,
+    ]
+
+
+def _point(row: np.ndarray) -> Dict[str, Any]:
+    speed, heading = row[SPEED], row[HEADING]
+    return {
+        "timestamp": datetime.fromtimestamp(row[T], tz=timezone.utc),
+        "latitude": float(row[LAT]),
+        "longitude": float(row[LON]),
+        "altitude_m": float(row[ALT]),
+        "speed_mps": None if speed != speed else float(speed),
+        "heading_degrees": None if heading != heading else float(heading),
+    }
+
+
+class TelemetryTailBuffer:
+    """The last few hundred points of each drone, for trails and live tails.
+
+    Every worker fills its buffers from the telemetry events on the event
+    bus, so it sees points ingested by any worker. A drone's buffer is
+    backfilled from telemetry_logs the first time it is read; after that,
+    requests that fit inside it never touch the database. The total size is
+    capped, and the drones seen least recently are evicted first.
+    """
+
+    def __init__(self, points_per_drone: int, memory_bytes: int):
+        self.capacity = points_per_drone
+        self.max_drones = max(1, memory_bytes // (points_per_drone * _COLUMNS * 8))
+        self._drones: "OrderedDict[int, _DroneTail]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # Filling
+
+    def _entry(self, drone_id: int) -> _DroneTail:
+        tail = self._drones.get(drone_id)
+        if tail is None:
+            tail = self._drones[drone_id] = _DroneTail(self.capacity)
+            while len(self._drones) > self.max_drones:
+                self._drones.popitem(last=False)
+                tail_evictions.inc()
+        else:
+            self._drones.move_to_end(drone_id)
+        return tail
+
+    def add(self, drone_id: int, rows: Iterable[List[float]]) -> None:
+        with self._lock:
+            tail = self._entry(drone_id)
+            for row in rows:
+                tail.push(row)
+
+    def _on_event(self, data: Dict[str, Any]) -> None:
+        self.add(
+            data["drone_id"],
+            [
+                _row(
+                    datetime.fromisoformat(data["timestamp"]),
+                    data["lat"],
+                    data["lon"],
+                    data["alt"],
+                    data.get("speed"),
+                    data.get("heading"),
+                )
+            ],
+        )
+
+    def unseed_all(self) -> None:
+        """Have every buffer re-read from the database on its next use.
+
+        For when live events were lost and any buffer may have a gap; what
+        is already buffered is kept and merged with the re-read history.
+        """
+        with self._lock:
+            for tail in self._drones.values():
+                tail.seeded = False
+
+    def _seed(self, db: Session, drone_id: int) -> None:
+        logs = db.execute(
+            select(
+                TelemetryLog.timestamp,
+                TelemetryLog.latitude,
+                TelemetryLog.longitude,
+                TelemetryLog.altitude_m,
+                TelemetryLog.speed_mps,
+                TelemetryLog.heading_degrees,
+            )
+            .where(TelemetryLog.drone_id == drone_id)
+            .order_by(TelemetryLog.timestamp.desc())
+            .limit(self.capacity)
+        ).all()
+        with self._lock:
+            tail = self._entry(drone_id)
+            if tail.seeded:
+                return
+            # Merge with whatever arrived while the query ran.
+            live = {row[T]: row for row in tail.ordered()}
+            history = [_row(*log) for log in reversed(logs)]
+            merged = [row for row in history if row[0] not in live]
+            merged.extend(live.values())
+            merged.sort(key=lambda row: row[0])
+            fresh = _DroneTail(self.capacity)
+            for row in merged[-self.capacity :]:
+                fresh.push(row)
+            fresh.seeded = True
+            fresh.complete = len(logs) < self.capacity
+            self._drones[drone_id] = fresh
+
+    # Reading
+
+    def _snapshot(self, db: Session, drone_id: int):
+        with self._lock:
+            tail = self._drones.get(drone_id)
+            seeded = tail is not None and tail.seeded
+        if not seeded:
+            self._seed(db, drone_id)
+        with self._lock:
+            tail = self._drones.get(drone_id)
+            if tail is None:  # Evicted straight away; the cap is tiny.
+                return None, False
+            return tail.ordered(), tail.complete
+
+    def last_points(
+        self, db: Session, drone_id: int, count: int
+    ) -> Tuple[List[Any], str]:
+        """The newest ``count`` points in time order, and where they came from."""
+        rows, complete = self._snapshot(db, drone_id)
+        if rows is not None and (count <= len(rows) or complete):
+            tail_requests.inc(source="memory")
+            return [_point(row) for row in rows[-count:]], "memory"
+        tail_requests.inc(source="database")
+        logs = (
+            db.execute(
+                select(TelemetryLog)
+                .where(TelemetryLog.drone_id == drone_id)
+                .order_by(TelemetryLog.timestamp.desc())
+                .limit(count)
+            )
+            .scalars()
+            .all()
+        )
+        return list(reversed(logs)), "database"
+
+    def latest(self, cutoff: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Drone ids and newest rows of the drones heard from since ``cutoff``.
+
+        Memory only: drones that have not reported since this worker started
+        are not included.
+        """
+        start = as_utc(cutoff).timestamp()
+        drone_ids, rows = [], []
+        with self._lock:
+            for drone_id, tail in self._drones.items():
+                if not tail.count:
+                    continue
+                row = tail.rows[int(np.argmax(tail.rows[: tail.count, T]))]
+                if row[T] >= start:
+                    drone_ids.append(drone_id)
+                    rows.append(row.copy())
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, _COLUMNS))
+        return np.asarray(drone_ids, dtype=np.int64), np.vstack(rows)
+
+    def since(
+        self, db: Session, drone_id: int, cutoff: datetime
+    ) -> Tuple[List[Any], str]:
+        """Points at or after ``cutoff`` in time order, and where they came from."""
+        rows, complete = self._snapshot(db, drone_id)
+        start = as_utc(cutoff).timestamp()
+        if rows is not None and (complete or (len(rows) and rows[0, T] <= start)):
+            tail_requests.inc(source="memory")
+            first = int(np.searchsorted(rows[:, T], start, side="left"))
+            return [_point(row) for row in rows[first:]], "memory"
+        tail_requests.inc(source="database")
+        logs = (
+            db.execute(
+                select(TelemetryLog)
+                .where(
+                    TelemetryLog.drone_id == drone_id,
+                    TelemetryLog.timestamp >= cutoff,
+                )
+                .order_by(TelemetryLog.timestamp)
+            )
+            .scalars()
+            .all()
+        )
+        return logs, "database"
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        subscription = event_bus.subscribe({TELEMETRY})
+
+        async def consume():
+            dropped = 0
+            try:
+                while True:
+                    event = await subscription.get()
+                    if subscription.dropped != dropped:
+                        dropped = subscription.dropped
+                        self.unseed_all()
+                    try:
+                        self._on_event(event["data"])
+                    except (KeyError, TypeError, ValueError) as e:
+                        print(f"Telemetry tail: skipping malformed event: {e}")
+            finally:
+                subscription.close()
+
+        self._task = asyncio.create_task(consume())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+telemetry_tail = TelemetryTailBuffer(
+    settings.TELEMETRY_TAIL_POINTS_PER_DRONE,
+    settings.TELEMETRY_TAIL_MEMORY_MB * 1024 * 1024,
+)
@@ -0,0 +1,262 @@
+import asyncio
+import hashlib
+import hmac
+import math
+import socket
+import struct
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import IngestSessionLocal
+from app.models.drone import Drone
+from app.schemas.telemetry import TelemetryBatchIn, TelemetryPointIn
+from app.services.telemetry_service import telemetry_ingest_service
+
+udp_packets = metrics.counter(
+    "utm_udp_telemetry_packets_total",
+    "UDP telemetry packets, by outcome",
+    ["outcome"],
+)
+metrics.gauge(
+    "utm_udp_telemetry_pending",
+    "UDP telemetry packets waiting for the next flush",
+    callback=lambda: {(): len(udp_telemetry.pending)},
+)
+
+# One point per datagram, network byte order:
+#   magic "UT", version, reserved, drone id, flight plan id (0 = none),
+#   timestamp (microseconds since the epoch), latitude, longitude,
+#   altitude (m), speed (m/s), heading (degrees); NaN speed or heading means
+#   not reported. A truncated HMAC-SHA256 of all of that follows.
+PACKET_MAGIC = b"UT"
+PACKET_VERSION = 1
+PACKET_BODY = struct.Struct("!2sBxIIqddfff")
+MAC_BYTES = 16
+PACKET_BYTES = PACKET_BODY.size + MAC_BYTES
+
+Point = Tuple[int, Optional[int], TelemetryPointIn]
+
+
+@lru_cache(maxsize=65536)
+def drone_key(secret: str, serial_number: str) -> bytes:
+    """Per-drone packet key, derived from the drone's serial number.
+
+    Nothing is stored per drone; rotating TELEMETRY_UDP_SECRET re-keys every
+    drone at once.
+    """
+    return hmac.new(
+        secret.encode("utf-8"), serial_number.encode("utf-8"), hashlib.sha256
+    ).digest()
+
+
+def pack_packet(
+    key: bytes,
+    drone_id: int,
+    timestamp: datetime,
+    latitude: float,
+    longitude: float,
+    altitude_m: float,
+    speed_mps: Optional[float] = None,
+    heading_degrees: Optional[float] = None,
+    flight_plan_id: Optional[int] = None,
+) -> bytes:
+    body = PACKET_BODY.pack(
+        PACKET_MAGIC,
+        PACKET_VERSION,
+        drone_id,
+        flight_plan_id or 0,
+        round(timestamp.timestamp() * 1_000_000),
+        latitude,
+        longitude,
+        altitude_m,
+        math.nan if speed_mps is None else speed_mps,
+        math.nan if heading_degrees is None else heading_degrees,
+    )
+    return body + hmac.new(key, body, hashlib.sha256).digest()[:MAC_BYTES]
+
+
+class _Protocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: "UdpTelemetryListener"):
+        self.listener = listener
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.listener.receive(data)
+
+    def error_received(self, exc: Exception) -> None:
+        print(f"UDP telemetry socket error: {exc}")
+
+
+class UdpTelemetryListener:
+    """Accepts single-point telemetry datagrams from ground stations.
+
+    Packets are only framed on receipt. Every flush interval the pending
+    packets are authenticated against their drone's key, grouped per drone
+    and flight, and stored through the same ingest service as HTTP batches.
+    A replayed packet is just a duplicate point, so the ingest deduplication
+    drops it.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str],
+        flush_interval_seconds: float,
+        max_pending: int,
+    ):
+        self.secret = secret
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.pending: List[bytes] = []
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def receive(self, data: bytes) -> None:
+        if len(data) != PACKET_BYTES or data[:2] != PACKET_MAGIC:
+            udp_packets.inc(outcome="malformed")
+            return
+        if len(self.pending) >= self.max_pending:
+            udp_packets.inc(outcome="overflow")
+            return
+        self.pending.append(data)
+
+    def _authenticate(self, packets: List[bytes], drones: Dict[int, Drone]):
+        points: List[Point] = []
+        for packet in packets:
+            body, mac = packet[: PACKET_BODY.size], packet[PACKET_BODY.size :]
+            (
+                _,
+                version,
+                drone_id,
+                flight_plan_id,
+                timestamp_us,
+                lat,
+                lon,
+                alt,
+                speed,
+                heading,
+            ) = PACKET_BODY.unpack(body)
+            drone = drones.get(drone_id)
+            if version != PACKET_VERSION:
+                udp_packets.inc(outcome="malformed")
+                continue
+            if drone is None:
+                udp_packets.inc(outcome="unknown_drone")
+                continue
+            key = drone_key(self.secret, drone.serial_number)
+            expected = hmac.new(key, body, hashlib.sha256).digest()[:MAC_BYTES]
+            if not hmac.compare_digest(mac, expected):
+                udp_packets.inc(outcome="bad_mac")
+                continue
+            try:
+                point = TelemetryPointIn(
+                    timestamp=datetime.fromtimestamp(
+                        timestamp_us / 1_000_000, tz=timezone.utc
+                    ),
+                    latitude=lat,
+                    longitude=lon,
+                    altitude_m=alt,
+                    speed_mps=None if speed != speed else speed,
+                    heading_degrees=None if heading != heading else heading,
+                )
+            except (ValidationError, OverflowError, ValueError):
+                udp_packets.inc(outcome="malformed")
+                continue
+            points.append((drone_id, flight_plan_id or None, point))
+        return points
+
+    def _ingest(self, packets: List[bytes]) -> None:
+        drone_ids = {PACKET_BODY.unpack_from(packet)[2] for packet in packets}
+        db = IngestSessionLocal()
+        try:
+            drones = {
+                drone.id: drone
+                for drone in db.execute(select(Drone).where(Drone.id.in_(drone_ids)))
+                .scalars()
+                .all()
+            }
+            batches: Dict[Tuple[int, Optional[int]], List[TelemetryPointIn]]
+            batches = defaultdict(list)
+            for drone_id, flight_plan_id, point in self._authenticate(packets, drones):
+                batches[(drone_id, flight_plan_id)].append(point)
+            for (drone_id, flight_plan_id), points in batches.items():
+                if telemetry_ingest_service.flight_plan_problem(
+                    db, drones[drone_id], flight_plan_id
+                ):
+                    udp_packets.inc(len(points), outcome="bad_flight_plan")
+                    continue
+                for start in range(0, len(points), 1000):
+                    chunk = points[start : start + 1000]
+                    try:
+                        logs = telemetry_ingest_service.ingest(
+                            db,
+                            drone=drones[drone_id],
+                            batch=TelemetryBatchIn(
+                                drone_id=drone_id,
+                                flight_plan_id=flight_plan_id,
+                                points=chunk,
+                            ),
+                        )
+                    except Exception as e:
+                        db.rollback()
+                        udp_packets.inc(len(chunk), outcome="failed")
+                        print(f"UDP telemetry for drone {drone_id} not stored: {e}")
+                        continue
+                    udp_packets.inc(len(logs), outcome="accepted")
+                    udp_packets.inc(len(chunk) - len(logs), outcome="duplicate")
+        finally:
+            db.close()
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            if not self.pending:
+                continue
+            packets, self.pending = self.pending, []
+            try:
+                await asyncio.to_thread(self._ingest, packets)
+            except Exception as e:
+                udp_packets.inc(len(packets), outcome="failed")
+                print(f"UDP telemetry flush failed: {e}")
+
+    async def start(self, host: str, port: int) -> None:
+        if not self.secret:
+            print("UDP telemetry listener disabled: TELEMETRY_UDP_SECRET is not set.")
+            return
+        loop = asyncio.get_running_loop()
+        # Every worker binds the same port; the kernel spreads packets.
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _Protocol(self),
+            local_addr=(host, port),
+            family=socket.AF_INET6 if ":" in host else socket.AF_INET,
+            reuse_port=hasattr(socket, "SO_REUSEPORT"),
+        )
+        self._task = asyncio.create_task(self._flush_forever())
+        print(f"UDP telemetry listening on {host}:{port}")
+
+    async def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.pending:
+            packets, self.pending = self.pending, []
+            try:
+                await asyncio.to_thread(self._ingest, packets)
+            except Exception as e:
+                print(f"UDP telemetry: dropping unsent packets on shutdown: {e}")
+
+
+udp_telemetry = UdpTelemetryListener(
+    settings.TELEMETRY_UDP_SECRET,
+    flush_interval_seconds=settings.TELEMETRY_UDP_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.TELEMETRY_UDP_MAX_PENDING,
+)
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import math
+import time
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+weather_lookups = metrics.counter(
+    "utm_weather_lookups_total",
+    "Weather lookups by grid cell, by how they were answered",
+    ["result"],
+)
+weather_fetch_seconds = metrics.summary(
+    "utm_weather_fetch_duration_seconds", "Time spent per upstream weather fetch"
+)
+metrics.gauge(
+    "utm_weather_cached_cells",
+    "Grid cells with cached weather on this worker",
+    callback=lambda: {(): len(weather_service.cache)},
+)
+
+Cell = Tuple[int, int]
+Report = Dict[str, Any]
+
+# WMO weather interpretation codes, as reported by Open-Meteo.
+WMO_SUMMARIES = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Rime fog",
+    51: "Light drizzle",
+    53: "Drizzle",
+    55: "Dense drizzle",
+    56: "Freezing drizzle",
+    57: "Dense freezing drizzle",
+    61: "Light rain",
+    63: "Rain",
+    65: "Heavy rain",
+    66: "Freezing rain",
+    67: "Heavy freezing rain",
+    71: "Light snow",
+    73: "Snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Light showers",
+    81: "Showers",
+    82: "Violent showers",
+    85: "Snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with hail",
+    99: "Thunderstorm with heavy hail",
+}
+
+
+class WeatherUnavailable(Exception):
+    """The provider could not answer for a location."""
+
+
+class WeatherProvider(ABC):
+    """Current conditions at a point. Called from worker threads."""
+
+    name = "none"
+
+    @abstractmethod
+    def fetch(self, latitude: float, longitude: float) -> Report:
+        """Returns temperature_c, wind_speed_mps, wind_direction_degrees,
+        conditions_summary and observed_at."""
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """Open-Meteo's forecast API; needs no key."""
+
+    name = "open-meteo"
+
+    def __init__(self, base_url: str, timeout_seconds: float):
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+
+    def fetch(self, latitude: float, longitude: float) -> Report:
+        query = urllib.parse.urlencode(
+            {
+                "latitude": f"{latitude:.4f}",
+                "longitude": f"{longitude:.4f}",
+                "current": "temperature_2m,wind_speed_10m,wind_direction_10m,"
+                "weather_code",
+                "wind_speed_unit": "ms",
+                "timezone": "UTC",
+            }
+        )
+        try:
+            with urllib.request.urlopen(
+                f"{self.base_url}?{query}", timeout=self.timeout_seconds
+            ) as response:
+                current = json.load(response)["current"]
+            return {
+                "temperature_c": current["temperature_2m"],
+                "wind_speed_mps": current["wind_speed_10m"],
+                "wind_direction_degrees": current["wind_direction_10m"],
+                "conditions_summary": WMO_SUMMARIES.get(
+                    current.get("weather_code"), "Unknown"
+                ),
+                "observed_at": datetime.fromisoformat(current["time"]).replace(
+                    tzinfo=timezone.utc
+                ),
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise WeatherUnavailable(f"Open-Meteo lookup failed: {e}") from e
+
+
+class FileWeatherProvider(WeatherProvider):
+    """Fixed conditions read from a JSON file, for tests and offline setups.
+
+    The file holds ``{"default": {...}, "points": [{"latitude": ..,
+    "longitude": .., ...}]}``; a lookup gets the nearest point's conditions,
+    else the default. Without a file every lookup gets calm, clear weather.
+    """
+
+    name = "file"
+    CALM = {
+        "temperature_c": 15.0,
+        "wind_speed_mps": 0.0,
+        "wind_direction_degrees": 0.0,
+        "conditions_summary": "Clear sky",
+    }
+
+    def __init__(self, path: Optional[str] = None):
+        self.default = dict(self.CALM)
+        self.points: List[Report] = []
+        if path:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.default.update(data.get("default", {}))
+            self.points = [dict(self.default, **p) for p in data.get("points", [])]
+
+    def fetch(self, latitude: float, longitude: float) -> Report:
+        report = self.default
+        if self.points:
+            report = min(
+                self.points,
+                key=lambda p: (p["latitude"] - latitude) ** 2
+                + (p["longitude"] - longitude) ** 2,
+            )
+        found = {key: report[key] for key in self.CALM}
+        found["observed_at"] = datetime.now(timezone.utc)
+        return found
+
+
+def make_provider() -> WeatherProvider:
+    if settings.WEATHER_PROVIDER == "file":
+        return FileWeatherProvider(settings.WEATHER_FILE_PATH)
+    if settings.WEATHER_PROVIDER == "open-meteo":
+        return OpenMeteoProvider(
+            settings.WEATHER_API_URL, settings.WEATHER_TIMEOUT_SECONDS
+        )
+    raise ValueError(f"Unknown WEATHER_PROVIDER: {settings.WEATHER_PROVIDER}")
+
+
+class WeatherService:
+    """Weather by grid cell, cached for WEATHER_CACHE_TTL_SECONDS.
+
+    Points are snapped to a WEATHER_GRID_DEGREES grid and the provider is
+    asked about the cell centre, so nearby points share one cached answer.
+    Concurrent misses on the same cell wait for a single upstream call, and
+    at most WEATHER_MAX_CONCURRENT_FETCHES calls run at a time.
+    """
+
+    def __init__(
+        self,
+        provider: WeatherProvider,
+        grid_degrees: float,
+        ttl_seconds: float,
+        max_cells: int,
+        max_concurrent_fetches: int,
+    ):
+        self.provider = provider
+        self.grid_degrees = grid_degrees
+        self.ttl_seconds = ttl_seconds
+        self.max_cells = max_cells
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self.cache: "OrderedDict[Cell, Tuple[float, Report]]" = OrderedDict()
+        self._inflight: Dict[Cell, asyncio.Future] = {}
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+
+    def cell(self, latitude: float, longitude: float) -> Cell:
+        return (
+            math.floor(latitude / self.grid_degrees),
+            math.floor(longitude / self.grid_degrees),
+        )
+
+    def cell_centre(self, cell: Cell) -> Tuple[float, float]:
+        """Where the provider is asked about a cell.
+
+        Cells at the poles and the antimeridian can stick out of the globe
+        when the grid doesn't divide it evenly, so the latitude is clamped
+        and the longitude wrapped into [-180, 180).
+        """
+        latitude = min(max((cell[0] + 0.5) * self.grid_degrees, -90.0), 90.0)
+        longitude = ((cell[1] + 0.5) * self.grid_degrees + 180.0) % 360.0 - 180.0
+        return latitude, longitude
+
+    def _cached(self, cell: Cell) -> Optional[Report]:
+        entry = self.cache.get(cell)
+        if entry is None:
+            return None
+        expires, report = entry
+        if expires <= time.monotonic():
+            del self.cache[cell]
+            return None
+        self.cache.move_to_end(cell)
+        return report
+
+    async def _fetch(self, cell: Cell) -> Report:
+        if self._fetch_slots is None:
+            self._fetch_slots = asyncio.Semaphore(self.max_concurrent_fetches)
+        latitude, longitude = self.cell_centre(cell)
+        async with self._fetch_slots:
+            started = time.perf_counter()
+            try:
+                report = await asyncio.to_thread(
+                    self.provider.fetch, latitude, longitude
+                )
+            finally:
+                weather_fetch_seconds.observe(time.perf_counter() - started)
+        report = dict(
+            report, latitude=latitude, longitude=longitude, source=self.provider.name
+        )
+        self.cache[cell] = (time.monotonic() + self.ttl_seconds, report)
+        while len(self.cache) > self.max_cells:
+            self.cache.popitem(last=False)
+        return report
+
+    async def for_cell(self, cell: Cell) -> Report:
+        report = self._cached(cell)
+        if report is not None:
+            weather_lookups.inc(result="hit")
+            return report
+        inflight = self._inflight.get(cell)
+        if inflight is not None:
+            weather_lookups.inc(result="coalesced")
+            return await asyncio.shield(inflight)
+
+        weather_lookups.inc(result="miss")
+        task = asyncio.ensure_future(self._fetch(cell))
+        self._inflight[cell] = task
+        task.add_done_callback(lambda _: self._inflight.pop(cell, None))
+        return await asyncio.shield(task)
+
+    async def at(self, latitude: float, longitude: float) -> Report:
+        return await self.for_cell(self.cell(latitude, longitude))
+
+    async def along(self, points: List[Tuple[float, float]]) -> List[Report]:
+        """Weather for each point, in order; each distinct cell is fetched once."""
+        cells = [self.cell(latitude, longitude) for latitude, longitude in points]
+        distinct = list(dict.fromkeys(cells))
+        reports = await asyncio.gather(*(self.for_cell(cell) for cell in distinct))
+        by_cell = dict(zip(distinct, reports))
+        return [by_cell[cell] for cell in cells]
+
+
+weather_service = WeatherService(
+    make_provider(),
+    grid_degrees=settings.WEATHER_GRID_DEGREES,
+    ttl_seconds=settings.WEATHER_CACHE_TTL_SECONDS,
+    max_cells=settings.WEATHER_CACHE_MAX_CELLS,
+    max_concurrent_fetches=settings.WEATHER_MAX_CONCURRENT_FETCHES,
+)
@@ -0,0 +1,158 @@
+import itertools
+import random
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = (
+        "order",
+        "start",
+        "end",
+        "key",
+        "priority",
+        "max_end",
+        "left",
+        "right",
+    )
+
+    def __init__(self, order: Tuple[Any, int], start, end, key: Hashable):
+        self.order = order
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = random.random()
+        self.max_end = end
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTree:
+    """A dynamic set of keyed half-open intervals ``[start, end)``.
+
+    It is a treap ordered by start, where each node also stores the largest
+    end in its subtree. Inserts and removals take O(log n) expected time. An
+    overlap query visits O(log n + k) nodes instead of scanning every
+    interval. Bounds can be anything comparable, such as numbers or aware
+    datetimes, as long as every interval in one tree uses the same kind.
+    """
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._orders: Dict[Hashable, Tuple[Any, int]] = {}
+        self._intervals: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._intervals
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, Any, Any]]:
+        for key, (start, end) in self._intervals.items():
+            yield key, start, end
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Any]]:
+        return self._intervals.get(key)
+
+    def add(self, key: Hashable, start, end) -> None:
+        """Insert ``[start, end)`` under ``key``, replacing any previous interval."""
+        if not start < end:
+            raise ValueError("Interval start must be before its end")
+        if key in self._intervals:
+            self.remove(key)
+        # The sequence number breaks ties so keys never need to be comparable.
+        order = (start, next(self._seq))
+        self._root = self._insert(self._root, _Node(order, start, end, key))
+        self._orders[key] = order
+        self._intervals[key] = (start, end)
+
+    def remove(self, key: Hashable) -> bool:
+        order = self._orders.pop(key, None)
+        if order is None:
+            return False
+        del self._intervals[key]
+        self._root = self._delete(self._root, order)
+        return True
+
+    def overlapping(self, start, end) -> List[Hashable]:
+        """Keys of intervals sharing any instant with ``[start, end)``."""
+        found: List[Hashable] = []
+        self._collect(self._root, start, end, False, found)
+        return found
+
+    def at(self, point) -> List[Hashable]:
+        """Keys of intervals containing ``point``."""
+        found: List[Hashable] = []
+        self._collect(self._root, point, point, True, found)
+        return found
+
+    def _collect(self, node, start, end, closed: bool, found: List[Hashable]) -> None:
+        while node is not None and node.max_end > start:
+            self._collect(node.left, start, end, closed, found)
+            if not (node.start <= end if closed else node.start < end):
+                return  # The right subtree starts even later.
+            if node.end > start:
+                found.append(node.key)
+            node = node.right
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if new.order < node.order:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def _delete(self, node: Optional[_Node], order) -> Optional[_Node]:
+        if node is None:
+            return None
+        if order < node.order:
+            node.left = self._delete(node.left, order)
+        elif node.order < order:
+            node.right = self._delete(node.right, order)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            if node.left.priority > node.right.priority:
+                node = self._rotate_right(node)
+                node.right = self._delete(node.right, order)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._delete(node.left, order)
+        node.update()
+        return node
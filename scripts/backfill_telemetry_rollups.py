@@ -0,0 +1,59 @@
+"""Rebuild the per-flight and per-drone-day telemetry rollups from telemetry_logs.
+
+Ingest keeps the rollups current. Run this once after the rollup tables are
+created, again after migration f3b8d2e6a195 to fill in daily flight time, or
+for a single drone if its rollups are suspected to have drifted:
+
+    SECRET_KEY=dev python scripts/backfill_telemetry_rollups.py [--drone-id 42]
+
+Each drone is rebuilt in its own transaction, streaming its telemetry in
+chunks, so the script can be interrupted and re-run safely.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db.database import BackgroundSessionLocal  # noqa: E402
+from app.models.drone import Drone  # noqa: E402
+from app.services.telemetry_rollup import telemetry_rollups  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drone-id", type=int, help="Only rebuild this drone")
+    parser.add_argument(
+        "--chunk-size", type=int, default=5000, help="Telemetry rows per fetch"
+    )
+    args = parser.parse_args()
+
+    db = BackgroundSessionLocal()
+    try:
+        stmt = select(Drone.id).order_by(Drone.id)
+        if args.drone_id is not None:
+            stmt = stmt.where(Drone.id == args.drone_id)
+        drone_ids = db.execute(stmt).scalars().all()
+        started = time.perf_counter()
+        total = 0
+        for n, drone_id in enumerate(drone_ids, 1):
+            drone = db.get(Drone, drone_id)
+            points = telemetry_rollups.backfill_drone(
+                db, drone, chunk_size=args.chunk_size
+            )
+            total += points
+            print(f"[{n}/{len(drone_ids)}] drone {drone_id}: {points} points")
+        elapsed = time.perf_counter() - started
+        print(
+            f"Rebuilt rollups for {len(drone_ids)} drones, {total} points in {elapsed:.1f}s"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Time a flight report on a synthetic 100k-point flight from each source.
+
+Run from the repository root:
+
+    SECRET_KEY=dev python scripts/bench_flight_analytics.py [--points 100000]
+
+The database source is measured against a throwaway SQLite file, so it shows
+the cost of streaming column tuples through the driver rather than a
+production Postgres round trip.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models.restricted_zone import NFZGeometryType  # noqa: E402
+from app.models.telemetry_log import TelemetryLog  # noqa: E402
+from app.services.flight_analytics import FlightColumns, analyse_flight  # noqa: E402
+from app.services.nfz_geometry import CompiledZone  # noqa: E402
+from app.services.telemetry_archive import TelemetryArchive, write_archive  # noqa: E402
+
+
+def synthetic_flight(rng: random.Random, points: int):
+    route = [(51.1 + 0.01 * i, 71.4 + 0.005 * rng.uniform(-1, 1)) for i in range(20)]
+    frac = np.linspace(0, len(route) - 1, points)
+    route_arr = np.asarray(route)
+    lat = np.interp(frac, np.arange(len(route)), route_arr[:, 0])
+    lon = np.interp(frac, np.arange(len(route)), route_arr[:, 1])
+    # Drift up to ~30 m off the planned route
+    lat += 0.0003 * np.sin(frac * 5.0)
+    lon += 0.0004 * np.cos(frac * 3.0)
+    alt = 100 + 20 * np.sin(frac)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    step = np.full(points, 0.2)
+    step[rng.sample(range(points), 20)] = 12.0  # a few signal gaps
+    t = start.timestamp() + np.cumsum(step)
+    speed = np.where(np.arange(points) % 7 == 0, np.nan, 10.0)
+    return route, FlightColumns(t, lat, lon, alt, speed)
+
+
+def zones(rng: random.Random, count: int = 30):
+    out = []
+    for i in range(count):
+        lat, lon = rng.uniform(51.05, 51.35), rng.uniform(71.35, 71.45)
+        if i % 2:
+            out.append(
+                CompiledZone(
+                    i,
+                    f"circle-{i}",
+                    NFZGeometryType.CIRCLE,
+                    {"center_lat": lat, "center_lon": lon, "radius_m": 300},
+                    None,
+                    None,
+                )
+            )
+        else:
+            d = 0.003
+            ring = [
+                [lon - d, lat - d],
+                [lon + d, lat - d],
+                [lon + d, lat + d],
+                [lon - d, lat + d],
+            ]
+            out.append(
+                CompiledZone(
+                    i,
+                    f"polygon-{i}",
+                    NFZGeometryType.POLYGON,
+                    {"coordinates": [ring]},
+                    None,
+                    None,
+                )
+            )
+    return out
+
+
+def rows(columns: FlightColumns):
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    for i in range(len(columns)):
+        speed = columns.speed[i]
+        yield (
+            epoch + timedelta(seconds=float(columns.t[i])),
+            float(columns.lat[i]),
+            float(columns.lon[i]),
+            float(columns.alt[i]),
+            None if speed != speed else float(speed),
+            None,
+            None,
+        )
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    route, columns = synthetic_flight(rng, args.points)
+    zone_list = zones(rng)
+    print(f"{args.points} points, {len(route)} waypoints, {len(zone_list)} zones")
+
+    report = timed(
+        "analyse (in memory)",
+        lambda: analyse_flight(columns, route=route, zones=zone_list),
+    )
+    print(
+        f"  distance {report['distance_m'] / 1000:.1f} km, "
+        f"max deviation {report['conformance']['max_deviation_m']:.0f} m, "
+        f"{len(report['zones'])} zones nearby, {report['gaps']['count']} gaps"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "flight.utmta")
+        write_archive(path, 1, rows(columns))
+
+        def from_archive():
+            with TelemetryArchive(path) as archive:
+                loaded = FlightColumns.from_archive(archive)
+            return analyse_flight(loaded, route=route, zones=zone_list)
+
+        timed("load archive + analyse", from_archive)
+
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        TelemetryLog.__table__.create(engine)
+        with Session(engine) as db:
+            db.execute(
+                insert(TelemetryLog),
+                [
+                    {
+                        "id": i,
+                        "drone_id": 1,
+                        "flight_plan_id": 1,
+                        "timestamp": ts,
+                        "latitude": lat,
+                        "longitude": lon,
+                        "altitude_m": alt,
+                        "speed_mps": speed,
+                    }
+                    for i, (ts, lat, lon, alt, speed, _, _) in enumerate(
+                        rows(columns), 1
+                    )
+                ],
+            )
+            db.commit()
+            loaded = timed(
+                "load cursor (sqlite)", lambda: FlightColumns.from_cursor(db, 1)
+            )
+            timed(
+                "analyse cursor columns",
+                lambda: analyse_flight(loaded, route=route, zones=zone_list),
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
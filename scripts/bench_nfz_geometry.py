@@ -0,0 +1,222 @@
+"""Accuracy and throughput of the compiled NFZ checks against haversine.
+
+Accuracy covers circles and irregular polygons from 200 m to 20 km across at
+latitudes from the equator to 70N; polygons are measured against great-circle
+edge distances and a spherical winding-number containment test.
+
+Run from the repository root:
+
+    SECRET_KEY=dev python scripts/bench_nfz_geometry.py
+"""
+
+import math
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models.restricted_zone import NFZGeometryType  # noqa: E402
+from app.services.nfz_geometry import (  # noqa: E402
+    EARTH_RADIUS_M,
+    CompiledZone,
+    NFZIndex,
+    haversine_m,
+)
+
+
+# Latitudes zones are checked at: the equator, Almaty, Astana and the far north,
+# where the equirectangular projection is stretched the most.
+LATITUDES = (0.0, 43.2, 51.1, 60.0, 70.0)
+
+
+def random_circle(rng: random.Random, zone_id: int) -> CompiledZone:
+    return CompiledZone(
+        zone_id,
+        f"zone-{zone_id}",
+        NFZGeometryType.CIRCLE,
+        {
+            "center_lat": rng.uniform(50.9, 51.3),
+            "center_lon": rng.uniform(71.2, 71.7),
+            "radius_m": rng.uniform(100, 5000),
+        },
+        None,
+        None,
+    )
+
+
+def destination(lat: float, lon: float, bearing: float, distance_m: float):
+    """Point ``distance_m`` from (lat, lon) along the great circle at ``bearing``."""
+    phi1, lmb1, theta = map(math.radians, (lat, lon, bearing))
+    delta = distance_m / EARTH_RADIUS_M
+    phi2 = math.asin(
+        math.sin(phi1) * math.cos(delta)
+        + math.cos(phi1) * math.sin(delta) * math.cos(theta)
+    )
+    lmb2 = lmb1 + math.atan2(
+        math.sin(theta) * math.sin(delta) * math.cos(phi1),
+        math.cos(delta) - math.sin(phi1) * math.sin(phi2),
+    )
+    return math.degrees(phi2), math.degrees(lmb2)
+
+
+def bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Initial great-circle bearing from point 1 to point 2, in radians."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dlmb = math.radians(lon2 - lon1)
+    return math.atan2(
+        math.sin(dlmb) * math.cos(phi2),
+        math.cos(phi1) * math.sin(phi2)
+        - math.sin(phi1) * math.cos(phi2) * math.cos(dlmb),
+    )
+
+
+def random_polygon(
+    rng: random.Random, zone_id: int, lat: float, lon: float
+) -> Tuple[CompiledZone, List[Tuple[float, float]]]:
+    """An irregular star-shaped polygon 200 m to 20 km across, and its ring."""
+    radius = rng.uniform(100, 10_000)
+    angles = sorted(rng.uniform(0, 360) for _ in range(rng.randint(4, 12)))
+    ring = [
+        destination(lat, lon, angle, radius * rng.uniform(0.4, 1.0)) for angle in angles
+    ]
+    zone = CompiledZone(
+        zone_id,
+        f"zone-{zone_id}",
+        NFZGeometryType.POLYGON,
+        {"coordinates": [[[lon, lat] for lat, lon in ring + ring[:1]]]},
+        None,
+        None,
+    )
+    return zone, ring
+
+
+def edges(ring):
+    return zip(ring, ring[1:] + ring[:1])
+
+
+def inside_spherical(lat: float, lon: float, ring) -> bool:
+    """Winding number from the bearings to successive vertices."""
+    turned = 0.0
+    for (alat, alon), (blat, blon) in edges(ring):
+        step = bearing(lat, lon, blat, blon) - bearing(lat, lon, alat, alon)
+        turned += (step + math.pi) % (2 * math.pi) - math.pi
+    return abs(turned) > math.pi
+
+
+def edge_distance_m(lat: float, lon: float, ring) -> float:
+    """Great-circle distance to the nearest edge, from inside or out."""
+    nearest = math.inf
+    for (alat, alon), (blat, blon) in edges(ring):
+        to_point = haversine_m(alat, alon, lat, lon)
+        angle = bearing(alat, alon, lat, lon) - bearing(alat, alon, blat, blon)
+        d13 = to_point / EARTH_RADIUS_M
+        cross_track = math.asin(math.sin(d13) * math.sin(angle))
+        along_track = math.acos(
+            max(-1.0, min(1.0, math.cos(d13) / math.cos(cross_track)))
+        )
+        if math.cos(angle) < 0:
+            edge = to_point
+        elif along_track * EARTH_RADIUS_M > haversine_m(alat, alon, blat, blon):
+            edge = haversine_m(blat, blon, lat, lon)
+        else:
+            edge = abs(cross_track) * EARTH_RADIUS_M
+        nearest = min(nearest, edge)
+    return nearest
+
+
+class ErrorStats:
+    def __init__(self):
+        self.worst = 0.0
+        self.worst_near_edge = 0.0
+        self.disagreements = 0
+
+    def add(self, reference: float, planar: float, hit: bool, edge_m: float) -> None:
+        error = abs(reference - planar)
+        self.worst = max(self.worst, error)
+        if reference < 1000:
+            self.worst_near_edge = max(self.worst_near_edge, error)
+        if hit != (reference == 0.0) and edge_m > 1.0:
+            self.disagreements += 1
+
+    def report(self, label: str) -> None:
+        print(
+            f"{label}: max |planar - haversine| {self.worst:.3f} m, "
+            f"{self.worst_near_edge:.3f} m within 1 km of an edge, "
+            f"{self.disagreements} containment disagreements beyond 1 m"
+        )
+
+
+def accuracy(rng: random.Random, samples: int = 200_000) -> None:
+    circles = ErrorStats()
+    for zone in [random_circle(rng, i) for i in range(50)]:
+        radius = math.sqrt(zone.radius_sq)
+        lats = zone.lat0 + np.array(
+            [rng.uniform(-0.1, 0.1) for _ in range(samples // 50)]
+        )
+        lons = zone.lon0 + np.array(
+            [rng.uniform(-0.15, 0.15) for _ in range(samples // 50)]
+        )
+        planar = zone.distance_many(lats, lons)
+        inside = zone.contains_many(lats, lons)
+        for lat, lon, d, hit in zip(lats, lons, planar, inside):
+            to_center = haversine_m(zone.lat0, zone.lon0, lat, lon)
+            circles.add(max(to_center - radius, 0.0), d, hit, abs(to_center - radius))
+    circles.report("circles at 51N")
+
+    per_zone = samples // (10 * len(LATITUDES))
+    for base_lat in LATITUDES:
+        polygons = ErrorStats()
+        for i in range(10):
+            zone, ring = random_polygon(
+                rng, i, base_lat + rng.uniform(-0.5, 0.5), rng.uniform(-179, 179)
+            )
+            # Sample out to twice the zone's extent on each side.
+            dlat = zone.max_lat - zone.min_lat
+            dlon = zone.max_lon - zone.min_lon
+            lats = zone.lat0 + np.array(
+                [rng.uniform(-dlat, dlat) for _ in range(per_zone)]
+            )
+            lons = zone.lon0 + np.array(
+                [rng.uniform(-dlon, dlon) for _ in range(per_zone)]
+            )
+            planar = zone.distance_many(lats, lons)
+            inside = zone.contains_many(lats, lons)
+            for lat, lon, d, hit in zip(lats, lons, planar, inside):
+                edge_m = edge_distance_m(lat, lon, ring)
+                reference = 0.0 if inside_spherical(lat, lon, ring) else edge_m
+                polygons.add(reference, d, hit, edge_m)
+        polygons.report(f"polygons at {base_lat:g}N")
+
+
+def throughput(rng: random.Random, points: int = 100_000, zones: int = 300) -> None:
+    index = NFZIndex()
+    index.replace(random_circle(rng, i) for i in range(zones))
+    lats = np.random.default_rng(1).uniform(50.9, 51.3, points)
+    lons = np.random.default_rng(2).uniform(71.2, 71.7, points)
+    alts = np.full(points, 120.0)
+
+    started = time.perf_counter()
+    hits = index.check_points(lats, lons, alts)
+    compiled_s = time.perf_counter() - started
+
+    sample = 2_000
+    started = time.perf_counter()
+    for lat, lon in zip(lats[:sample], lons[:sample]):
+        for zone in index.zones.values():
+            haversine_m(zone.lat0, zone.lon0, lat, lon) <= math.sqrt(zone.radius_sq)
+    reference_s = (time.perf_counter() - started) * points / sample
+
+    print(f"{points} points x {zones} zones, {sum(map(len, hits))} hits")
+    print(f"compiled batch: {compiled_s * 1000:.1f} ms")
+    print(f"haversine loop (extrapolated): {reference_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    accuracy(rng)
+    throughput(rng)
@@ -0,0 +1,67 @@
+"""Send synthetic UDP telemetry packets, e.g. to a local dev server.
+
+Run from the repository root with the server's secret:
+
+    TELEMETRY_UDP_SECRET=... SECRET_KEY=dev python scripts/send_udp_telemetry.py \
+        --drone-id 1 --serial SN123 [--host 127.0.0.1 --port 5600 --count 50]
+
+Prints the drone's derived key with --show-key, for configuring a ground
+station. --tamper flips one bit in every packet, which the server should
+count as bad MACs.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.config import settings  # noqa: E402
+from app.services.telemetry_udp import drone_key, pack_packet  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drone-id", type=int, required=True)
+    parser.add_argument("--serial", required=True, help="Drone serial number")
+    parser.add_argument("--flight-plan-id", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=settings.TELEMETRY_UDP_PORT)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=10.0, help="Packets per second")
+    parser.add_argument("--show-key", action="store_true")
+    parser.add_argument("--tamper", action="store_true")
+    args = parser.parse_args()
+
+    if not settings.TELEMETRY_UDP_SECRET:
+        sys.exit("TELEMETRY_UDP_SECRET is not set")
+    key = drone_key(settings.TELEMETRY_UDP_SECRET, args.serial)
+    if args.show_key:
+        print(key.hex())
+        return
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for i in range(args.count):
+        packet = pack_packet(
+            key,
+            args.drone_id,
+            datetime.now(timezone.utc),
+            51.1 + i * 1e-5,
+            71.4,
+            100.0,
+            speed_mps=10.0,
+            heading_degrees=0.0,
+            flight_plan_id=args.flight_plan_id,
+        )
+        if args.tamper:
+            packet = packet[:-1] + bytes([packet[-1] ^ 1])
+        sock.sendto(packet, (args.host, args.port))
+        time.sleep(1.0 / args.rate)
+    print(f"Sent {args.count} packets to {args.host}:{args.port}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import Integer, create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base_class import Base
+from app.models.audit_event import AuditEvent
+from app.models.telemetry_log import TelemetryLog
+from app.models.user_drone_assignment import UserDroneAssignment
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """Factory for throwaway SQLite databases with the full schema."""
+    # SQLite only autoincrements plain INTEGER primary keys.
+    monkeypatch.setattr(UserDroneAssignment.__table__.c.id, "autoincrement", False)
+    monkeypatch.setattr(TelemetryLog.__table__.c.id, "type", Integer())
+    monkeypatch.setattr(AuditEvent.__table__.c.id, "type", Integer())
+    engines = []
+
+    def create(name: str = "test"):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        Base.metadata.create_all(engine)
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    """Session factory bound to one fresh SQLite database."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine())
@@ -0,0 +1,103 @@
+"""Admission control: route classes, caller keys and token buckets."""
+
+import asyncio
+
+import pytest
+from jose import jwt
+
+from app.core import admission
+from app.core.admission import (AUTH, EXPENSIVE, INGEST, INTERACTIVE,
+                                MemoryRateLimiter, TrustedProxies, caller_key,
+                                classify)
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("POST", "/api/v1/telemetry", INGEST),
+        ("POST", "/api/v1/telemetry/", INGEST),
+        ("GET", "/api/v1/telemetry/latest", INTERACTIVE),
+        ("POST", "/api/v1/auth/login", AUTH),
+        ("POST", "/api/v1/auth/register/solo-pilot", AUTH),
+        ("POST", "/api/v1/auth/refresh", INTERACTIVE),
+        ("POST", "/api/v1/routes/plan", EXPENSIVE),
+        ("POST", "/api/v1/flights/12/archive", EXPENSIVE),
+        ("GET", "/api/v1/flights/12/history", EXPENSIVE),
+        ("GET", "/api/v1/flights/12", INTERACTIVE),
+        ("GET", "/api/v1/analytics/flights/3/report", EXPENSIVE),
+        ("GET", "/api/v1/sse/telemetry", None),
+        ("OPTIONS", "/api/v1/routes/plan", None),
+        ("GET", "/api/v1/openapi.json", None),
+        ("GET", "/metrics", None),
+    ],
+)
+def test_classify(method, path, expected):
+    assert classify(method, path) == expected
+
+
+def scope(client="203.0.113.9", headers=()):
+    return {"client": (client, 50000), "headers": list(headers)}
+
+
+def test_bearer_token_keys_by_user():
+    token = jwt.encode({"sub": "42"}, settings.SECRET_KEY, settings.ALGORITHM)
+    assert (
+        caller_key(scope(headers=[(b"authorization", f"Bearer {token}".encode())]))
+        == "user:42"
+    )
+    forged = jwt.encode({"sub": "42"}, "not-the-key", settings.ALGORITHM)
+    assert (
+        caller_key(scope(headers=[(b"authorization", f"Bearer {forged}".encode())]))
+        == "ip:203.0.113.9"
+    )
+
+
+def test_forwarded_for_only_believed_from_trusted_proxies(monkeypatch):
+    forwarded = [(b"x-forwarded-for", b"198.51.100.7, 10.1.2.3")]
+    monkeypatch.setattr(admission, "trusted_proxies", TrustedProxies(""))
+    assert caller_key(scope("10.0.0.5", forwarded)) == "ip:10.0.0.5"
+
+    monkeypatch.setattr(admission, "trusted_proxies", TrustedProxies("10.0.0.0/8"))
+    assert caller_key(scope("10.0.0.5", forwarded)) == "ip:198.51.100.7"
+    assert caller_key(scope("10.0.0.5")) == "ip:10.0.0.5"
+    # A caller talking to us directly can't pick its own key.
+    assert caller_key(scope("203.0.113.9", forwarded)) == "ip:203.0.113.9"
+    # Only the hop our proxy saw counts, not what the caller prepended.
+    spoofed = [(b"x-forwarded-for", b"1.2.3.4, 198.51.100.7")]
+    assert caller_key(scope("10.0.0.5", spoofed)) == "ip:198.51.100.7"
+
+    monkeypatch.setattr(admission, "trusted_proxies", TrustedProxies("*"))
+    assert caller_key(scope("10.0.0.5", forwarded)) == "ip:198.51.100.7"
+
+
+def test_token_bucket_burst_and_refill(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    limiter = MemoryRateLimiter()
+
+    def acquire(key="k"):
+        return asyncio.run(limiter.acquire(key, 2.0, 3))
+
+    assert [acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert acquire() == pytest.approx(0.5)
+    assert acquire("other") == 0.0  # Buckets are per key.
+
+    now[0] += 0.5
+    assert acquire() == 0.0
+    assert acquire() > 0
+
+    now[0] += 60
+    assert [acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert acquire() > 0
+
+
+def test_full_buckets_are_swept(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    limiter = MemoryRateLimiter(max_keys=10)
+    for i in range(10):
+        asyncio.run(limiter.acquire(f"old{i}", 1.0, 5))
+    now[0] += 10  # Every bucket has refilled.
+    asyncio.run(limiter.acquire("fresh", 1.0, 5))
+    assert list(limiter._buckets) == ["fresh"]
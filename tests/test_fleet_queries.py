@@ -0,0 +1,91 @@
+"""Fleet listings must run a constant number of queries per page.
+
+Seeds a throwaway SQLite database with fleets of different sizes and counts
+the statements each listing issues, including serializing the response.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.drone import Drone, DroneOwnerType
+from app.models.organization import Organization
+from app.models.telemetry_log import TelemetryLog
+from app.models.user import User, UserRole
+from app.models.user_drone_assignment import UserDroneAssignment
+from app.schemas.drone import DroneFleetPage
+from app.services.fleet import fleet_page
+
+
+def seed(db: Session, drones: int) -> None:
+    now = datetime.now(timezone.utc)
+    db.add(
+        Organization(id=1, name="Fleet", bin="0" * 12, company_address="-", city="-")
+    )
+    for i in range(1, drones + 1):
+        db.add(
+            User(
+                id=i,
+                full_name=f"Pilot {i}",
+                email=f"pilot{i}@example.com",
+                hashed_password="-",
+                role=UserRole.ORGANIZATION_PILOT,
+                organization_id=1,
+            )
+        )
+        db.add(
+            Drone(
+                id=i,
+                brand="DJI",
+                model="M300",
+                serial_number=f"SN{i}",
+                owner_type=DroneOwnerType.ORGANIZATION,
+                organization_id=1,
+            )
+        )
+        db.add(UserDroneAssignment(id=i, user_id=i, drone_id=i))
+        db.add(
+            TelemetryLog(
+                id=i,
+                drone_id=i,
+                timestamp=now,
+                latitude=51.1,
+                longitude=71.4,
+                altitude_m=100,
+            )
+        )
+    db.flush()
+    for i in range(1, drones + 1):
+        db.get(Drone, i).last_telemetry_id = i
+    db.commit()
+
+
+def count_queries(engine, drones: int) -> int:
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    with Session(engine) as db:
+        stmt = select(Drone).where(Drone.organization_id == 1)
+        items, cursor = fleet_page(db, stmt, None, drones)
+        page = DroneFleetPage(items=items, next_cursor=cursor)
+    assert len(page.items) == drones
+    assert all(
+        item.assigned_pilots and item.last_telemetry_point for item in page.items
+    )
+    return len(statements)
+
+
+def seeded_engine(sqlite_engine, drones: int):
+    engine = sqlite_engine(f"fleet_{drones}")
+    with Session(engine) as db:
+        seed(db, drones)
+    return engine
+
+
+def test_fleet_listing_query_count_is_constant(sqlite_engine):
+    counts = {
+        n: count_queries(seeded_engine(sqlite_engine, n), n) for n in (1, 10, 100)
+    }
+    assert len(set(counts.values())) == 1, counts
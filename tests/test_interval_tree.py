@@ -0,0 +1,68 @@
+"""IntervalTree against a brute-force scan of the same intervals."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.interval_tree import IntervalTree
+
+
+def brute_overlapping(intervals, start, end):
+    return {key for key, (s, e) in intervals.items() if s < end and e > start}
+
+
+def brute_at(intervals, point):
+    return {key for key, (s, e) in intervals.items() if s <= point < e}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_under_random_edits(seed):
+    rng = random.Random(seed)
+    tree = IntervalTree()
+    intervals = {}
+    for step in range(2000):
+        action = rng.random()
+        key = rng.randrange(300)
+        if action < 0.5:
+            start = rng.randrange(1000)
+            end = start + rng.randrange(1, 80)
+            tree.add(key, start, end)
+            intervals[key] = (start, end)
+        elif action < 0.7:
+            assert tree.remove(key) == (intervals.pop(key, None) is not None)
+        else:
+            start = rng.randrange(-20, 1050)
+            end = start + rng.randrange(1, 120)
+            assert set(tree.overlapping(start, end)) == brute_overlapping(
+                intervals, start, end
+            )
+            point = rng.randrange(-20, 1100)
+            assert set(tree.at(point)) == brute_at(intervals, point)
+        assert len(tree) == len(intervals)
+    assert {key: (s, e) for key, s, e in tree} == intervals
+
+
+def test_bounds_are_half_open():
+    tree = IntervalTree()
+    tree.add("a", 10, 20)
+    assert tree.overlapping(20, 30) == []
+    assert tree.overlapping(0, 10) == []
+    assert tree.overlapping(19, 21) == ["a"]
+    assert tree.at(10) == ["a"]
+    assert tree.at(20) == []
+
+
+def test_equal_starts_and_datetimes():
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    tree = IntervalTree()
+    for i in range(10):
+        tree.add(i, base, base + timedelta(hours=i + 1))
+    tree.remove(3)
+    found = tree.overlapping(base + timedelta(hours=5), base + timedelta(hours=6))
+    assert sorted(found) == [5, 6, 7, 8, 9]
+
+
+def test_rejects_empty_intervals():
+    with pytest.raises(ValueError):
+        IntervalTree().add("a", 5, 5)
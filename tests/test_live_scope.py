@@ -0,0 +1,93 @@
+"""Deleted flight plans: no telemetry filed under them, no live events."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.drone import Drone, DroneOwnerType
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.organization import Organization
+from app.models.user import User, UserRole
+from app.services import live_scope
+from app.services.event_bus import FLIGHT_STATUS
+from app.services.live_scope import RECHECK_SECONDS, LiveEventScope
+from app.services.telemetry_service import telemetry_ingest_service
+
+NOW = datetime(2026, 7, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(session_factory, monkeypatch):
+    monkeypatch.setattr(live_scope, "BackgroundSessionLocal", session_factory)
+    with session_factory() as db:
+        db.add(
+            Organization(
+                id=1,
+                name="Aero",
+                bin="123456789012",
+                company_address="1 Main St",
+                city="Astana",
+            )
+        )
+        db.add(
+            User(
+                id=1,
+                full_name="Pilot",
+                email="pilot@example.com",
+                hashed_password="x",
+                role=UserRole.ORGANIZATION_PILOT,
+                organization_id=1,
+            )
+        )
+        db.add(
+            Drone(
+                id=1,
+                brand="DJI",
+                model="M300",
+                serial_number="SN-SCOPE-1",
+                owner_type=DroneOwnerType.ORGANIZATION,
+                organization_id=1,
+            )
+        )
+        db.add(
+            FlightPlan(
+                id=1,
+                user_id=1,
+                drone_id=1,
+                organization_id=1,
+                planned_departure_time=NOW,
+                planned_arrival_time=NOW + timedelta(hours=1),
+                status=FlightPlanStatus.APPROVED,
+            )
+        )
+        db.commit()
+        yield db
+
+
+def delete_plan(db) -> None:
+    db.get(FlightPlan, 1).soft_delete()
+    db.commit()
+
+
+def test_no_telemetry_for_deleted_plan(db):
+    drone = db.get(Drone, 1)
+    assert telemetry_ingest_service.flight_plan_problem(db, drone, 1) is None
+    delete_plan(db)
+    assert telemetry_ingest_service.flight_plan_problem(db, drone, 1) == (
+        "Flight plan not found for this drone"
+    )
+
+
+def test_plan_visibility_is_rechecked(db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(live_scope.time, "monotonic", lambda: now[0])
+    admin = User(id=2, role=UserRole.ORGANIZATION_ADMIN, organization_id=1)
+    scope = LiveEventScope(admin)
+    event = {"topic": FLIGHT_STATUS, "data": {"flight_plan_id": 1}}
+
+    assert asyncio.run(scope.allows(event))
+    delete_plan(db)
+    assert asyncio.run(scope.allows(event))  # Still cached.
+    now[0] += RECHECK_SECONDS + 1
+    assert not asyncio.run(scope.allows(event))
@@ -0,0 +1,58 @@
+"""Restricted-zone tiles: small zones stay visible when zoomed out."""
+
+import math
+
+import pytest
+
+from app.models.restricted_zone import NFZGeometryType
+from app.services.map_tiles import map_tiles, tile_bounds
+from app.services.nfz_geometry import CompiledZone, nfz_index
+
+CENTRE = (51.13, 71.43)
+
+
+def tile_at(z: int, lat: float, lon: float):
+    n = 1 << z
+    x = int((lon + 180.0) / 360.0 * n)
+    sin = math.sin(math.radians(lat))
+    y = int((0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * n)
+    return z, x, y
+
+
+@pytest.fixture
+def small_circle():
+    zones = list(nfz_index.zones.values())
+    nfz_index.replace(
+        [
+            CompiledZone(
+                1,
+                "Stadium",
+                NFZGeometryType.CIRCLE,
+                {"center_lat": CENTRE[0], "center_lon": CENTRE[1], "radius_m": 1500},
+                None,
+                120.0,
+            )
+        ]
+    )
+    yield
+    nfz_index.replace(zones)
+
+
+def outline(z: int):
+    features = map_tiles._zone_features(*tile_at(z, *CENTRE))
+    assert [feature["id"] for feature in features] == [1]
+    return features[0]["geometry"]["coordinates"][0]
+
+
+def test_small_zone_is_drawn_when_zoomed_out(small_circle):
+    ring = outline(4)
+    lons, lats = zip(*ring)
+    assert min(lats) <= CENTRE[0] <= max(lats)
+    assert min(lons) <= CENTRE[1] <= max(lons)
+    # A few pixels wide rather than the zone's true 3 km.
+    min_lat, max_lat, min_lon, max_lon = tile_bounds(*tile_at(4, *CENTRE))
+    assert max(lons) - min(lons) < (max_lon - min_lon) / 32
+
+
+def test_zone_keeps_its_shape_when_zoomed_in(small_circle):
+    assert len(outline(14)) > 5
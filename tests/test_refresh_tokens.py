@@ -0,0 +1,102 @@
+"""Refresh token rotation, reuse detection and rejection."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+
+from app.models.refresh_token import RefreshToken
+from app.models.user import User, UserRole
+from app.services.refresh_tokens import refresh_tokens
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        db.add(
+            User(
+                id=1,
+                full_name="Pilot",
+                email="pilot@example.com",
+                hashed_password="x",
+                role=UserRole.SOLO_PILOT,
+            )
+        )
+        db.commit()
+        yield db
+
+
+def login(db) -> str:
+    token = refresh_tokens.issue(db, db.get(User, 1))
+    db.commit()
+    return token
+
+
+def live_tokens(db) -> int:
+    return len(
+        db.execute(select(RefreshToken).where(RefreshToken.revoked_at.is_(None)))
+        .scalars()
+        .all()
+    )
+
+
+def test_rotation_issues_a_successor(db):
+    first = login(db)
+    user, second = refresh_tokens.rotate(db, first)
+    assert user.id == 1 and second != first
+    assert refresh_tokens.rotate(db, second) is not None
+    assert live_tokens(db) == 1
+
+
+def test_replaying_a_rotated_token_revokes_the_family(db):
+    first = login(db)
+    other_device = login(db)
+    _, second = refresh_tokens.rotate(db, first)
+    _, third = refresh_tokens.rotate(db, second)
+
+    assert refresh_tokens.rotate(db, first) is None
+    # The newest token of the family is gone too; the other login is not.
+    assert refresh_tokens.rotate(db, third) is None
+    assert refresh_tokens.rotate(db, other_device) is not None
+
+
+def test_expired_token_is_rejected(db):
+    token = login(db)
+    db.execute(
+        update(RefreshToken).values(
+            expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+    )
+    db.commit()
+    assert refresh_tokens.rotate(db, token) is None
+
+
+def test_inactive_user_is_rejected(db):
+    token = login(db)
+    db.get(User, 1).is_active = False
+    db.commit()
+    assert refresh_tokens.rotate(db, token) is None
+    assert live_tokens(db) == 1  # Nothing was rotated.
+
+
+def test_unknown_and_logged_out_tokens_are_rejected(db):
+    assert refresh_tokens.rotate(db, "not-a-token") is None
+    token = login(db)
+    assert refresh_tokens.revoke(db, token)
+    assert refresh_tokens.rotate(db, token) is None
+
+
+def test_token_row_is_locked(db, monkeypatch):
+    token = login(db)
+    statements = []
+    execute = db.execute
+
+    def recording_execute(statement, *args, **kwargs):
+        statements.append(statement)
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", recording_execute)
+    refresh_tokens.rotate(db, token)
+    lookup = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "refresh_tokens" in lookup and lookup.endswith("FOR UPDATE")
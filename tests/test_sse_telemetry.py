@@ -0,0 +1,43 @@
+"""SSE stream: a client that falls behind is told to resync."""
+
+import asyncio
+import json
+
+from app.api.v1.endpoints import telemetry as telemetry_endpoints
+from app.models.user import User, UserRole
+from app.services.event_bus import DRONE_STATUS, event_bus
+
+
+def parse(chunk: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return {"event": fields["event"], "data": json.loads(fields["data"])}
+
+
+def test_overflow_sends_resync(session_factory, monkeypatch):
+    admin = User(id=1, role=UserRole.AUTHORITY_ADMIN)
+    monkeypatch.setattr(telemetry_endpoints, "SessionLocal", session_factory)
+    monkeypatch.setattr(
+        telemetry_endpoints, "get_user_from_token", lambda db, token: admin
+    )
+    monkeypatch.setattr(event_bus, "subscriber_queue_size", 3)
+
+    async def read():
+        response = await telemetry_endpoints.telemetry_event_stream(
+            token="t", last_event_id=None
+        )
+        for drone_id in range(5):
+            event_bus._deliver_local(
+                {"topic": DRONE_STATUS, "data": {"drone_id": drone_id}, "ts": 0.0}
+            )
+        chunks = response.body_iterator
+        received = [parse(await chunks.__anext__()) for _ in range(4)]
+        await chunks.aclose()
+        return received
+
+    received = asyncio.run(read())
+
+    assert received[0] == {
+        "event": "resync",
+        "data": {"replayed_points": 0, "truncated": False, "dropped_events": 2},
+    }
+    assert [r["data"]["drone_id"] for r in received[1:]] == [2, 3, 4]
@@ -0,0 +1,134 @@
+"""Columnar telemetry archives: round trip and crash ordering."""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.drone import Drone, DroneOwnerType
+from app.models.flight_plan import FlightPlan, FlightPlanStatus
+from app.models.telemetry_log import TelemetryLog
+from app.models.user import User, UserRole
+from app.services.telemetry_archive import TelemetryArchiver
+
+START = datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc)
+POINTS = [
+    (0, 51.1, 71.4, 100.0, 12.5, 90.0, "OK"),
+    (1, 51.1001, 71.4002, 101.5, None, 91.0, None),
+    (2, 51.1002, 71.4004, 102.0, 13.0, None, "OK"),
+    (3, 51.1003, 71.4006, 99.25, 12.0, 92.5, "Entered NFZ"),
+]
+
+
+@pytest.fixture
+def completed_flight(session_factory):
+    with session_factory() as db:
+        db.add(
+            User(
+                id=1,
+                full_name="Pilot",
+                email="pilot@example.com",
+                hashed_password="x",
+                role=UserRole.SOLO_PILOT,
+            )
+        )
+        db.add(
+            Drone(
+                id=1,
+                brand="DJI",
+                model="M300",
+                serial_number="SN-ARCHIVE-1",
+                owner_type=DroneOwnerType.SOLO_PILOT,
+            )
+        )
+        db.add(
+            FlightPlan(
+                id=1,
+                user_id=1,
+                drone_id=1,
+                planned_departure_time=START,
+                planned_arrival_time=START + timedelta(hours=1),
+                status=FlightPlanStatus.COMPLETED,
+            )
+        )
+        for second, lat, lon, alt, speed, heading, status in POINTS:
+            db.add(
+                TelemetryLog(
+                    flight_plan_id=1,
+                    drone_id=1,
+                    timestamp=START + timedelta(seconds=second),
+                    latitude=lat,
+                    longitude=lon,
+                    altitude_m=alt,
+                    speed_mps=speed,
+                    heading_degrees=heading,
+                    status_message=status,
+                )
+            )
+        db.commit()
+    return session_factory
+
+
+def telemetry_rows(db) -> int:
+    return db.execute(
+        select(func.count()).where(TelemetryLog.flight_plan_id == 1)
+    ).scalar_one()
+
+
+def test_round_trip(completed_flight, tmp_path):
+    archiver = TelemetryArchiver(str(tmp_path / "archive"))
+    with completed_flight() as db:
+        plan = db.get(FlightPlan, 1)
+        path = archiver.archive_flight(db, flight_plan=plan, prune=True)
+        assert telemetry_rows(db) == 0
+        assert plan.archive_path == path and plan.archived_at is not None
+
+        with archiver.open(plan) as archive:
+            assert archive.flight_plan_id == 1
+            points = list(archive.iter_points())
+        expected = [
+            {
+                "timestamp": START + timedelta(seconds=second),
+                "latitude": lat,
+                "longitude": lon,
+                "altitude_m": alt,
+                "speed_mps": speed,
+                "heading_degrees": heading,
+                "status_message": status,
+            }
+            for second, lat, lon, alt, speed, heading, status in POINTS
+        ]
+        assert points == expected
+
+        # Archiving again hands back the same file rather than rewriting it.
+        assert archiver.archive_flight(db, flight_plan=plan) == path
+    assert sorted(os.listdir(tmp_path / "archive")) == ["flight_1.utmta"]
+
+
+def test_file_is_in_place_before_rows_are_pruned(completed_flight, tmp_path):
+    archiver = TelemetryArchiver(str(tmp_path / "archive"))
+    path = str(tmp_path / "archive" / "flight_1.utmta")
+    with completed_flight() as db:
+        plan = db.get(FlightPlan, 1)
+        seen_at_commit = []
+
+        def crash_at_commit():
+            seen_at_commit.append(os.path.exists(path))
+            raise RuntimeError("database went away")
+
+        db.commit = crash_at_commit
+        with pytest.raises(RuntimeError):
+            archiver.archive_flight(db, flight_plan=plan, prune=True)
+        assert seen_at_commit == [True]
+
+    # Nothing was committed: the rows are intact and the flight unarchived,
+    # so the file left behind is simply overwritten by the next attempt.
+    with completed_flight() as db:
+        plan = db.get(FlightPlan, 1)
+        assert telemetry_rows(db) == len(POINTS)
+        assert plan.archived_at is None
+        archiver.archive_flight(db, flight_plan=plan, prune=True)
+        with archiver.open(plan) as archive:
+            assert len(archive) == len(POINTS)
+        assert telemetry_rows(db) == 0
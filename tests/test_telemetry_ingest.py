@@ -0,0 +1,94 @@
+"""NFZ alerts on ingest and how rollups count them, live and rebuilt."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.drone import Drone, DroneOwnerType
+from app.models.restricted_zone import NFZGeometryType
+from app.models.telemetry_log import TelemetryLog
+from app.models.telemetry_rollup import DroneDailyTelemetryRollup
+from app.schemas.telemetry import TelemetryBatchIn, TelemetryPointIn
+from app.services.nfz_geometry import CompiledZone, nfz_index
+from app.services.telemetry_rollup import telemetry_rollups
+from app.services.telemetry_service import telemetry_ingest_service
+
+DRONE_ID = 7101
+START = datetime(2026, 6, 2, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def zone():
+    zones = list(nfz_index.zones.values())
+    nfz_index.replace(
+        [
+            CompiledZone(
+                9001,
+                "Parliament",
+                NFZGeometryType.CIRCLE,
+                {"center_lat": 51.125, "center_lon": 71.43, "radius_m": 500},
+                None,
+                None,
+            )
+        ]
+    )
+    yield
+    nfz_index.replace(zones)
+
+
+def test_alert_kept_alongside_device_status(session_factory, zone):
+    with session_factory() as db:
+        drone = Drone(
+            id=DRONE_ID,
+            brand="DJI",
+            model="M300",
+            serial_number="SN-INGEST-7101",
+            owner_type=DroneOwnerType.SOLO_PILOT,
+        )
+        db.add(drone)
+        db.commit()
+
+        points = [
+            # Inside the zone, with and without a status of the drone's own.
+            (0, 51.125, 71.43, "ON_SCHEDULE"),
+            (1, 51.125, 71.43, None),
+            (2, 51.200, 71.43, "ON_SCHEDULE"),
+        ]
+        batch = TelemetryBatchIn(
+            drone_id=DRONE_ID,
+            points=[
+                TelemetryPointIn(
+                    timestamp=START + timedelta(seconds=t),
+                    latitude=lat,
+                    longitude=lon,
+                    altitude_m=100.0,
+                    status_message=status_message,
+                )
+                for t, lat, lon, status_message in points
+            ],
+        )
+        telemetry_ingest_service.ingest(db, drone=drone, batch=batch)
+
+        stored = db.execute(
+            select(TelemetryLog.status_message, TelemetryLog.nfz_alert)
+            .where(TelemetryLog.drone_id == DRONE_ID)
+            .order_by(TelemetryLog.timestamp)
+        ).all()
+        assert [tuple(row) for row in stored] == [
+            ("ON_SCHEDULE", "NFZ_ALERT: Parliament"),
+            (None, "NFZ_ALERT: Parliament"),
+            ("ON_SCHEDULE", None),
+        ]
+
+        def daily_violations():
+            db.expire_all()
+            return db.execute(
+                select(DroneDailyTelemetryRollup.violation_count).where(
+                    DroneDailyTelemetryRollup.drone_id == DRONE_ID
+                )
+            ).scalar_one()
+
+        assert daily_violations() == 2
+        telemetry_rollups.backfill_drone(db, drone)
+        assert daily_violations() == 2
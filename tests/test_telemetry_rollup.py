@@ -0,0 +1,91 @@
+"""Rollup aggregates: distance and flight time are summed per flight."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.telemetry_rollup import (DroneDailyTelemetryRollup,
+                                         FlightTelemetryRollup)
+from app.services.nfz_geometry import haversine_legs_m
+from app.services.telemetry_rollup import RollupPoints, accumulate
+
+START = datetime(2026, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def points(rows):
+    """RollupPoints from (seconds after START, lat, lon, flight_plan_id) rows."""
+    return RollupPoints(
+        [START + timedelta(seconds=t) for t, _, _, _ in rows],
+        [lat for _, lat, _, _ in rows],
+        [lon for _, _, lon, _ in rows],
+        [100.0] * len(rows),
+        [10.0] * len(rows),
+        [False] * len(rows),
+        [flight for _, _, _, flight in rows],
+    )
+
+
+def leg_m(a, b):
+    return float(haversine_legs_m([a[0], b[0]], [a[1], b[1]])[0])
+
+
+def test_day_with_two_flights_has_no_phantom_leg():
+    first = [(0, 51.10, 71.40, 1), (10, 51.11, 71.40, 1)]
+    # Two hours later, from another site.
+    second = [(7200, 43.20, 76.90, 2), (7215, 43.21, 76.90, 2)]
+    row = DroneDailyTelemetryRollup()
+    accumulate(row, points(first))
+    accumulate(row, points(second))
+
+    assert row.flight_time_seconds == 25.0
+    assert row.distance_m == pytest.approx(
+        leg_m((51.10, 71.40), (51.11, 71.40)) + leg_m((43.20, 76.90), (43.21, 76.90))
+    )
+    assert row.last_flight_plan_id == 2
+
+
+def test_flight_change_inside_one_batch():
+    row = DroneDailyTelemetryRollup()
+    accumulate(
+        row,
+        points([(0, 51.1, 71.4, 1), (5, 51.1, 71.4, 1), (8, 43.2, 76.9, 2)]),
+    )
+    assert row.flight_time_seconds == 5.0
+    assert row.distance_m == 0.0
+
+
+def test_batches_of_one_flight_join_up():
+    row = FlightTelemetryRollup()
+    accumulate(row, points([(0, 51.10, 71.40, 7), (1, 51.10, 71.41, 7)]))
+    accumulate(row, points([(3, 51.10, 71.42, 7)]))
+    assert row.flight_time_seconds == 3.0
+    assert row.distance_m == pytest.approx(
+        leg_m((51.10, 71.40), (51.10, 71.41)) + leg_m((51.10, 71.41), (51.10, 71.42))
+    )
+
+
+def test_long_silence_is_not_flight_time():
+    gap = settings.ANALYTICS_AIRBORNE_GAP_SECONDS
+    row = FlightTelemetryRollup()
+    accumulate(
+        row,
+        points(
+            [
+                (0, 51.1, 71.4, 7),
+                (20, 51.1, 71.4, 7),
+                (20 + gap + 1, 51.1, 71.4, 7),
+                (30 + gap + 1, 51.1, 71.4, 7),
+            ]
+        ),
+    )
+    assert row.flight_time_seconds == 30.0
+
+
+def test_out_of_order_batch_is_not_joined():
+    row = FlightTelemetryRollup()
+    accumulate(row, points([(10, 51.1, 71.4, 7), (20, 51.1, 71.5, 7)]))
+    accumulate(row, points([(0, 51.1, 71.3, 7)]))
+    assert row.flight_time_seconds == 10.0
+    assert row.first_timestamp == START
+    assert row.last_timestamp == START + timedelta(seconds=20)
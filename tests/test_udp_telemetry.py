@@ -0,0 +1,115 @@
+"""UDP telemetry listener, end to end over a socket on 127.0.0.1.
+
+Packets go through the real listener and ingest service into a throwaway
+SQLite database; the outcome counters say what became of each one.
+"""
+
+import asyncio
+import socket
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.drone import Drone, DroneOwnerType
+from app.models.telemetry_log import TelemetryLog
+from app.services import telemetry_udp
+from app.services.telemetry_udp import (
+    UdpTelemetryListener,
+    drone_key,
+    pack_packet,
+    udp_packets,
+)
+
+SECRET = "udp-test-secret"
+DRONE_ID = 7001
+SERIAL = "SN-UDP-7001"
+OUTCOMES = ("accepted", "bad_mac", "malformed", "unknown_drone", "bad_flight_plan")
+
+
+@pytest.fixture
+def ingest_db(session_factory, monkeypatch):
+    with session_factory() as db:
+        db.add(
+            Drone(
+                id=DRONE_ID,
+                brand="DJI",
+                model="M300",
+                serial_number=SERIAL,
+                owner_type=DroneOwnerType.SOLO_PILOT,
+            )
+        )
+        db.commit()
+    monkeypatch.setattr(telemetry_udp, "IngestSessionLocal", session_factory)
+    return session_factory
+
+
+def outcome_counts():
+    return {outcome: udp_packets.value(outcome=outcome) for outcome in OUTCOMES}
+
+
+async def send_and_flush(packets, expected_total: int):
+    listener = UdpTelemetryListener(
+        SECRET, flush_interval_seconds=0.05, max_pending=100
+    )
+    await listener.start("127.0.0.1", 0)
+    host, port = listener._transport.get_extra_info("sockname")[:2]
+    before = outcome_counts()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for packet in packets:
+            sock.sendto(packet, (host, port))
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            after = outcome_counts()
+            if sum(after.values()) - sum(before.values()) >= expected_total:
+                break
+    finally:
+        sock.close()
+        await listener.stop()
+    return {outcome: after[outcome] - before[outcome] for outcome in OUTCOMES}
+
+
+def test_signed_and_tampered_datagrams(ingest_db):
+    key = drone_key(SECRET, SERIAL)
+    now = datetime.now(timezone.utc)
+
+    def signed(**overrides):
+        fields = dict(
+            drone_id=DRONE_ID,
+            timestamp=now,
+            latitude=51.1,
+            longitude=71.4,
+            altitude_m=120.0,
+            speed_mps=12.5,
+        )
+        fields.update(overrides)
+        return pack_packet(key, **fields)
+
+    good = signed()
+    tampered = bytearray(signed(timestamp=now.replace(microsecond=1)))
+    tampered[30] ^= 0xFF  # Inside the longitude field, covered by the MAC.
+    packets = [
+        good,
+        bytes(tampered),
+        good[:-1],  # Truncated.
+        pack_packet(key, 9999, now, 51.1, 71.4, 120.0),  # No such drone.
+        signed(timestamp=now.replace(microsecond=2), flight_plan_id=424242),
+    ]
+
+    counts = asyncio.run(send_and_flush(packets, expected_total=len(packets)))
+
+    assert counts == {
+        "accepted": 1,
+        "bad_mac": 1,
+        "malformed": 1,
+        "unknown_drone": 1,
+        "bad_flight_plan": 1,
+    }
+    with ingest_db() as db:
+        stored = db.execute(
+            select(func.count()).where(TelemetryLog.drone_id == DRONE_ID)
+        ).scalar_one()
+    assert stored == 1
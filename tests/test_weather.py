@@ -0,0 +1,110 @@
+"""WeatherService caching over a FileWeatherProvider."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.services import weather
+from app.services.weather import FileWeatherProvider, WeatherService
+
+
+class CountingProvider(FileWeatherProvider):
+    """File-backed conditions that count, and can slow down, upstream calls."""
+
+    def __init__(self, path=None, delay_seconds: float = 0.0):
+        super().__init__(path)
+        self.delay_seconds = delay_seconds
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, latitude, longitude):
+        with self._lock:
+            self.calls.append((latitude, longitude))
+        time.sleep(self.delay_seconds)
+        return super().fetch(latitude, longitude)
+
+
+def service(provider, ttl_seconds=600.0, max_cells=100):
+    return WeatherService(
+        provider,
+        grid_degrees=0.1,
+        ttl_seconds=ttl_seconds,
+        max_cells=max_cells,
+        max_concurrent_fetches=4,
+    )
+
+
+def test_reports_come_from_the_nearest_file_point(tmp_path):
+    path = tmp_path / "weather.json"
+    path.write_text(
+        json.dumps(
+            {
+                "default": {"temperature_c": 20.0},
+                "points": [
+                    {"latitude": 51.1, "longitude": 71.4, "wind_speed_mps": 9.0},
+                    {"latitude": 43.2, "longitude": 76.9, "wind_speed_mps": 2.0},
+                ],
+            }
+        )
+    )
+    weather_service = service(CountingProvider(str(path)))
+    near_astana = asyncio.run(weather_service.at(51.12, 71.43))
+    assert near_astana["wind_speed_mps"] == 9.0
+    assert near_astana["temperature_c"] == 20.0
+    assert near_astana["source"] == "file"
+    assert (near_astana["latitude"], near_astana["longitude"]) == pytest.approx(
+        (51.15, 71.45)
+    )
+
+
+def test_concurrent_misses_share_one_fetch():
+    provider = CountingProvider(delay_seconds=0.2)
+    weather_service = service(provider)
+
+    async def lookups():
+        # Three points in one cell, one in the next.
+        points = [(51.11, 71.41), (51.12, 71.42), (51.13, 71.43), (51.31, 71.41)]
+        return await asyncio.gather(*(weather_service.at(*p) for p in points))
+
+    before = weather.weather_lookups.value(result="coalesced")
+    reports = asyncio.run(lookups())
+    assert len(provider.calls) == 2
+    assert reports[0] is reports[1] is reports[2]
+    assert weather.weather_lookups.value(result="coalesced") - before == 2
+    assert weather_service._inflight == {}
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(weather.time, "monotonic", lambda: now[0])
+    provider = CountingProvider()
+    weather_service = service(provider, ttl_seconds=60.0)
+
+    asyncio.run(weather_service.at(51.1, 71.4))
+    now[0] += 59
+    asyncio.run(weather_service.at(51.1, 71.4))
+    assert len(provider.calls) == 1
+    now[0] += 2
+    asyncio.run(weather_service.at(51.1, 71.4))
+    assert len(provider.calls) == 2
+
+
+def test_least_recently_used_cell_is_evicted():
+    provider = CountingProvider()
+    weather_service = service(provider, max_cells=2)
+    a, b, c = (51.05, 71.05), (51.15, 71.05), (51.25, 71.05)
+
+    async def lookups(*points):
+        for point in points:
+            await weather_service.at(*point)
+
+    asyncio.run(lookups(a, b, a, c))  # b is the least recently used.
+    assert len(weather_service.cache) == 2
+    assert len(provider.calls) == 3
+    asyncio.run(lookups(a, c))
+    assert len(provider.calls) == 3
+    asyncio.run(lookups(b))
+    assert len(provider.calls) == 4